@@ -0,0 +1,371 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import subprocess
+
+import process_hw_info_bash_only as hw
+
+# 사용법:
+#   python3 bench_hw_pipeline.py generate OUT_DIR --hosts 10000       # 가상 fleet(raw 파일 + inventory.ini) 생성
+#   python3 bench_hw_pipeline.py run --sizes 100,10000,100000         # 단계별 벤치마크
+#   python3 bench_hw_pipeline.py run --baseline old.json --output new.json
+# 보고서 처리 단계(parse_raw_hw_data, parse_all_hw_data_files, generate_html_report, generate_yaml_report)의
+# 실행 시간, 처리량, 최대 메모리(RSS)를 규모별로 측정합니다.
+
+# 벤치마크 기본 규모 (호스트 수)
+DEFAULT_SIZES = [100, 10000, 100000]
+# 벤치마크 작업 디렉토리 (규모별 하위 디렉토리에 fleet과 보고서를 만듭니다)
+DEFAULT_WORK_DIR = "./bench_work/"
+
+# 가상 fleet의 실패 변형 비율
+MISSING_FILE_RATE = 0.02     # raw 파일 없음 (수집 실패)
+MISSING_HEADER_RATE = 0.01   # ---HOST: / ---HWINFO: 헤더 줄 없음
+NA_FIELDS_RATE = 0.05        # dmidecode 권한 부족 등으로 일부 필드가 N/A
+SU_FALLBACK_RATE = 0.10      # su 경로로 수집되어 CPU 섹션이 4줄 (형식 버전 1)
+
+# 가상 하드웨어 구성: (제조사, 모델, 메인보드 제품, BIOS 제조사, BIOS 버전 목록)
+_SYSTEM_MODELS = [
+    ('Dell Inc.', 'PowerEdge R640', '0H28RR', 'Dell Inc.', ['2.10.2', '2.12.0', '2.17.1']),
+    ('Dell Inc.', 'PowerEdge R750', '0PJ80M', 'Dell Inc.', ['1.6.5', '1.8.2']),
+    ('HPE', 'ProLiant DL380 Gen10', 'ProLiant DL380 Gen10', 'HPE', ['U30 v2.72', 'U30 v2.80']),
+    ('Supermicro', 'AS -2124US-TNRP', 'H12DSU-iN', 'American Megatrends Inc.', ['2.3', '2.4a']),
+    ('Lenovo', 'ThinkSystem SR650', '7X06CTO1WW', 'Lenovo', ['IVE170M-3.70', 'IVE176I-3.90']),
+]
+# (CPU 모델, 논리 CPU 수, 소켓당 코어 수, 코어당 스레드 수)
+_CPU_MODELS = [
+    ('Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz', 80, 20, 2),
+    ('Intel(R) Xeon(R) Silver 4214R CPU @ 2.40GHz', 48, 12, 2),
+    ('Intel(R) Xeon(R) Platinum 8380 CPU @ 2.30GHz', 160, 40, 2),
+    ('AMD EPYC 7543 32-Core Processor', 128, 32, 2),
+    ('AMD EPYC 7763 64-Core Processor', 256, 64, 2),
+]
+# (배포판, 버전, 커널)
+_OS_RELEASES = [
+    ('Rocky Linux', '8.8', '4.18.0-477.27.1.el8_8.x86_64'),
+    ('Rocky Linux', '9.3', '5.14.0-362.8.1.el9_3.x86_64'),
+    ('CentOS Linux', '7', '3.10.0-1160.el7.x86_64'),
+    ('Ubuntu', '22.04', '5.15.0-91-generic'),
+    ('Ubuntu', '20.04', '5.4.0-169-generic'),
+]
+_MEMORY_SIZES_MB = [64000, 128000, 192000, 256000, 385000, 514000, 1030000]
+
+def _random_serial(rng, length=7):
+    return ''.join(rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ0123456789') for _ in range(length))
+
+def synthetic_host_record(rng, index):
+    """
+    가상 호스트 하나의 하드웨어 정보를 process_hw_info_bash_only의 호스트 데이터와 같은 구조로 만듭니다.
+    """
+    manufacturer, product_name, board_product, bios_vendor, bios_versions = rng.choice(_SYSTEM_MODELS)
+    cpu_model, logical_cpus, cores_per_socket, threads_per_core = rng.choice(_CPU_MODELS)
+    distribution, os_version, kernel = rng.choice(_OS_RELEASES)
+    serial = _random_serial(rng)
+    ip_addresses = [f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"]
+    if rng.random() < 0.5:
+        ip_addresses.append(f"192.168.{index >> 8 & 255}.{index & 255}")
+    return {
+        'hostname': f"node{index:06d}",
+        'ip_addresses': ip_addresses,
+        'cpu': {'model': cpu_model, 'logical_cpus': str(logical_cpus),
+                'cores_per_socket': str(cores_per_socket), 'threads_per_core': str(threads_per_core)},
+        'system_info': {'manufacturer': manufacturer, 'product_name': product_name,
+                        'serial_number': serial, 'version': 'N/A'},
+        'mainboard': {'manufacturer': manufacturer, 'product': board_product,
+                      'serial': f"/{serial}/CN{rng.randint(1000, 9999)}/", 'version': f"A0{rng.randint(0, 9)}"},
+        'bios': {'vendor': bios_vendor, 'version': rng.choice(bios_versions)},
+        'os': {'distribution': distribution, 'version': os_version, 'kernel': kernel},
+        'memory_mb': str(rng.choice(_MEMORY_SIZES_MB)),
+    }
+
+def _blank_na_fields(rng, record):
+    # dmidecode를 실행할 수 없는 호스트처럼 DMI 필드 일부를 N/A로 만듭니다.
+    for section in ('system_info', 'mainboard', 'bios'):
+        for key in record[section]:
+            if rng.random() < 0.7:
+                record[section][key] = 'N/A'
+    if rng.random() < 0.3:
+        record['memory_mb'] = 'N/A'
+
+def render_raw_v1(record, su_fallback=False, with_header=True):
+    """
+    형식 버전 1(---HOST: / ---SECTION:) raw 파일 내용을 만듭니다.
+    기본 수집 경로는 CPU 섹션이 3줄(모델, 논리 CPU, 코어당 스레드)이고, su 경로는 4줄입니다.
+    """
+    cpu = record['cpu']
+    if su_fallback:
+        cpu_lines = [cpu['model'], cpu['logical_cpus'], cpu['cores_per_socket'], cpu['threads_per_core']]
+    else:
+        cpu_lines = [cpu['model'], cpu['logical_cpus'], cpu['threads_per_core']]
+    sections = [
+        ('IP_ADDRESSES', [' '.join(record['ip_addresses'])]),
+        ('CPU', cpu_lines),
+        ('SYSTEM_INFO', list(record['system_info'].values())),
+        ('MAINBOARD', list(record['mainboard'].values())),
+        ('BIOS', list(record['bios'].values())),
+        ('OS_INFO', list(record['os'].values())),
+        ('MEMORY', [record['memory_mb']]),
+    ]
+    lines = [f"---HOST:{record['hostname']}---"] if with_header else []
+    for section_name, values in sections:
+        lines.append(f"---SECTION:{section_name}---")
+        lines.extend(values)
+    return '\n'.join(lines) + '\n'
+
+def render_raw_v2(record, with_header=True):
+    """
+    형식 버전 2(---HWINFO:2--- 뒤에 key=value) raw 파일 내용을 만듭니다.
+    """
+    lines = [f"---HWINFO:{hw.RAW_FORMAT_VERSION}---"] if with_header else []
+    lines.append(f"hostname={record['hostname']}")
+    lines.append(f"ip_addresses={' '.join(record['ip_addresses'])}")
+    for section in ('cpu', 'system_info', 'mainboard', 'bios', 'os'):
+        lines.extend(f"{section}.{key}={value}" for key, value in record[section].items())
+    lines.append(f"memory_mb={record['memory_mb']}")
+    lines.append("---END---")
+    return '\n'.join(lines) + '\n'
+
+def generate_fleet(out_dir, host_count, seed=0, raw_format='mixed'):
+    """
+    out_dir 아래에 가상 fleet을 만듭니다.
+        out_dir/inventory.ini                       호스트 범위 대신 호스트별 한 줄 (실제 인벤토리와 같은 형태)
+        out_dir/fetched_hw_data/<호스트>_raw_hw.txt
+    raw_format은 'v1', 'v2' 또는 'mixed'(호스트별로 무작위)입니다.
+    실패 변형(파일 없음, 헤더 없음, N/A 필드, su 경로의 4줄 CPU 섹션)이 일정 비율로 섞이며,
+    변형별 호스트 수를 딕셔너리로 반환합니다. 같은 seed는 항상 같은 fleet을 만듭니다.
+    """
+    rng = random.Random(seed)
+    data_dir = os.path.join(out_dir, hw.FETCHED_HW_DATA_DIR)
+    if os.path.isdir(data_dir):
+        shutil.rmtree(data_dir)
+    os.makedirs(data_dir)
+
+    counts = {'hosts': host_count, 'missing_file': 0, 'missing_header': 0, 'na_fields': 0, 'su_fallback': 0, 'v2': 0}
+    with open(os.path.join(out_dir, 'inventory.ini'), 'w', encoding='utf-8') as inventory:
+        inventory.write("[servers]\n")
+        for index in range(1, host_count + 1):
+            record = synthetic_host_record(rng, index)
+            hostname = record['hostname']
+            inventory.write(f"{hostname} ansible_host={record['ip_addresses'][0]} ansible_user=admin\n")
+
+            if rng.random() < MISSING_FILE_RATE:
+                counts['missing_file'] += 1
+                continue
+            with_header = rng.random() >= MISSING_HEADER_RATE
+            counts['missing_header'] += not with_header
+            if rng.random() < NA_FIELDS_RATE:
+                counts['na_fields'] += 1
+                _blank_na_fields(rng, record)
+
+            if raw_format == 'v2' or (raw_format == 'mixed' and rng.random() < 0.5):
+                counts['v2'] += 1
+                content = render_raw_v2(record, with_header=with_header)
+            else:
+                su_fallback = rng.random() < SU_FALLBACK_RATE
+                counts['su_fallback'] += su_fallback
+                content = render_raw_v1(record, su_fallback=su_fallback, with_header=with_header)
+            with open(os.path.join(data_dir, hostname + hw.RAW_FILE_SUFFIX), 'w', encoding='utf-8') as f:
+                f.write(content)
+    return counts
+
+# 벤치마크 단계 이름 -> 설명
+BENCH_STAGES = {
+    'parse_raw': "parse_raw_hw_data (raw 파일 순차 파싱)",
+    'parse_all': "parse_all_hw_data_files (인벤토리 매칭 포함, 캐시 없음)",
+    'html': "generate_html_report",
+    'yaml': "generate_yaml_report",
+}
+
+def _stage_paths(fleet_dir):
+    result_dir = os.path.join(fleet_dir, 'result')
+    return {
+        'inventory': os.path.join(fleet_dir, 'inventory.ini'),
+        'data_dir': os.path.join(fleet_dir, hw.FETCHED_HW_DATA_DIR),
+        'result_dir': result_dir,
+        'parsed': os.path.join(result_dir, 'bench_parsed.json'),
+        'html': os.path.join(result_dir, 'bench_report.html'),
+        'search_index': os.path.join(result_dir, 'bench_search_index.json'),
+        'yaml': os.path.join(result_dir, 'bench_report.yaml'),
+    }
+
+def run_stage(stage, fleet_dir, workers=1):
+    """
+    벤치마크 단계 하나를 현재 프로세스에서 실행하고 {'seconds', 'items', 'bytes'}를 반환합니다.
+    시간은 해당 함수 호출만 측정합니다. html/yaml 단계의 입력은 parse_all 단계가 저장한 파싱 결과입니다.
+    """
+    paths = _stage_paths(fleet_dir)
+    os.makedirs(paths['result_dir'], exist_ok=True)
+
+    if stage == 'parse_raw':
+        file_paths = [entry.path for entry in hw.scan_raw_hw_files(paths['data_dir']).values()]
+        started = time.perf_counter()
+        for path in file_paths:
+            hw.parse_raw_hw_data(path, verbose=False)
+        elapsed = time.perf_counter() - started
+        return {'seconds': elapsed, 'items': len(file_paths),
+                'bytes': sum(os.path.getsize(path) for path in file_paths)}
+
+    if stage == 'parse_all':
+        started = time.perf_counter()
+        data = hw.parse_all_hw_data_files(paths['data_dir'], paths['inventory'], workers=workers)
+        elapsed = time.perf_counter() - started
+        with open(paths['parsed'], 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=hw.HostRecord.to_dict)
+        return {'seconds': elapsed, 'items': len(data), 'bytes': None}
+
+    with open(paths['parsed'], 'r', encoding='utf-8') as f:
+        data = {host: hw.HostRecord.from_dict(record) for host, record in json.load(f).items()}
+    started = time.perf_counter()
+    if stage == 'html':
+        hw.generate_html_report(data, paths['html'], search_index_file=paths['search_index'])
+    elif stage == 'yaml':
+        hw.generate_yaml_report(data, paths['yaml'])
+    else:
+        raise ValueError(f"알 수 없는 벤치마크 단계: {stage}")
+    elapsed = time.perf_counter() - started
+    output = paths['html'] if stage == 'html' else paths['yaml']
+    return {'seconds': elapsed, 'items': len(data), 'bytes': os.path.getsize(output)}
+
+def measure_stage(stage, fleet_dir, workers=1):
+    """
+    단계 하나를 별도 프로세스에서 실행하여 결과와 최대 RSS(KB)를 측정합니다.
+    프로세스를 나누는 이유는 앞 단계의 메모리 사용량이 다음 단계의 최대 RSS에 섞이지 않게 하기 위해서입니다.
+    (최대 RSS에는 인터프리터와 입력 데이터 적재 비용이 포함됩니다)
+    """
+    result_file = os.path.join(_stage_paths(fleet_dir)['result_dir'], f'bench_stage_{stage}.json')
+    os.makedirs(os.path.dirname(result_file), exist_ok=True)
+    command = [sys.executable, os.path.abspath(__file__), '_stage', stage, fleet_dir,
+               '--workers', str(workers), '--result-file', result_file]
+    # 보고서 함수의 진행 메시지는 측정 결과 표시에 방해가 되므로 버립니다.
+    proc = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise RuntimeError(f"벤치마크 단계 '{stage}'가 실패했습니다 (종료 코드 {proc.returncode})")
+    with open(result_file, 'r', encoding='utf-8') as f:
+        result = json.load(f)
+    seconds = max(result['seconds'], 1e-9)
+    result['items_per_sec'] = result['items'] / seconds
+    result['mb_per_sec'] = result['bytes'] / seconds / (1024 * 1024) if result['bytes'] else None
+    result['peak_rss_kb'] = rusage.ru_maxrss # Linux에서는 KB 단위
+    return result
+
+def run_benchmark(sizes, work_dir, stages, workers=1, seed=0, raw_format='mixed', keep=False):
+    """
+    규모별로 fleet을 만들고 각 단계를 측정합니다. {'규모': {'fleet': 변형별 수, '단계': 측정 결과}} 형태로 반환합니다.
+    """
+    results = {}
+    for size in sizes:
+        fleet_dir = os.path.join(work_dir, f'fleet_{size}')
+        print(f"\n[{size}개 호스트] 가상 fleet 생성 중: {fleet_dir}")
+        started = time.perf_counter()
+        counts = generate_fleet(fleet_dir, size, seed=seed, raw_format=raw_format)
+        print(f"  생성 완료 ({time.perf_counter() - started:.1f}초): 파일 없음 {counts['missing_file']}, "
+              f"헤더 없음 {counts['missing_header']}, N/A 필드 {counts['na_fields']}, "
+              f"su CPU 섹션 {counts['su_fallback']}, 형식 버전 2 {counts['v2']}")
+        results[str(size)] = {'fleet': counts}
+        for stage in stages:
+            result = measure_stage(stage, fleet_dir, workers=workers)
+            results[str(size)][stage] = result
+            print(f"  {stage:<10} {result['seconds']:9.3f}초  {result['items_per_sec']:12.1f} hosts/s  "
+                  f"최대 RSS {result['peak_rss_kb'] / 1024:8.1f} MB")
+        if not keep:
+            shutil.rmtree(fleet_dir, ignore_errors=True)
+    return results
+
+def print_comparison(results, baseline):
+    """
+    이전 벤치마크 결과(baseline)와 비교하여 단계별 시간/메모리 비율을 출력합니다. (1보다 크면 느려지거나 늘어난 것)
+    """
+    print("\n기준 결과와 비교 (현재 / 기준)")
+    print(f"{'규모':>8} {'단계':<10} {'시간':>8} {'최대 RSS':>10}")
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            old = baseline.get('results', {}).get(size, {}).get(stage)
+            if stage == 'fleet' or not old:
+                continue
+            time_ratio = result['seconds'] / max(old['seconds'], 1e-9)
+            rss_ratio = result['peak_rss_kb'] / max(old['peak_rss_kb'], 1)
+            print(f"{size:>8} {stage:<10} {time_ratio:7.2f}x {rss_ratio:9.2f}x")
+
+def _parse_int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(description="가상 fleet 생성 및 보고서 처리 단계 벤치마크")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = subparsers.add_parser('generate', help="가상 fleet(raw 파일 + inventory.ini) 생성")
+    generate_parser.add_argument('out_dir', help="fleet을 만들 디렉토리")
+    generate_parser.add_argument('--hosts', type=int, default=1000, help="호스트 수 (기본값: 1000)")
+    generate_parser.add_argument('--seed', type=int, default=0, help="난수 시드 (기본값: 0)")
+    generate_parser.add_argument('--raw-format', choices=['v1', 'v2', 'mixed'], default='mixed',
+                                 help="raw 파일 형식 버전 (기본값: mixed)")
+
+    run_parser = subparsers.add_parser('run', help="규모별 단계 벤치마크 실행")
+    run_parser.add_argument('--sizes', type=_parse_int_list, default=DEFAULT_SIZES,
+                            help="쉼표로 구분한 호스트 수 목록 (기본값: 100,10000,100000)")
+    run_parser.add_argument('--stages', default=','.join(BENCH_STAGES),
+                            help=f"측정할 단계 (기본값: {','.join(BENCH_STAGES)})")
+    run_parser.add_argument('--workers', type=int, default=1, help="parse_all 단계의 파싱 worker 수 (기본값: 1)")
+    run_parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR, help=f"작업 디렉토리 (기본값: {DEFAULT_WORK_DIR})")
+    run_parser.add_argument('--seed', type=int, default=0, help="난수 시드 (기본값: 0)")
+    run_parser.add_argument('--raw-format', choices=['v1', 'v2', 'mixed'], default='mixed',
+                            help="raw 파일 형식 버전 (기본값: mixed)")
+    run_parser.add_argument('--keep', action='store_true', help="측정 후 가상 fleet을 지우지 않음")
+    run_parser.add_argument('--output', help="측정 결과를 저장할 JSON 파일")
+    run_parser.add_argument('--baseline', help="비교할 이전 측정 결과 JSON 파일")
+
+    # 내부용: measure_stage가 별도 프로세스에서 단계 하나를 실행할 때 사용
+    stage_parser = subparsers.add_parser('_stage')
+    stage_parser.add_argument('stage', choices=list(BENCH_STAGES))
+    stage_parser.add_argument('fleet_dir')
+    stage_parser.add_argument('--workers', type=int, default=1)
+    stage_parser.add_argument('--result-file', required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        counts = generate_fleet(args.out_dir, args.hosts, seed=args.seed, raw_format=args.raw_format)
+        print(f"가상 fleet 생성 완료: {args.out_dir} ({json.dumps(counts, ensure_ascii=False)})")
+        return 0
+
+    if args.command == '_stage':
+        result = run_stage(args.stage, args.fleet_dir, workers=args.workers)
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return 0
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in BENCH_STAGES]
+    if unknown:
+        print(f"오류: 알 수 없는 단계: {', '.join(unknown)} (사용 가능: {', '.join(BENCH_STAGES)})")
+        return 1
+    # html/yaml 단계는 parse_all 단계가 저장한 파싱 결과를 입력으로 사용합니다.
+    if any(stage in ('html', 'yaml') for stage in stages) and 'parse_all' not in stages:
+        stages.insert(0, 'parse_all')
+
+    results = run_benchmark(args.sizes, args.work_dir, stages, workers=args.workers, seed=args.seed,
+                            raw_format=args.raw_format, keep=args.keep)
+    report = {
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'workers': args.workers,
+        'raw_format': args.raw_format,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"\n측정 결과 저장: {args.output}")
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            print_comparison(results, json.load(f))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
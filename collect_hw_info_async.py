@@ -0,0 +1,348 @@
+import os
+import sys
+import time
+import re
+import signal
+import shutil
+import base64
+import getpass
+import asyncio
+import json
+import argparse
+import tempfile
+try:
+    import yaml # 플레이북에서 수집 스크립트를 읽기 위해 PyYAML 라이브러리 import
+except ImportError:
+    print("오류: PyYAML 라이브러리를 찾을 수 없습니다.")
+    print("수집 스크립트를 플레이북에서 읽으려면 'pip install PyYAML' 명령으로 설치해야 합니다.")
+    sys.exit(1) # PyYAML 없으면 스크립트 종료
+
+from process_hw_info_bash_only import (
+    FETCHED_HW_DATA_DIR,
+    PACK_COMPRESSIONS,
+    RAW_FILE_SUFFIX,
+    HwPackWriter,
+    parse_inventory_hosts,
+    parse_inventory_host_vars,
+)
+
+# 사용법: python3 collect_hw_info_async.py inventory.ini [옵션]
+# ansible-playbook 대신 ssh 서브프로세스로 같은 수집 스크립트를 실행하여 <호스트>_raw_hw.txt 파일을 만듭니다.
+
+# 수집 스크립트를 읽어올 플레이북 (ansible-playbook 경로와 같은 스크립트를 사용합니다)
+ANSIBLE_HW_PLAYBOOK = "collect_hw_info_bash_only.yml"
+
+# 동시에 접속할 최대 호스트 수와 호스트별 제한 시간(초)
+DEFAULT_FORKS = 50
+DEFAULT_TIMEOUT = 120
+
+# run_all_hw_bash_only.sh의 ansible-playbook 호출과 같은 SSH 옵션
+SSH_COMMON_OPTIONS = ['-o', 'StrictHostKeyChecking=no', '-o', 'UserKnownHostsFile=/dev/null', '-o', 'LogLevel=ERROR']
+
+def load_collection_script(playbook_file):
+    """
+    플레이북의 첫 번째 block 태스크에서 ansible.builtin.raw 스크립트를 읽어옵니다.
+    ansible-playbook 경로와 같은 스크립트를 실행하기 위해 사용합니다.
+    """
+    with open(playbook_file, 'r', encoding='utf-8') as f:
+        plays = yaml.safe_load(f)
+    for play in plays or []:
+        for task in play.get('tasks', []):
+            for block_task in task.get('block', []):
+                script = block_task.get('ansible.builtin.raw') or block_task.get('raw')
+                if script:
+                    return script
+    raise ValueError(f"플레이북 '{playbook_file}'에서 raw 수집 스크립트를 찾을 수 없습니다.")
+
+def build_ssh_command(ssh_command, host, host_vars, control_dir, connect_timeout, tty=False):
+    """
+    호스트 변수(ansible_host, ansible_port, ansible_user, ansible_ssh_private_key_file)로 ssh 명령 인자 리스트를 만듭니다.
+    control_dir이 주어지면 ControlMaster로 연결을 재사용합니다.
+    """
+    command = [ssh_command] + SSH_COMMON_OPTIONS + ['-o', f'ConnectTimeout={connect_timeout}']
+    if control_dir:
+        command += ['-o', 'ControlMaster=auto', '-o', f'ControlPath={os.path.join(control_dir, "%C")}',
+                    '-o', 'ControlPersist=60s']
+    if 'ansible_password' not in host_vars:
+        command += ['-o', 'BatchMode=yes'] # 비밀번호 프롬프트에서 멈추지 않도록 합니다.
+    if tty:
+        command.append('-tt')
+    if host_vars.get('ansible_port'):
+        command += ['-p', host_vars['ansible_port']]
+    if host_vars.get('ansible_user'):
+        command += ['-l', host_vars['ansible_user']]
+    if host_vars.get('ansible_ssh_private_key_file'):
+        command += ['-i', os.path.expanduser(host_vars['ansible_ssh_private_key_file'])]
+    command.append(host_vars.get('ansible_host', host))
+    return command
+
+def build_become_commands(script, become_pass):
+    """
+    (방식, 원격 명령, stdin, tty 필요 여부) 리스트를 반환합니다. 플레이북처럼 sudo를 먼저 시도하고 실패하면 su를 시도합니다.
+    스크립트는 base64로 명령 인자에 담아 보내므로 stdin에는 비밀번호만 들어갑니다.
+    """
+    encoded = base64.b64encode(script.encode('utf-8')).decode('ascii')
+    decoded = f"printf %s {encoded} | base64 -d"
+    password_input = f"{become_pass}\n".encode('utf-8') if become_pass is not None else b''
+    sudo_options = "-S -p ''" if become_pass is not None else "-n"
+    return [
+        ('sudo', f'sudo {sudo_options} bash -c "$({decoded})"', password_input, False),
+        # su는 터미널에서만 비밀번호를 읽으므로 -tt로 pty를 할당합니다.
+        # pty가 stdin으로 보낸 비밀번호를 출력으로 되돌려 보내지 않도록 먼저 echo를 끕니다.
+        ('su', f"stty -echo 2>/dev/null; su root -c '{decoded} | bash'", password_input, True),
+    ]
+
+# raw 데이터의 첫 줄 (형식 버전 2 또는 1의 헤더). 줄바꿈 없는 프롬프트('Password: ') 바로 뒤에 올 수도 있습니다.
+_RAW_HEADER_RE = re.compile(r'---(?:HWINFO|HOST):')
+
+def clean_collected_output(output, become_pass=None):
+    """
+    수집 출력에서 pty 줄바꿈(\\r\\n)과, raw 데이터 헤더 줄 이전의 로그인 배너/su 비밀번호 프롬프트를 제거합니다.
+    stty -echo 전에 pty가 비밀번호를 되돌려 보낸 경우에 대비해, become_pass와 정확히 같은 줄도 제거합니다.
+    """
+    text = output.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '')
+    header = _RAW_HEADER_RE.search(text)
+    if header:
+        text = text[header.start():]
+    if become_pass:
+        text = ''.join(line for line in text.splitlines(keepends=True) if line.rstrip('\n') != become_pass)
+    return text
+
+def add_collect_metadata(content, method, wall_seconds):
+    """
+    형식 버전 2 raw 내용의 '---END---' 앞에 수집 메타데이터(권한 상승 방식, ssh 접속을 포함한 전체 소요 시간)를 추가합니다.
+    process_hw_info_bash_only.py --metrics가 호스트별 수집 시간으로 사용합니다. 버전 1 내용은 그대로 둡니다.
+    """
+    if not content.startswith('---HWINFO:'):
+        return content
+    metadata = f"collect.method={method}\ncollect.wall_seconds={wall_seconds:.3f}\n"
+    end = content.rfind('---END---')
+    if end < 0:
+        return content.rstrip('\n') + '\n' + metadata
+    return content[:end] + metadata + content[end:]
+
+async def _run_ssh(command, stdin_data, timeout, env):
+    """
+    ssh 서브프로세스를 실행하고 (종료 코드, stdout, stderr)를 반환합니다.
+    제한 시간을 넘기면 sshpass가 띄운 ssh까지 함께 종료되도록 프로세스 그룹 전체를 종료합니다.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE, env=env, start_new_session=True)
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(stdin_data), timeout)
+    except asyncio.TimeoutError:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        raise
+    return process.returncode, stdout, stderr
+
+def _write_raw_file(output_dir, host, content):
+    """
+    임시 파일에 쓴 뒤 교체하여, 중단되더라도 반쯤 쓰인 raw 파일이 남지 않도록 합니다.
+    """
+    file_path = os.path.join(output_dir, f"{host}{RAW_FILE_SUFFIX}")
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, file_path)
+    return file_path
+
+async def collect_host(host, host_vars, script, options, semaphore, control_dir):
+    """
+    호스트 한 대에서 수집 스크립트를 실행하고 결과 딕셔너리를 반환합니다.
+    sudo -> su 순서로 시도하며, 출력에 '---' 구분자가 있으면 성공으로 간주하고 raw 파일을 기록합니다.
+    """
+    become_pass = host_vars.get('ansible_become_pass', options.become_pass)
+    env = None
+    command_prefix = []
+    if host_vars.get('ansible_password'):
+        if options.sshpass:
+            command_prefix = [options.sshpass, '-e']
+            env = dict(os.environ, SSHPASS=host_vars['ansible_password'])
+        else:
+            print(f"경고: 호스트 '{host}'에 ansible_password가 있지만 sshpass를 찾을 수 없습니다. 키 인증을 시도합니다.")
+
+    # connected: ssh 접속 자체는 성공했는지 (ControlMaster 정리 대상)
+    result = {'host': host, 'status': 'failed', 'method': None, 'elapsed': 0.0, 'error': None, 'connected': False}
+    async with semaphore:
+        started = time.monotonic()
+        for method, remote_command, stdin_data, tty in build_become_commands(script, become_pass):
+            command = command_prefix + build_ssh_command(options.ssh_command, host, host_vars, control_dir,
+                                                         options.connect_timeout, tty=tty) + [remote_command]
+            try:
+                returncode, stdout, stderr = await _run_ssh(command, stdin_data, options.timeout, env)
+            except asyncio.TimeoutError:
+                result['status'] = 'timeout'
+                result['error'] = f"{options.timeout}초 안에 응답이 없습니다."
+                break
+            except OSError as e:
+                result['error'] = str(e)
+                break
+            if returncode == 255:
+                # ssh 자체의 접속 실패이므로 다른 권한 상승 방식을 시도해도 소용이 없습니다.
+                result['error'] = stderr.decode('utf-8', errors='replace').strip() or "SSH 접속 실패"
+                break
+            result['connected'] = True
+            content = clean_collected_output(stdout, become_pass)
+            if returncode == 0 and content.startswith('---'):
+                content = add_collect_metadata(content, method, time.monotonic() - started)
+                if options.pack_writer:
+                    # 이벤트 루프 한 스레드에서만 쓰므로 레코드가 섞이지 않습니다.
+                    options.pack_writer.add(host, content.encode('utf-8'))
+                    result['raw_file'] = f"{options.pack}#{host}"
+                else:
+                    result['raw_file'] = _write_raw_file(options.output_dir, host, content)
+                result['status'] = 'collected'
+                result['method'] = method
+                result['error'] = None
+                break
+            result['error'] = f"{method}: 종료 코드 {returncode} {stderr.decode('utf-8', errors='replace').strip()}".strip()
+        result['elapsed'] = time.monotonic() - started
+    return result
+
+async def _close_control_masters(options, results, inventory_vars, control_dir, semaphore):
+    """
+    접속에 성공했던 호스트의 ControlMaster 연결을 수집과 같은 동시 실행 수(semaphore) 안에서 정리합니다.
+    (ControlPersist 시간이 지나도 자동으로 종료되므로, 정리하지 못한 연결은 경고만 출력합니다)
+    """
+    async def close(host):
+        command = build_ssh_command(options.ssh_command, host, inventory_vars.get(host, {}), control_dir,
+                                    options.connect_timeout)
+        command[-1:-1] = ['-O', 'exit']
+        async with semaphore:
+            try:
+                process = await asyncio.create_subprocess_exec(*command, stdin=asyncio.subprocess.DEVNULL,
+                                                               stdout=asyncio.subprocess.DEVNULL,
+                                                               stderr=asyncio.subprocess.DEVNULL)
+            except OSError as e:
+                return f"{host}: {e}"
+            try:
+                await asyncio.wait_for(process.wait(), options.connect_timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                return f"{host}: {options.connect_timeout}초 안에 종료되지 않음"
+        return None
+
+    errors = await asyncio.gather(*(close(result['host']) for result in results if result['connected']))
+    errors = [error for error in errors if error]
+    if errors:
+        print(f"경고: ControlMaster 연결 {len(errors)}개를 정리하지 못했습니다 (ControlPersist 후 자동 종료): {errors[0]}")
+
+async def collect_all(hosts, inventory_vars, script, options):
+    """
+    모든 호스트를 최대 options.forks개씩 동시에 수집하고 결과 리스트를 hosts 순서대로 반환합니다.
+    """
+    semaphore = asyncio.Semaphore(options.forks)
+    control_dir = None
+    if options.multiplex:
+        # ControlPath는 소켓 경로 길이 제한이 있으므로 짧은 임시 디렉토리를 사용합니다.
+        control_dir = tempfile.mkdtemp(prefix='hwssh-', dir='/tmp' if os.path.isdir('/tmp') else None)
+    try:
+        results = await asyncio.gather(*(collect_host(host, inventory_vars.get(host, {}), script, options,
+                                                      semaphore, control_dir) for host in hosts))
+        if control_dir:
+            await _close_control_masters(options, results, inventory_vars, control_dir, semaphore)
+    finally:
+        if control_dir:
+            shutil.rmtree(control_dir, ignore_errors=True)
+    return results
+
+def write_collect_metrics(metrics_file, results, elapsed, options):
+    """
+    호스트별 수집 상태, 권한 상승 방식, 소요 시간(초)을 느린 순서로 JSON 파일에 기록합니다.
+    """
+    metrics = {
+        'run_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'forks': options.forks,
+        'timeout': options.timeout,
+        'elapsed_seconds': round(elapsed, 3),
+        'hosts': [
+            {'host': result['host'], 'status': result['status'], 'method': result['method'],
+             'seconds': round(result['elapsed'], 3), 'error': result['error']}
+            for result in sorted(results, key=lambda result: result['elapsed'], reverse=True)
+        ],
+    }
+    os.makedirs(os.path.dirname(metrics_file) or '.', exist_ok=True)
+    with open(metrics_file, 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, ensure_ascii=False, indent=1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ssh로 원격 서버 하드웨어 정보 수집 (ansible-playbook 대체)")
+    parser.add_argument('inventory_file', help="Ansible 인벤토리 파일 경로")
+    parser.add_argument('--playbook', default=ANSIBLE_HW_PLAYBOOK,
+                        help=f"수집 스크립트를 읽어올 플레이북 (기본값: {ANSIBLE_HW_PLAYBOOK})")
+    parser.add_argument('--output-dir', default=FETCHED_HW_DATA_DIR,
+                        help=f"raw 파일을 저장할 디렉토리 (기본값: {FETCHED_HW_DATA_DIR})")
+    parser.add_argument('--pack', metavar='FILE',
+                        help="raw 파일 대신 이 pack 파일(.hwpack)에 호스트별 레코드를 추가 (--output-dir 무시)")
+    parser.add_argument('--pack-compression', choices=sorted(PACK_COMPRESSIONS), default='deflate',
+                        help="--pack 레코드 압축 방식 (기본값: deflate)")
+    parser.add_argument('--forks', type=int, default=DEFAULT_FORKS, help=f"동시 접속 호스트 수 (기본값: {DEFAULT_FORKS})")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f"호스트별 명령 제한 시간(초) (기본값: {DEFAULT_TIMEOUT})")
+    parser.add_argument('--connect-timeout', type=int, default=10, help="SSH 접속 제한 시간(초) (기본값: 10)")
+    parser.add_argument('--ssh-command', default='ssh', help="사용할 ssh 실행 파일 (테스트용 가짜 ssh 지정 가능)")
+    parser.add_argument('--no-multiplex', dest='multiplex', action='store_false', help="SSH ControlMaster 연결 재사용 끄기")
+    parser.add_argument('--ask-become-pass', action='store_true',
+                        help="인벤토리에 ansible_become_pass가 없는 호스트에 사용할 sudo/su 비밀번호를 입력받음")
+    parser.add_argument('--hosts', help="이 파일에 나열된 호스트만 수집 (한 줄에 하나)")
+    parser.add_argument('--metrics', metavar='FILE', help="호스트별 수집 결과와 소요 시간을 JSON으로 기록")
+    options = parser.parse_args(argv)
+
+    hosts = parse_inventory_hosts(options.inventory_file)
+    if options.hosts:
+        with open(options.hosts, 'r', encoding='utf-8') as f:
+            wanted = {line.strip() for line in f if line.strip() and not line.startswith('#')}
+        hosts = [host for host in hosts if host in wanted]
+    if not hosts:
+        print(f"오류: 인벤토리 파일 '{options.inventory_file}'에서 대상 호스트를 찾을 수 없습니다.")
+        return 1
+    inventory_vars = parse_inventory_host_vars(options.inventory_file)
+
+    try:
+        script = load_collection_script(options.playbook)
+    except (OSError, ValueError) as e:
+        print(f"오류: 수집 스크립트를 읽을 수 없습니다: {e}")
+        return 1
+
+    options.become_pass = getpass.getpass("BECOME password: ") if options.ask_become_pass else None
+    options.sshpass = shutil.which('sshpass')
+    options.pack_writer = None
+    if options.pack:
+        try:
+            options.pack_writer = HwPackWriter(options.pack, options.pack_compression)
+        except (OSError, ValueError) as e:
+            print(f"오류: pack 파일을 열 수 없습니다: {e}")
+            return 1
+    else:
+        os.makedirs(options.output_dir, exist_ok=True)
+
+    print(f"{len(hosts)}개 호스트에서 하드웨어 정보 수집 중 (동시 {options.forks}개, 제한 시간 {options.timeout:g}초)...")
+    started = time.monotonic()
+    try:
+        results = asyncio.run(collect_all(hosts, inventory_vars, script, options))
+    finally:
+        if options.pack_writer:
+            options.pack_writer.close() # 중단되더라도 그때까지 추가한 레코드의 색인을 씁니다.
+    elapsed = time.monotonic() - started
+    if options.pack_writer:
+        print(f"raw 데이터를 pack에 추가했습니다: {options.pack}")
+
+    failed = [result for result in results if result['status'] != 'collected']
+    for result in failed:
+        print(f"-> 호스트 '{result['host']}' 수집 실패 ({result['status']}): {result['error']}")
+    print(f"\n수집 완료: 성공 {len(results) - len(failed)}개, 실패 {len(failed)}개, {elapsed:.1f}초")
+    slowest = sorted(results, key=lambda result: result['elapsed'], reverse=True)[:5]
+    print("가장 느린 호스트: " + ', '.join(f"{result['host']}({result['elapsed']:.1f}초)" for result in slowest))
+    if options.metrics:
+        write_collect_metrics(options.metrics, results, elapsed, options)
+        print(f"수집 측정 결과가 저장되었습니다: {options.metrics}")
+    return 2 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
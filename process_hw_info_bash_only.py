@@ -1,6 +1,37 @@
 import os
 import sys
 import re
+import time
+import json
+import hashlib
+import mmap
+import zlib
+import lzma
+import shlex
+import string
+import html
+import csv
+import io
+import sqlite3
+import select
+import signal
+import stat
+import struct
+import argparse
+import bisect
+import http.server
+import urllib.parse
+import contextlib
+import ctypes
+import ctypes.util
+import cProfile
+import pstats
+import functools
+import itertools
+import collections
+import operator
+from array import array
+import concurrent.futures
 try:
     import yaml # YAML 파일 생성을 위해 PyYAML 라이브러리 import
 except ImportError:
@@ -18,151 +49,1163 @@ RESULT_DIR = "./result/" # <--- 새로운 결과 디렉토리 정의
 HTML_REPORT_FILE = os.path.join(RESULT_DIR, "hardware_inventory_report_bash_only.html")
 YAML_REPORT_FILE = os.path.join(RESULT_DIR, "hardware_inventory_report_bash_only.yaml")
 
-def parse_inventory_hosts(inventory_file):
+# 보고서 검색용 인덱스 파일 (HTML 보고서에도 같은 인덱스가 포함됩니다)
+SEARCH_INDEX_FILE = os.path.join(RESULT_DIR, "hardware_inventory_search_index.json")
+# HTML 보고서의 페이지당 호스트 수. 호스트가 이보다 많으면 색인 페이지와 호스트 페이지로 나뉩니다. (0이면 분할하지 않음)
+HTML_SHARD_SIZE = 500
+
+# 실행마다 모든 호스트 스냅샷이 추가되는 이력 저장소 (query 하위 명령으로 조회)
+HISTORY_DB_FILE = os.path.join(RESULT_DIR, "hardware_inventory_history.sqlite")
+
+# 실행 간 변경 감지: 이전 실행의 호스트별 지문/필드 스냅샷과 이번 실행의 변경 내역(JSON)
+SNAPSHOT_FILE = os.path.join(RESULT_DIR, "hw_fleet_snapshot.json")
+CHANGES_FILE = os.path.join(RESULT_DIR, "hardware_inventory_changes.json")
+# 수집 일정(schedule)의 호스트별 마지막 수집/시도 상태와, 다음 수집 대상 목록 (한 줄에 하나, 수집기 --hosts / ansible --limit @파일)
+SCHEDULE_FILE = os.path.join(RESULT_DIR, "hw_collect_schedule.json")
+SCHEDULE_TARGETS_FILE = os.path.join(RESULT_DIR, "hw_collect_targets.txt")
+
+# 자원 요약(제조사/CPU 모델/OS/BIOS 버전별 호스트 수, 논리 CPU, 코어, 메모리 합계) 파일
+SUMMARY_FILE = os.path.join(RESULT_DIR, "hardware_inventory_summary.json")
+
+# --metrics / --profile 모드의 기본 출력 파일 (단계별 소요 시간, 호스트별 파싱/수집 시간, cProfile 결과)
+METRICS_FILE = os.path.join(RESULT_DIR, "hardware_inventory_metrics.json")
+PROFILE_FILE = os.path.join(RESULT_DIR, "hardware_inventory_profile.prof")
+
+# 수집된 Raw 데이터 파일 이름의 접미사 (<호스트>_raw_hw.txt)
+RAW_FILE_SUFFIX = "_raw_hw.txt"
+
+# raw 파일 묶음(pack) 파일의 확장자와 run_all_hw_bash_only.sh(PACK=1)가 실행마다 만드는 pack 파일의 디렉토리
+HW_PACK_SUFFIX = ".hwpack"
+PACK_DIR = "./archive/"
+
+# 파싱 결과 캐시 파일 (변경되지 않은 raw 파일은 다시 파싱하지 않습니다)
+PARSE_CACHE_FILE = os.path.join(RESULT_DIR, "hw_parse_cache.json")
+# 파서의 출력 형식이나 상태 판정 규칙이 바뀌면 이 값을 올려 기존 캐시를 무효화합니다.
+PARSE_CACHE_SCHEMA_VERSION = 4
+
+# 인벤토리 호스트 패턴의 범위 표기: node[001:500], rack-[a:f], web[1:10:2], node[:5] (시작 생략 시 0)
+_HOST_RANGE_RE = re.compile(r'\[([0-9a-zA-Z]*):([0-9a-zA-Z]+)(?::([0-9]+))?\]')
+# 인벤토리의 호스트 이름/IP로 허용하는 문자 (범위 표기와 host:port 포함)
+_INVENTORY_HOST_RE = re.compile(r'^[\w.\[\]:-]+$')
+
+def _expand_host_range(start, end, step):
     """
-    inventory.ini 파일에서 [servers] 그룹과 [local] 그룹을 포함한 모든 호스트 이름을 파싱합니다.
+    범위 표기 하나의 값을 하나씩 내보내는 이터레이터를 반환합니다. (Ansible과 동일)
+    시작 값이 0으로 시작하면 그 자릿수만큼 0을 채우며, 이때 끝 값도 자릿수가 같아야 합니다.
+    문자 범위는 a-z, A-Z 순서의 한 글자 범위입니다. 잘못된 범위는 값을 꺼내기 전에 ValueError를 발생시킵니다.
     """
-    hosts = []
-    current_group_type = None
-    try:
-        with open(inventory_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith('#'):
-                    continue
+    step = int(step) if step else 1
+    start = start or '0'
+    if start.isdigit() and end.isdigit():
+        width = 0
+        if start.startswith('0') and len(start) > 1:
+            if len(start) != len(end):
+                raise ValueError(f"0으로 채운 호스트 범위 [{start}:{end}]는 시작과 끝의 자릿수가 같아야 합니다.")
+            width = len(start)
+        return (str(i).zfill(width) for i in range(int(start), int(end) + 1, step))
+    letters = string.ascii_letters
+    if len(start) == 1 and len(end) == 1 and start in letters and end in letters \
+            and letters.index(start) <= letters.index(end):
+        return iter(letters[letters.index(start):letters.index(end) + 1:step])
+    raise ValueError(f"잘못된 호스트 범위 [{start}:{end}]")
 
-                group_match = re.match(r'\[(?P<group_name>[\w.-]+)\]', line)
-                if group_match:
-                    group_name = group_match.group('group_name')
-                    if group_name == 'servers':
-                        current_group_type = 'servers'
-                    elif group_name == 'local':
-                        current_group_type = 'local'
-                    else:
-                        current_group_type = None
-                    continue
+def expand_host_pattern(pattern):
+    """
+    범위 표기가 있는 호스트 패턴을 호스트 이름으로 하나씩 펼쳐 내보내는 제너레이터입니다.
+    범위가 여러 개면 모든 조합을 순서대로 만들며, 범위가 없으면 패턴 자체를 내보냅니다.
+    범위 값 목록을 미리 만들지 않으므로 node[0000:9999]-[0:99] 같은 큰 패턴도 메모리를 거의 쓰지 않습니다.
+    """
+    match = _HOST_RANGE_RE.search(pattern)
+    if match is None:
+        yield pattern
+        return
+    head, tail = pattern[:match.start()], pattern[match.end():]
+    for value in _expand_host_range(*match.groups()):
+        for rest in expand_host_pattern(tail):
+            yield head + value + rest
+
+def _split_host_pattern_port(token):
+    """
+    'host:port' 형식이면 (host, port)를, 아니면 (token, None)을 반환합니다. (범위 표기와 IPv6 주소는 포트로 보지 않음)
+    """
+    outside_ranges = _HOST_RANGE_RE.sub('', token)
+    if outside_ranges.count(':') == 1:
+        host, _, port = token.rpartition(':')
+        if port.isdigit():
+            return host, port
+    return token, None
+
+def _new_inventory():
+    return {'hosts': {}, 'groups': {'all': {'hosts': [], 'children': [], 'vars': {}}}}
+
+def _inventory_group(inventory, group_name):
+    return inventory['groups'].setdefault(group_name, {'hosts': [], 'children': [], 'vars': {}})
+
+def _add_inventory_hosts(inventory, group, pattern, variables):
+    """
+    호스트 패턴을 펼쳐 그룹과 전체 호스트 목록에 추가합니다. 처음 나온 순서를 유지합니다.
+    """
+    all_hosts = inventory['hosts']
+    for host in expand_host_pattern(pattern):
+        host_vars = all_hosts.get(host)
+        if host_vars is None:
+            all_hosts[host] = dict(variables)
+        elif variables:
+            host_vars.update(variables)
+        if group is not None:
+            group['hosts'].append(host)
+
+def _split_inventory_line(line):
+    # 따옴표나 주석이 없는 대부분의 줄은 shlex 없이 빠르게 나눕니다.
+    if '"' in line or "'" in line or '#' in line or '\\' in line:
+        return shlex.split(line, comments=True)
+    return line.split()
+
+def _load_ini_inventory(f, inventory):
+    """
+    INI 형식 인벤토리를 읽습니다. [그룹], [그룹:children], [그룹:vars] 섹션을 지원하며,
+    첫 섹션 이전에 나온 호스트는 어느 그룹에도 속하지 않은 호스트(ungrouped)로 처리합니다.
+    """
+    group, section_kind = None, 'hosts'
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+
+        if line[0] == '[' and line.endswith(']'):
+            group_name, _, section_kind = line[1:-1].strip().partition(':')
+            section_kind = section_kind or 'hosts'
+            if section_kind not in ('hosts', 'children', 'vars'):
+                raise ValueError(f"{line_number}번째 줄: 알 수 없는 섹션 종류 '{line}'")
+            group = _inventory_group(inventory, group_name)
+            continue
+
+        tokens = _split_inventory_line(line)
+        if not tokens:
+            continue
+        if section_kind == 'children':
+            _inventory_group(inventory, tokens[0])
+            if tokens[0] not in group['children']:
+                group['children'].append(tokens[0])
+        elif section_kind == 'vars':
+            key, sep, value = line.partition('=')
+            if sep:
+                group['vars'][key.strip()] = value.strip()
+        elif _INVENTORY_HOST_RE.match(tokens[0]):
+            pattern, port = _split_host_pattern_port(tokens[0])
+            variables = {}
+            for token in tokens[1:]:
+                key, sep, value = token.partition('=')
+                if sep:
+                    variables[key] = value
+            if port is not None:
+                variables.setdefault('ansible_port', port)
+            _add_inventory_hosts(inventory, group, pattern, variables)
+        # '(ip changeme)'처럼 호스트 이름이 될 수 없는 줄은 무시합니다.
+
+def _load_yaml_group(inventory, group_name, definition):
+    group = _inventory_group(inventory, group_name)
+    definition = definition or {}
+    for pattern, variables in (definition.get('hosts') or {}).items():
+        _add_inventory_hosts(inventory, group, str(pattern), variables or {})
+    group['vars'].update(definition.get('vars') or {})
+    for child_name, child_definition in (definition.get('children') or {}).items():
+        if child_name not in group['children']:
+            group['children'].append(child_name)
+        _load_yaml_group(inventory, child_name, child_definition)
+
+def _load_yaml_inventory(f, inventory):
+    """
+    YAML 형식 인벤토리(all: {hosts, vars, children})를 읽습니다.
+    """
+    document = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+    if not isinstance(document, dict):
+        raise ValueError("YAML 인벤토리의 최상위는 그룹 이름을 키로 하는 매핑이어야 합니다.")
+    for group_name, definition in document.items():
+        _load_yaml_group(inventory, group_name, definition)
+
+# 시각 정밀도가 낮은 파일 시스템에서는 같은 초 안에 다시 쓴 파일의 mtime이 바뀌지 않을 수 있으므로,
+# mtime이 이 시간(초) 이내인 파일은 캐시를 쓰지 않고 다시 읽습니다. (git의 racy 판정과 같은 방식)
+_INVENTORY_RACY_SECONDS = 2
+
+def _read_inventory(inventory_file):
+    inventory = _new_inventory()
+    with open(inventory_file, 'r', encoding='utf-8') as f:
+        if inventory_file.endswith(('.yml', '.yaml')):
+            _load_yaml_inventory(f, inventory)
+        else:
+            _load_ini_inventory(f, inventory)
+    return inventory
+
+@functools.lru_cache(maxsize=8)
+def _load_inventory_cached(inventory_file, mtime_ns, size, ctime_ns, inode):
+    return _read_inventory(inventory_file)
+
+def load_inventory(inventory_file):
+    """
+    Ansible 인벤토리(INI 또는 .yml/.yaml)를 읽어 다음 구조의 딕셔너리를 반환합니다.
+        {'hosts': {호스트: 호스트에 직접 지정된 변수}, 'groups': {그룹: {'hosts': [...], 'children': [...], 'vars': {...}}}}
+    'hosts'는 인벤토리에 처음 나온 순서를 유지하며, 호스트 범위(node[001:500])는 펼쳐진 상태입니다.
+    같은 파일을 여러 번 읽으면(수정되지 않은 경우) 이전 결과를 재사용하므로, 반환값을 수정하면 안 됩니다.
+    수정 여부는 mtime, 크기, ctime, inode로 판단하며, 방금 수정된 파일은 캐시하지 않습니다.
+    """
+    st = os.stat(inventory_file)
+    inventory_file = os.path.abspath(inventory_file)
+    if time.time() - st.st_mtime < _INVENTORY_RACY_SECONDS:
+        return _read_inventory(inventory_file)
+    return _load_inventory_cached(inventory_file, st.st_mtime_ns, st.st_size, st.st_ctime_ns, st.st_ino)
 
-                if current_group_type in ['servers', 'local']:
-                    # 호스트명 또는 IP 주소만 추출 (변수 부분은 무시)
-                    match = re.match(r'^(?P<hostname_or_ip>[\w.-]+)', line)
-                    if match:
-                        hosts.append(match.group('hostname_or_ip'))
+def inventory_group_hosts(inventory, group_name='all'):
+    """
+    그룹과 그 하위 그룹(children)에 속한 호스트를 처음 나온 순서대로 중복 없이 반환합니다.
+    'all'은 Ansible과 같이 인벤토리의 모든 호스트입니다.
+    """
+    if group_name == 'all':
+        return list(inventory['hosts'])
+    groups = inventory['groups']
+    if group_name not in groups:
+        return []
+    seen_hosts, seen_groups = {}, set()
+    stack = [group_name]
+    while stack:
+        name = stack.pop()
+        if name in seen_groups:
+            continue
+        seen_groups.add(name)
+        group = groups.get(name, {'hosts': [], 'children': []})
+        seen_hosts.update(dict.fromkeys(group['hosts']))
+        stack.extend(reversed(group['children']))
+    # 그룹 안에서도 인벤토리 전체의 등장 순서를 따르도록 정렬합니다.
+    order = {host: i for i, host in enumerate(inventory['hosts'])} if len(seen_groups) > 1 else None
+    return sorted(seen_hosts, key=order.__getitem__) if order else list(seen_hosts)
+
+def _group_depths(inventory):
+    """
+    각 그룹의 깊이(all=0, 자식은 부모보다 1 깊음)를 계산합니다. 변수 우선순위를 정할 때 사용합니다.
+    """
+    groups = inventory['groups']
+    child_names = {child for group in groups.values() for child in group['children']}
+    depths = {name: 1 for name in groups if name not in child_names}
+    depths['all'] = 0
+    stack = [(name, depth) for name, depth in depths.items()]
+    while stack:
+        name, depth = stack.pop()
+        for child in groups[name]['children']:
+            if depths.get(child, -1) < depth + 1 and depth + 1 <= len(groups):
+                depths[child] = depth + 1
+                stack.append((child, depth + 1))
+    return depths
+
+def parse_inventory_hosts(inventory_file, group_name='all'):
+    """
+    인벤토리 파일에서 호스트 이름 목록을 인벤토리 순서대로 중복 없이 반환합니다.
+    기본값 'all'은 플레이북(hosts: all)이 대상으로 하는 호스트와 같습니다.
+    """
+    try:
+        return inventory_group_hosts(load_inventory(inventory_file), group_name)
     except FileNotFoundError:
         print(f"오류: 인벤토리 파일 '{inventory_file}'를 찾을 수 없습니다. 호스트 목록을 가져올 수 없습니다.")
     except Exception as e:
         print(f"인벤토리 파일 파싱 중 오류 발생: {e}")
-    return list(set(hosts)) # 중복 제거
+    return []
+
+def parse_inventory_host_vars(inventory_file):
+    """
+    인벤토리에서 호스트별 변수를 계산하여 {호스트명: {변수명: 값}} 딕셔너리를 반환합니다.
+    Ansible과 같이 all 그룹 변수 < 상위 그룹 변수 < 하위 그룹 변수 < 호스트 변수 순으로 덮어씁니다.
+    (같은 깊이의 그룹은 이름 순)
+    """
+    try:
+        inventory = load_inventory(inventory_file)
+    except FileNotFoundError:
+        print(f"오류: 인벤토리 파일 '{inventory_file}'를 찾을 수 없습니다. 호스트 변수를 가져올 수 없습니다.")
+        return {}
+    except Exception as e:
+        print(f"인벤토리 파일 파싱 중 오류 발생: {e}")
+        return {}
+
+    groups = inventory['groups']
+    depths = _group_depths(inventory)
+    host_groups = {}
+    for name, group in groups.items():
+        if group['vars']:
+            for host in group['hosts']:
+                host_groups.setdefault(host, []).append(name)
+    # 자식 그룹의 호스트는 부모 그룹 변수도 물려받습니다.
+    for name, group in groups.items():
+        if group['vars'] and group['children'] and name != 'all':
+            for host in inventory_group_hosts(inventory, name):
+                if name not in host_groups.setdefault(host, []):
+                    host_groups[host].append(name)
+
+    all_vars = groups['all']['vars']
+    host_vars = {}
+    for host, own_vars in inventory['hosts'].items():
+        variables = dict(all_vars)
+        for name in sorted(host_groups.get(host, ()), key=lambda name: (depths.get(name, 1), name)):
+            if name != 'all':
+                variables.update(groups[name]['vars'])
+        variables.update(own_vars)
+        host_vars[host] = variables
+    return host_vars
+
+# 호스트 레코드의 (슬롯 이름, 필드 경로). 필드 경로는 보고서(YAML/JSON)의 중첩 구조 'section.key'이며,
+# 슬롯 이름은 CSV/SQLite 내보내기의 열 이름과 같습니다. 이 순서가 to_dict()의 키 순서입니다.
+HOST_RECORD_FIELDS = [
+    ('hostname', 'hostname'),
+    ('status', 'status'),
+    ('ip_addresses', 'ip_addresses'),
+    ('cpu_model', 'cpu.model'),
+    ('cpu_logical_cpus', 'cpu.logical_cpus'),
+    ('cpu_cores_per_socket', 'cpu.cores_per_socket'),
+    ('cpu_threads_per_core', 'cpu.threads_per_core'),
+    ('system_manufacturer', 'system_info.manufacturer'),
+    ('system_product_name', 'system_info.product_name'),
+    ('system_serial_number', 'system_info.serial_number'),
+    ('system_version', 'system_info.version'),
+    ('board_manufacturer', 'mainboard.manufacturer'),
+    ('board_product', 'mainboard.product'),
+    ('board_serial', 'mainboard.serial'),
+    ('board_version', 'mainboard.version'),
+    ('bios_vendor', 'bios.vendor'),
+    ('bios_version', 'bios.version'),
+    ('os_distribution', 'os.distribution'),
+    ('os_version', 'os.version'),
+    ('os_kernel', 'os.kernel'),
+    ('memory_mb', 'memory_mb'),
+]
+# 필드 경로 -> 슬롯 이름
+FIELD_PATH_SLOTS = {field_path: slot for slot, field_path in HOST_RECORD_FIELDS}
+
+# 호스트마다 값이 다른 슬롯. 나머지 문자열 슬롯(제조사, 모델, CPU, OS, 커널, 버전 등)은 종류가 적으므로
+# sys.intern으로 같은 문자열 객체를 공유합니다.
+_UNIQUE_VALUE_SLOTS = {'hostname', 'ip_addresses', 'system_serial_number', 'board_serial'}
+_INTERNED_SLOTS = tuple(slot for slot, _ in HOST_RECORD_FIELDS if slot not in _UNIQUE_VALUE_SLOTS)
+
+# 값이 없는 IP 주소 목록 (모든 레코드가 같은 튜플을 공유합니다)
+_NO_IP_ADDRESSES = ('N/A',)
+
+def _to_nested_dict(pairs):
+    nested = {}
+    for field_path, value in pairs:
+        parent, _, leaf = field_path.rpartition('.')
+        (nested.setdefault(parent, {}) if parent else nested)[leaf] = value
+    return nested
+
+class HostRecord:
+    """
+    호스트 한 대의 하드웨어 정보입니다. 호스트마다 중첩 딕셔너리 여러 개를 만드는 대신 __slots__ 객체 하나에
+    HOST_RECORD_FIELDS의 값을 담습니다. 값이 없는 필드는 'N/A'이며, ip_addresses는 문자열 튜플입니다.
+    보고서 파일(YAML, JSON Lines, 파싱 캐시)에는 to_dict()로 예전과 같은 중첩 구조를 기록합니다.
+    collect_meta는 raw 파일의 수집 메타데이터(collect.* 키)이며 보고서 필드가 아닙니다.
+    """
+    __slots__ = tuple(slot for slot, _ in HOST_RECORD_FIELDS) + ('collect_meta',)
+
+    def __init__(self, hostname='N/A', status='Collected'):
+        self.hostname = hostname
+        self.status = status
+        self.ip_addresses = _NO_IP_ADDRESSES
+        self.cpu_model = self.cpu_logical_cpus = self.cpu_cores_per_socket = self.cpu_threads_per_core = 'N/A'
+        self.system_manufacturer = self.system_product_name = self.system_serial_number = self.system_version = 'N/A'
+        self.board_manufacturer = self.board_product = self.board_serial = self.board_version = 'N/A'
+        self.bios_vendor = self.bios_version = 'N/A'
+        self.os_distribution = self.os_version = self.os_kernel = 'N/A'
+        self.memory_mb = 'N/A'
+        self.collect_meta = None
+
+    def __repr__(self):
+        return f"HostRecord(hostname={self.hostname!r}, status={self.status!r})"
+
+    def intern_values(self):
+        """
+        종류가 적은 문자열 값을 intern합니다. 프로세스 풀이나 JSON에서 받은 레코드는 문자열이 새로 만들어지므로
+        파싱 결과를 모을 때 한 번 호출합니다.
+        """
+        intern = sys.intern
+        for slot in _INTERNED_SLOTS:
+            setattr(self, slot, intern(getattr(self, slot)))
+        return self
+
+    def to_dict(self, include_status=True):
+        """
+        예전 호스트 데이터와 같은 중첩 딕셔너리 ({'hostname', 'status', 'ip_addresses', 'cpu': {...}, ...})를 만듭니다.
+        """
+        return _to_nested_dict(
+            (field_path, list(getattr(self, slot)) if slot == 'ip_addresses' else getattr(self, slot))
+            for slot, field_path in HOST_RECORD_FIELDS
+            if include_status or slot != 'status'
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        to_dict() 형식의 중첩 딕셔너리(파싱 캐시, JSON 파일)에서 레코드를 만듭니다. 없는 필드는 'N/A'입니다.
+        숫자 값(예: "memory_mb": 1024)은 문자열로 바꾸며, 그 밖의 형식이 맞지 않는 값은 ValueError를 발생시킵니다.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"호스트 레코드는 객체여야 합니다: {data!r}")
+        record = cls()
+        for slot, field_path in HOST_RECORD_FIELDS:
+            parent, _, leaf = field_path.rpartition('.')
+            section = data.get(parent) if parent else data
+            if section is not None and not isinstance(section, dict):
+                raise ValueError(f"'{parent}' 값은 객체여야 합니다: {section!r}")
+            value = (section or {}).get(leaf)
+            if value is not None:
+                setattr(record, slot, _record_field_value(field_path, value))
+        return record.intern_values()
+
+def _record_field_value(field_path, value):
+    """
+    JSON에서 읽은 필드 값을 HostRecord 슬롯 값(문자열, ip_addresses는 문자열 튜플)으로 바꿉니다.
+    """
+    if field_path == 'ip_addresses':
+        if isinstance(value, (list, tuple)):
+            return tuple(_record_field_value('ip_addresses[]', item) for item in value)
+    elif isinstance(value, str):
+        return value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError(f"'{field_path}' 필드 값의 형식이 올바르지 않습니다: {value!r}")
+
+def _split_words(value):
+    return tuple(value.split())
+
+# Raw 데이터 섹션 스키마 (형식 버전 1): 섹션 이름 -> 섹션 내 줄 위치별 (필드 경로, 값 변환 함수)
+# 새 섹션을 추가할 때는 이 표에 항목만 추가하면 됩니다.
+# 값이 "N/A"인 줄은 기본값을 유지하며, 정의된 위치보다 많은 줄은 무시됩니다.
+RAW_SECTION_SCHEMA = {
+    'IP_ADDRESSES': [('ip_addresses', _split_words)],
+    'CPU': [('cpu.model', None), ('cpu.logical_cpus', None), ('cpu.cores_per_socket', None), ('cpu.threads_per_core', None)],
+    'SYSTEM_INFO': [('system_info.manufacturer', None), ('system_info.product_name', None), ('system_info.serial_number', None), ('system_info.version', None)],
+    'MAINBOARD': [('mainboard.manufacturer', None), ('mainboard.product', None), ('mainboard.serial', None), ('mainboard.version', None)],
+    'BIOS': [('bios.vendor', None), ('bios.version', None)],
+    'OS_INFO': [('os.distribution', None), ('os.version', None), ('os.kernel', None)],
+    'MEMORY': [('memory_mb', None)],
+}
+
+# 줄 수에 따라 배치가 다른 섹션 (섹션 이름 -> {줄 수: 필드 경로 목록})
+# 예전 플레이북의 기본 수집 스크립트는 CPU 섹션에 소켓당 코어 수를 출력하지 않아 3줄이었습니다.
+RAW_SECTION_ALT_LAYOUTS = {
+    'CPU': {3: ['cpu.model', 'cpu.logical_cpus', 'cpu.threads_per_core']},
+}
+
+def _compile_field_setter(field_path, converter):
+    slot = FIELD_PATH_SLOTS[field_path]
+    if converter is None and slot in _INTERNED_SLOTS:
+        converter = sys.intern # 종류가 적은 값은 파싱하면서 바로 공유 문자열로 바꿉니다.
+    return (slot, converter)
+
+def compile_section_schema(schema, alt_layouts=None):
+    """
+    섹션 스키마를 파싱 루프에서 바로 사용할 수 있는 형태로 변환합니다.
+    각 섹션은 {줄 수 또는 None(기본 배치): (HostRecord 슬롯 이름, 변환 함수) 튜플의 튜플}로 변환됩니다.
+    """
+    compiled = {}
+    for section_name, fields in schema.items():
+        converters = dict(fields)
+        layouts = {None: tuple(_compile_field_setter(path, converter) for path, converter in fields)}
+        for line_count, paths in (alt_layouts or {}).get(section_name, {}).items():
+            layouts[line_count] = tuple(_compile_field_setter(path, converters[path]) for path in paths)
+        compiled[section_name] = layouts
+    return compiled
+
+_COMPILED_RAW_SECTION_SCHEMA = compile_section_schema(RAW_SECTION_SCHEMA, RAW_SECTION_ALT_LAYOUTS)
+
+# key=value 형식(버전 2 이상)의 키 -> setter. 키는 호스트 데이터의 필드 경로와 같습니다.
+_RAW_KV_FIELD_SETTERS = {
+    field_path: _compile_field_setter(field_path, converter)
+    for fields in RAW_SECTION_SCHEMA.values()
+    for field_path, converter in fields
+}
+_RAW_KV_FIELD_SETTERS['hostname'] = _compile_field_setter('hostname', None)
+
+# 이 파서가 이해하는 가장 높은 raw 데이터 형식 버전
+RAW_FORMAT_VERSION = 2
+
+def _apply_field(hw_data, setter, value):
+    slot, converter = setter
+    setattr(hw_data, slot, converter(value) if converter else value)
+
+def _flush_raw_section(hw_data, layouts, values):
+    if not layouts or not values:
+        return
+    setters = layouts.get(len(values), layouts[None])
+    for setter, value in zip(setters, values):
+        if value != 'N/A':
+            _apply_field(hw_data, setter, value)
+
+def _parse_raw_sections_v1(lines, hw_data, compiled_schema=_COMPILED_RAW_SECTION_SCHEMA):
+    """
+    형식 버전 1 ('---SECTION:X---' 아래에 위치별로 값이 나열된 형식)을 한 번만 순회하며 파싱합니다.
+    현재 섹션의 값(최대 몇 줄)만 보관하고, 스키마에 없는 섹션의 줄은 보관하지 않고 건너뜁니다.
+    """
+    layouts = None  # 현재 섹션의 배치 (알 수 없는 섹션이면 None)
+    values = []     # 현재 섹션에서 비어 있지 않은 줄
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith('---SECTION:'):
+            _flush_raw_section(hw_data, layouts, values)
+            layouts = compiled_schema.get(line.split(':', 1)[1].rstrip('---'))
+            values = []
+        elif layouts is not None:
+            values.append(line)
+    _flush_raw_section(hw_data, layouts, values)
+    return hw_data
+
+# 수집 메타데이터 키의 접두사 (collect.started_at, collect.finished_at, collect.wall_seconds, collect.method)
+COLLECT_META_PREFIX = 'collect.'
 
-def parse_raw_hw_data(file_path):
+def _parse_raw_kv(lines, hw_data, setters=_RAW_KV_FIELD_SETTERS):
+    """
+    형식 버전 2 이상 (한 줄에 하나의 'field.path=value')을 파싱합니다.
+    알 수 없는 키, '---'로 시작하는 구분자 줄과 '#' 주석 줄은 무시합니다.
+    'collect.'로 시작하는 수집 메타데이터(수집 시각, 소요 시간 등)는 보고서 필드가 아니므로
+    hw_data.collect_meta에 따로 모읍니다.
+    """
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line or line.startswith('---') or line.startswith('#'):
+            continue
+        key, sep, value = line.partition('=')
+        setter = setters.get(key.strip()) if sep else None
+        value = value.strip()
+        if setter and value and value != 'N/A':
+            _apply_field(hw_data, setter, value)
+        elif sep and key.startswith(COLLECT_META_PREFIX) and value and value != 'N/A':
+            if hw_data.collect_meta is None:
+                hw_data.collect_meta = {}
+            hw_data.collect_meta[key[len(COLLECT_META_PREFIX):].strip()] = value
+    return hw_data
+
+def _parse_raw_hw_lines(lines, hw_data, source_name, verbose=True):
+    """
+    Raw 데이터 줄 iterator를 한 번만 순회하며 hw_data(HostRecord)를 채웁니다.
+    첫 줄로 형식 버전을 판별합니다: '---HWINFO:<버전>---'이면 key=value 형식,
+    '---HOST:<호스트명>---'이면 (또는 헤더가 없으면) 섹션/위치 기반의 버전 1 형식입니다.
+    """
+    lines = iter(lines)
+    first_line = next(lines, '')
+
+    if first_line.startswith('---HWINFO:'):
+        version_text = first_line.strip()[len('---HWINFO:'):].rstrip('-')
+        version = int(version_text) if version_text.isdigit() else 0
+        if verbose and version > RAW_FORMAT_VERSION:
+            print(f"경고: 파일 '{source_name}'의 형식 버전({version_text})이 지원하는 버전({RAW_FORMAT_VERSION})보다 높습니다. 알려진 키만 파싱합니다.")
+        _parse_raw_kv(lines, hw_data)
+        if verbose and hw_data.hostname == 'N/A':
+            print(f"경고: 파일 '{source_name}'에 'hostname' 키가 없습니다. 호스트명은 'N/A'로 표시됩니다.")
+        return hw_data
+
+    # 호스트명 먼저 파싱 (첫 줄이 '---HOST:'가 아니면 일반 줄로 처리)
+    if first_line.startswith('---HOST:'):
+        hw_data.hostname = first_line.split(':', 1)[1].strip().rstrip('---')
+    else:
+        if verbose:
+            print(f"경고: 파일 '{source_name}'에서 '---HOST:' 구분자를 찾을 수 없거나 형식이 잘못되었습니다. 호스트명은 'N/A'로 표시됩니다.")
+        lines = itertools.chain((first_line,), lines)
+    return _parse_raw_sections_v1(lines, hw_data)
+
+def parse_raw_hw_data(file_path, verbose=True):
     """
     Bash 스크립트에서 수집된 raw 하드웨어 데이터를 파싱합니다.
+    파일은 한 번만 순회하며, key=value 형식(버전 2)과 섹션 형식(버전 1)을 모두 지원합니다.
+    file_path 대신 PackMember를 주면 pack 안의 레코드를 풀어서 파싱합니다.
+    verbose가 False이면 형식 경고를 출력하지 않습니다. 결과는 HostRecord입니다.
     """
-    hw_data = {
-        'hostname': 'N/A', # 파일에서 파싱될 호스트명
-        'status': 'Collected', # 데이터 수집 성공 상태 (초기값)
-        'ip_addresses': ['N/A'],
-        'cpu': {'model': 'N/A', 'logical_cpus': 'N/A', 'cores_per_socket': 'N/A', 'threads_per_core': 'N/A'},
-        'system_info': {'manufacturer': 'N/A', 'product_name': 'N/A', 'serial_number': 'N/A', 'version': 'N/A'},
-        'mainboard': {'manufacturer': 'N/A', 'product': 'N/A', 'serial': 'N/A', 'version': 'N/A'},
-        'bios': {'vendor': 'N/A', 'version': 'N/A'},
-        'os': {'distribution': 'N/A', 'version': 'N/A', 'kernel': 'N/A'},
-        'memory_mb': 'N/A'
-    }
-    
-    current_section = None
-    lines_in_section = [] # 현재 섹션의 모든 줄을 저장
+    hw_data = HostRecord() # 호스트명은 파일에서 파싱되며, 상태는 'Collected'로 시작합니다.
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # 호스트명 먼저 파싱
-        if lines and lines[0].startswith('---HOST:'):
-            hw_data['hostname'] = lines[0].split(':', 1)[1].strip().rstrip('---')
-            lines = lines[1:] # 호스트명 줄 제거
+        if isinstance(file_path, PackMember):
+            _parse_raw_hw_lines(io.StringIO(read_pack_member(file_path), newline=None), hw_data, str(file_path), verbose)
         else:
-            print(f"경고: 파일 '{file_path}'에서 '---HOST:' 구분자를 찾을 수 없거나 형식이 잘못되었습니다. 호스트명은 'N/A'로 표시됩니다.")
-            
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if line.startswith('---SECTION:'):
-                if current_section: # 이전 섹션 데이터 처리
-                    if current_section == 'IP_ADDRESSES':
-                        if lines_in_section and lines_in_section[0] != "N/A": hw_data['ip_addresses'] = lines_in_section[0].split()
-                    elif current_section == 'CPU':
-                        if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['cpu']['model'] = lines_in_section[0]
-                        if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['cpu']['logical_cpus'] = lines_in_section[1]
-                        if len(lines_in_section) >= 3 and lines_in_section[2] != "N/A": hw_data['cpu']['cores_per_socket'] = lines_in_section[2]
-                        if len(lines_in_section) >= 4 and lines_in_section[3] != "N/A": hw_data['cpu']['threads_per_core'] = lines_in_section[3]
-                    elif current_section == 'SYSTEM_INFO':
-                        if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['system_info']['manufacturer'] = lines_in_section[0]
-                        if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['system_info']['product_name'] = lines_in_section[1]
-                        if len(lines_in_section) >= 3 and lines_in_section[2] != "N/A": hw_data['system_info']['serial_number'] = lines_in_section[2]
-                        if len(lines_in_section) >= 4 and lines_in_section[3] != "N/A": hw_data['system_info']['version'] = lines_in_section[3]
-                    elif current_section == 'MAINBOARD':
-                        if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['mainboard']['manufacturer'] = lines_in_section[0]
-                        if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['mainboard']['product'] = lines_in_section[1]
-                        if len(lines_in_section) >= 3 and lines_in_section[2] != "N/A": hw_data['mainboard']['serial'] = lines_in_section[2]
-                        if len(lines_in_section) >= 4 and lines_in_section[3] != "N/A": hw_data['mainboard']['version'] = lines_in_section[3]
-                    elif current_section == 'BIOS':
-                        if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['bios']['vendor'] = lines_in_section[0]
-                        if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['bios']['version'] = lines_in_section[1]
-                    elif current_section == 'OS_INFO':
-                        if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['os']['distribution'] = lines_in_section[0]
-                        if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['os']['version'] = lines_in_section[1]
-                        if len(lines_in_section) >= 3 and lines_in_section[2] != "N/A": hw_data['os']['kernel'] = lines_in_section[2]
-                    elif current_section == 'MEMORY':
-                        if lines_in_section and lines_in_section[0] != "N/A": hw_data['memory_mb'] = lines_in_section[0]
-                
-                current_section = line.split(':', 1)[1].rstrip('---')
-                lines_in_section = [] # 새 섹션 시작, 리스트 초기화
-            elif line:
-                lines_in_section.append(line)
-            
-            i += 1
-        
-        # 파일의 마지막 섹션 처리
-        if current_section:
-            if current_section == 'IP_ADDRESSES':
-                if lines_in_section and lines_in_section[0] != "N/A": hw_data['ip_addresses'] = lines_in_section[0].split()
-            elif current_section == 'CPU':
-                if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['cpu']['model'] = lines_in_section[0]
-                if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['cpu']['logical_cpus'] = lines_in_section[1]
-                if len(lines_in_section) >= 3 and lines_in_section[2] != "N/A": hw_data['cpu']['cores_per_socket'] = lines_in_section[2]
-                if len(lines_in_section) >= 4 and lines_in_section[3] != "N/A": hw_data['cpu']['threads_per_core'] = lines_in_section[3]
-            elif current_section == 'SYSTEM_INFO':
-                if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['system_info']['manufacturer'] = lines_in_section[0]
-                if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['system_info']['product_name'] = lines_in_section[1]
-                if len(lines_in_section) >= 3 and lines_in_section[2] != "N/A": hw_data['system_info']['serial_number'] = lines_in_section[2]
-                if len(lines_in_section) >= 4 and lines_in_section[3] != "N/A": hw_data['system_info']['version'] = lines_in_section[3]
-            elif current_section == 'MAINBOARD':
-                if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['mainboard']['manufacturer'] = lines_in_section[0]
-                if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['mainboard']['product'] = lines_in_section[1]
-                if len(lines_in_section) >= 3 and lines_in_section[2] != "N/A": hw_data['mainboard']['serial'] = lines_in_section[2]
-                if len(lines_in_section) >= 4 and lines_in_section[3] != "N/A": hw_data['mainboard']['version'] = lines_in_section[3]
-            elif current_section == 'BIOS':
-                if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['bios']['vendor'] = lines_in_section[0]
-                if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['bios']['version'] = lines_in_section[1]
-            elif current_section == 'OS_INFO':
-                if len(lines_in_section) >= 1 and lines_in_section[0] != "N/A": hw_data['os']['distribution'] = lines_in_section[0]
-                if len(lines_in_section) >= 2 and lines_in_section[1] != "N/A": hw_data['os']['version'] = lines_in_section[1]
-                if len(lines_in_section) >= 3 and lines_in_section[2] != "N/A": hw_data['os']['kernel'] = lines_in_section[2]
-            elif current_section == 'MEMORY':
-                if lines_in_section: hw_data['memory_mb'] = lines_in_section[0]
-
+            with open(file_path, 'r', encoding='utf-8') as f:
+                _parse_raw_hw_lines(f, hw_data, file_path, verbose)
     except FileNotFoundError:
         print(f"오류: '{file_path}' 파일을 찾을 수 없습니다.")
-        hw_data['status'] = 'File Not Found'
+        hw_data.status = 'File Not Found'
     except Exception as e:
         print(f"파일을 읽거나 파싱하는 중 오류가 발생했습니다: '{file_path}': {e}")
-        hw_data['status'] = f'Parsing Error: {e}'
+        hw_data.status = f'Parsing Error: {e}'
     return hw_data
 
-def parse_all_hw_data_files(base_dir, inventory_file):
+def benchmark_parse_throughput(file_paths, repeat=3):
+    """
+    주어진 raw 파일들을 repeat회 파싱하여 파싱 처리량을 측정합니다.
+    가장 빠른 회차 기준으로 초당 파일 수와 초당 MB를 반환합니다.
+    """
+    total_bytes = sum(os.path.getsize(path) for path in file_paths)
+    best_seconds = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        for path in file_paths:
+            parse_raw_hw_data(path)
+        elapsed = time.perf_counter() - started
+        if best_seconds is None or elapsed < best_seconds:
+            best_seconds = elapsed
+    best_seconds = max(best_seconds, 1e-9)
+    return {
+        'files': len(file_paths),
+        'bytes': total_bytes,
+        'seconds': best_seconds,
+        'files_per_sec': len(file_paths) / best_seconds,
+        'mb_per_sec': total_bytes / best_seconds / (1024 * 1024),
+    }
+
+# 병렬 파싱을 사용할 최소 파일 수 (이보다 적으면 풀 생성 비용이 더 큽니다)
+PARALLEL_PARSE_MIN_FILES = 64
+
+def scan_raw_hw_files(base_dir):
+    """
+    base_dir를 os.scandir로 한 번만 나열하여 {호스트명: DirEntry} 딕셔너리를 반환합니다.
+    호스트마다 os.path.exists를 호출하는 대신 메모리에서 인벤토리와 매칭하기 위해 사용합니다.
+    """
+    raw_files = {}
+    suffix_len = len(RAW_FILE_SUFFIX)
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(RAW_FILE_SUFFIX) and entry.is_file():
+                raw_files[entry.name[:-suffix_len]] = entry
+    return raw_files
+
+# raw 파일 묶음(pack) 형식 (정수는 모두 little-endian)
+#   파일 머리글 _PACK_MAGIC 다음에 레코드(_PACK_RECORD 머리글 + 호스트명(UTF-8) + 압축된 raw 파일 내용)가 이어집니다.
+#   레코드는 뒤에 추가만 하며, 같은 호스트의 레코드가 여러 개이면 마지막 레코드가 유효합니다.
+#   deflate 레코드는 pack 앞부분 레코드들의 원문을 이어 붙인 것(최대 _PACK_DICT_SIZE 바이트)을 사전(zdict)으로 압축합니다.
+#   작은 raw 파일도 잘 압축되면서, 각 레코드는 따로 읽을 수 있습니다. (레코드마다 사용한 사전 길이를 기록)
+#   색인 파일(<pack>.idx)은 호스트명 순서로 정렬한 레코드 위치(uint64) 배열이며 mmap으로 읽습니다.
+#   색인이 없거나 pack 크기와 맞지 않으면(이후에 레코드가 추가된 경우 등) pack을 처음부터 훑어 다시 만듭니다.
+_PACK_MAGIC = b'HWPACK1\n'
+# magic, 압축 방식, 예약, 호스트명 길이, 압축된 길이, 원문 길이, 사전 길이, 원본 mtime_ns, 원문 blake2b(16바이트)
+_PACK_RECORD = struct.Struct('<4sBBHIIIQ16s')
+_PACK_RECORD_MAGIC = b'HWR1'
+_PACK_INDEX_MAGIC = b'HWPIDX1\0'
+_PACK_INDEX_HEADER = struct.Struct('<8sQQ') # magic, 색인을 만들 때의 pack 크기, 레코드 수
+_PACK_DICT_SIZE = 32 * 1024
+_PACK_LZMA_FILTERS = [{'id': lzma.FILTER_LZMA2, 'preset': 6, 'dict_size': 1 << 20}]
+# 압축 방식 이름 -> 레코드에 기록하는 번호
+PACK_COMPRESSIONS = {'none': 0, 'deflate': 1, 'lzma': 2}
+
+class PackMember(collections.namedtuple('PackMember', 'pack_path host offset')):
+    """
+    pack 안의 raw 파일 하나입니다. parse_raw_hw_data에 파일 경로 대신 넘길 수 있습니다. (프로세스 풀로 전달 가능)
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.pack_path}#{self.host}"
+
+class PackEntry(collections.namedtuple('PackEntry', 'path st_size st_mtime_ns')):
+    """
+    scan_raw_hw_pack의 결과입니다. os.DirEntry처럼 path와 stat()을 제공하므로 파싱 캐시 매칭에 그대로 사용됩니다.
+    st_size는 원문 크기이므로 디렉토리와 pack의 캐시 항목이 호환됩니다. (내용 해시로 매칭)
+    레코드는 바뀌지 않으므로 st_ctime_ns는 st_mtime_ns와 같고, st_ino 대신 레코드 위치를 사용합니다.
+    """
+    __slots__ = ()
+
+    @property
+    def st_ctime_ns(self):
+        return self.st_mtime_ns
+
+    @property
+    def st_ino(self):
+        return self.path.offset
+
+    def stat(self):
+        return self
+
+_PackRecord = collections.namedtuple('_PackRecord',
+                                     'offset host compression data_start data_len raw_len dict_len mtime_ns digest end')
+
+def is_hw_pack(path):
+    return str(path).endswith(HW_PACK_SUFFIX)
+
+def _pack_index_path(pack_path):
+    return f"{pack_path}.idx"
+
+def _read_pack_record(buffer, offset):
+    """
+    offset의 레코드 머리글을 읽어 _PackRecord를 반환합니다. 레코드가 잘렸거나 손상되었으면 None을 반환합니다.
+    """
+    if offset + _PACK_RECORD.size > len(buffer):
+        return None
+    magic, compression, _, name_len, data_len, raw_len, dict_len, mtime_ns, digest = _PACK_RECORD.unpack_from(buffer, offset)
+    data_start = offset + _PACK_RECORD.size + name_len
+    end = data_start + data_len
+    if magic != _PACK_RECORD_MAGIC or end > len(buffer):
+        return None
+    host = bytes(buffer[offset + _PACK_RECORD.size:data_start]).decode('utf-8')
+    return _PackRecord(offset, host, compression, data_start, data_len, raw_len, dict_len, mtime_ns, digest, end)
+
+def _scan_pack_records(buffer):
+    """
+    pack을 처음부터 훑어 (레코드 목록, 마지막 정상 레코드의 끝 위치)를 반환합니다.
+    """
+    records = []
+    offset = len(_PACK_MAGIC)
+    while offset < len(buffer):
+        record = _read_pack_record(buffer, offset)
+        if record is None:
+            break
+        records.append(record)
+        offset = record.end
+    return records, offset
+
+def _pack_compress(content, compression, zdict):
+    if compression == PACK_COMPRESSIONS['deflate']:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=zdict) if zdict else zlib.compressobj(9, zlib.DEFLATED, -15)
+        return compressor.compress(content) + compressor.flush()
+    if compression == PACK_COMPRESSIONS['lzma']:
+        return lzma.compress(content, format=lzma.FORMAT_RAW, filters=_PACK_LZMA_FILTERS)
+    return content
+
+def _pack_decompress(data, compression, zdict):
+    if compression == PACK_COMPRESSIONS['deflate']:
+        decompressor = zlib.decompressobj(-15, zdict=zdict) if zdict else zlib.decompressobj(-15)
+        return decompressor.decompress(data) + decompressor.flush()
+    if compression == PACK_COMPRESSIONS['lzma']:
+        return lzma.decompress(data, format=lzma.FORMAT_RAW, filters=_PACK_LZMA_FILTERS)
+    if compression == PACK_COMPRESSIONS['none']:
+        return bytes(data)
+    raise ValueError(f"지원하지 않는 pack 압축 방식: {compression}")
+
+def _build_pack_dictionary(buffer):
+    """
+    pack 앞부분 레코드들의 원문을 _PACK_DICT_SIZE 바이트가 넘을 때까지 이어 붙여 deflate 사전을 만듭니다.
+    (HwPackWriter가 레코드를 쓸 때와 같은 규칙이며, 앞부분 레코드만 풀면 됩니다)
+    """
+    dictionary = b''
+    offset = len(_PACK_MAGIC)
+    while len(dictionary) < _PACK_DICT_SIZE:
+        record = _read_pack_record(buffer, offset)
+        if record is None:
+            break
+        dictionary += _pack_decompress(buffer[record.data_start:record.end], record.compression,
+                                       dictionary[:record.dict_len])
+        offset = record.end
+    return dictionary
+
+def write_hw_pack_index(pack_path, host_offsets, pack_size):
+    """
+    {호스트: 레코드 위치}로 색인 파일을 씁니다. (호스트명 순서로 정렬, 임시 파일에 쓴 뒤 교체)
+    """
+    offsets = array('Q', (offset for _, offset in sorted(host_offsets.items())))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    index_path = _pack_index_path(pack_path)
+    tmp_file = f"{index_path}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(_PACK_INDEX_HEADER.pack(_PACK_INDEX_MAGIC, pack_size, len(offsets)))
+        f.write(offsets.tobytes())
+    os.replace(tmp_file, index_path)
+
+def _load_pack_index(pack_path, pack_size):
+    """
+    색인 파일을 mmap하여 레코드 위치 배열을 반환합니다. 없거나, 손상되었거나, pack 크기와 맞지 않으면 None을 반환합니다.
+    """
+    try:
+        with open(_pack_index_path(pack_path), 'rb') as f:
+            index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    magic = indexed_size = count = None
+    if len(index_map) >= _PACK_INDEX_HEADER.size:
+        magic, indexed_size, count = _PACK_INDEX_HEADER.unpack_from(index_map)
+    if magic != _PACK_INDEX_MAGIC or indexed_size != pack_size or len(index_map) != _PACK_INDEX_HEADER.size + 8 * count:
+        index_map.close()
+        return None
+    if sys.byteorder != 'little':
+        with index_map:
+            offsets = array('Q', index_map[_PACK_INDEX_HEADER.size:])
+        offsets.byteswap()
+        return offsets
+    return memoryview(index_map)[_PACK_INDEX_HEADER.size:].cast('Q')
+
+class HwPack:
+    """
+    읽기용 pack입니다. pack 파일을 mmap하고 색인(offsets, 호스트명 순서)으로 레코드를 찾습니다.
+    색인을 쓸 수 없으면 pack을 훑어 다시 만들고, 가능하면 색인 파일도 다시 씁니다.
+    """
+    def __init__(self, pack_path):
+        self.path = pack_path
+        with open(pack_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < len(_PACK_MAGIC):
+                raise ValueError(f"pack 파일이 아닙니다: {pack_path}")
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer[:len(_PACK_MAGIC)] != _PACK_MAGIC:
+            raise ValueError(f"pack 파일이 아닙니다: {pack_path}")
+        self._dictionary = None
+        self.offsets = _load_pack_index(pack_path, len(self.buffer))
+        if self.offsets is None:
+            self.offsets = self._rebuild_index()
+
+    def _rebuild_index(self):
+        records, end = _scan_pack_records(self.buffer)
+        if end < len(self.buffer):
+            print(f"경고: pack '{self.path}'의 끝부분 {len(self.buffer) - end}바이트가 잘렸거나 손상되어 무시합니다.")
+        host_offsets = {record.host: record.offset for record in records}
+        try:
+            write_hw_pack_index(self.path, host_offsets, len(self.buffer))
+        except OSError as e:
+            print(f"정보: pack 색인 파일을 저장하지 못했습니다 (메모리에서만 사용): {e}")
+        return array('Q', (offset for _, offset in sorted(host_offsets.items())))
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def records(self):
+        """
+        호스트마다 유효한(마지막) 레코드를 호스트명 순서로 반환하는 제너레이터입니다.
+        """
+        for offset in self.offsets:
+            yield self.record_at(offset)
+
+    def record_at(self, offset):
+        record = _read_pack_record(self.buffer, offset)
+        if record is None:
+            raise ValueError(f"pack '{self.path}'의 {offset} 위치에 레코드가 없습니다.")
+        return record
+
+    def find(self, host):
+        """
+        색인에서 이진 탐색으로 호스트의 레코드를 찾습니다. 없으면 None을 반환합니다.
+        """
+        low, high = 0, len(self.offsets)
+        while low < high:
+            middle = (low + high) // 2
+            record = self.record_at(self.offsets[middle])
+            if record.host < host:
+                low = middle + 1
+            elif record.host > host:
+                high = middle
+            else:
+                return record
+        return None
+
+    def read(self, record):
+        """
+        레코드의 원문(bytes)을 반환합니다. deflate 레코드에 필요한 사전은 처음 읽을 때 한 번만 만듭니다.
+        """
+        zdict = b''
+        if record.dict_len:
+            if self._dictionary is None:
+                self._dictionary = _build_pack_dictionary(self.buffer)
+            zdict = self._dictionary[:record.dict_len]
+        content = _pack_decompress(self.buffer[record.data_start:record.end], record.compression, zdict)
+        if len(content) != record.raw_len or hashlib.blake2b(content, digest_size=16).digest() != record.digest:
+            raise ValueError(f"pack '{self.path}'의 호스트 '{record.host}' 레코드가 손상되었습니다.")
+        return content
+
+class HwPackWriter:
+    """
+    pack에 레코드를 뒤에 추가합니다. 파일이 없으면 새로 만들고, 있으면 잘린 마지막 레코드를 잘라낸 뒤 이어서 씁니다.
+    레코드를 하나 쓸 때마다 flush하므로 중단되더라도 그때까지의 레코드는 남으며, close()에서 색인 파일을 씁니다.
+    """
+    def __init__(self, pack_path, compression='deflate'):
+        self.path = pack_path
+        self.compression = PACK_COMPRESSIONS[compression]
+        self.host_offsets = {}
+        self.dictionary = b''
+        os.makedirs(os.path.dirname(pack_path) or '.', exist_ok=True)
+        size = os.path.getsize(pack_path) if os.path.exists(pack_path) else 0
+        if size:
+            with open(pack_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if buffer[:len(_PACK_MAGIC)] != _PACK_MAGIC:
+                    raise ValueError(f"pack 파일이 아닙니다: {pack_path}")
+                records, end = _scan_pack_records(buffer)
+                self.host_offsets = {record.host: record.offset for record in records}
+                self.dictionary = _build_pack_dictionary(buffer)
+            if end < size:
+                print(f"경고: pack '{pack_path}'의 끝부분 {size - end}바이트가 잘려 있어 잘라내고 이어서 씁니다.")
+                os.truncate(pack_path, end)
+            size = end
+        self.file = open(pack_path, 'ab')
+        if not size:
+            self.file.write(_PACK_MAGIC)
+            size = len(_PACK_MAGIC)
+        self.size = size
+
+    def add(self, host, content, mtime_ns=None):
+        """
+        호스트의 raw 파일 내용(bytes)을 레코드로 추가합니다. mtime_ns는 원본 파일의 mtime(기본값: 현재 시각)입니다.
+        """
+        dict_len = min(len(self.dictionary), _PACK_DICT_SIZE)
+        data = _pack_compress(content, self.compression, self.dictionary[:dict_len])
+        name = host.encode('utf-8')
+        self.file.write(_PACK_RECORD.pack(_PACK_RECORD_MAGIC, self.compression, 0, len(name), len(data), len(content),
+                                          dict_len, time.time_ns() if mtime_ns is None else mtime_ns,
+                                          hashlib.blake2b(content, digest_size=16).digest()))
+        self.file.write(name)
+        self.file.write(data)
+        self.file.flush()
+        self.host_offsets[host] = self.size
+        self.size += _PACK_RECORD.size + len(name) + len(data)
+        if len(self.dictionary) < _PACK_DICT_SIZE:
+            self.dictionary += content
+
+    def close(self):
+        self.file.close()
+        write_hw_pack_index(self.path, self.host_offsets, self.size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+@functools.lru_cache(maxsize=4)
+def _open_hw_pack_cached(pack_path):
+    return HwPack(pack_path)
+
+def read_pack_member_bytes(member):
+    """
+    PackMember의 raw 파일 내용(bytes)을 반환합니다. 프로세스마다 pack을 한 번만 열어 둡니다.
+    """
+    pack = _open_hw_pack_cached(member.pack_path)
+    if member.offset >= len(pack.buffer): # 연 뒤에 레코드가 추가된 pack
+        _open_hw_pack_cached.cache_clear()
+        pack = _open_hw_pack_cached(member.pack_path)
+    return pack.read(pack.record_at(member.offset))
+
+def read_pack_member(member):
+    """
+    PackMember의 raw 파일 내용을 문자열로 반환합니다.
+    """
+    return read_pack_member_bytes(member).decode('utf-8')
+
+def scan_raw_hw_pack(pack_path):
+    """
+    pack의 색인을 읽어 scan_raw_hw_files와 같은 {호스트명: PackEntry} 딕셔너리를 반환합니다.
+    """
+    pack = HwPack(pack_path)
+    buffer, unpack_from, header_size = pack.buffer, _PACK_RECORD.unpack_from, _PACK_RECORD.size
+    entries = {}
+    for offset in pack.offsets: # 호스트가 많으므로 _PackRecord를 만들지 않고 머리글만 바로 읽습니다.
+        magic, _, _, name_len, _, raw_len, _, mtime_ns, _ = unpack_from(buffer, offset)
+        if magic != _PACK_RECORD_MAGIC:
+            raise ValueError(f"pack '{pack_path}'의 {offset} 위치에 레코드가 없습니다.")
+        host = buffer[offset + header_size:offset + header_size + name_len].decode('utf-8')
+        entries[host] = PackEntry(PackMember(pack_path, host, offset), raw_len, mtime_ns)
+    return entries
+
+def scan_raw_data(base_dir):
+    """
+    base_dir가 pack 파일이면 scan_raw_hw_pack, 디렉토리이면 scan_raw_hw_files의 결과를 반환합니다.
+    """
+    return scan_raw_hw_pack(base_dir) if is_hw_pack(base_dir) else scan_raw_hw_files(base_dir)
+
+def pack_raw_hw_files(source_dir, pack_path, compression='deflate', remove_files=False):
+    """
+    source_dir의 *_raw_hw.txt 파일을 호스트명 순서로 pack에 추가하고 (파일 수, 원문 크기, 늘어난 pack 크기)를 반환합니다.
+    원본 파일의 mtime을 기록하므로 파싱 캐시가 그대로 적중합니다. remove_files이면 색인까지 쓴 뒤 원본 파일을 지웁니다.
+    """
+    raw_files = scan_raw_hw_files(source_dir)
+    raw_bytes = 0
+    with HwPackWriter(pack_path, compression) as writer:
+        start_size = writer.size
+        for host in sorted(raw_files):
+            entry = raw_files[host]
+            with open(entry.path, 'rb') as f:
+                content = f.read()
+            writer.add(host, content, entry.stat().st_mtime_ns)
+            raw_bytes += len(content)
+    if remove_files:
+        for entry in raw_files.values():
+            os.remove(entry.path)
+    return len(raw_files), raw_bytes, writer.size - start_size
+
+def _parse_raw_hw_file_timed(file_path, verbose=False):
+    started = time.perf_counter()
+    data = parse_raw_hw_data(file_path, verbose=verbose)
+    return data, time.perf_counter() - started
+
+def _parse_raw_hw_files(file_paths, workers=1, executor='process', verbose=False):
+    """
+    여러 raw 파일을 파싱하여 입력 순서와 동일한 순서로 (파싱 결과, 파싱 소요 시간(초))를 내보내는 제너레이터입니다.
+    workers가 1보다 크고 파일 수가 충분하면 프로세스/스레드 풀을 사용하며, 소요 시간은 worker 안에서 잽니다.
+    결과를 리스트로 모으지 않으므로 호출하는 쪽에서 하나씩 처리(intern 등)하면 최대 메모리가 줄어듭니다.
+    """
+    parse = functools.partial(_parse_raw_hw_file_timed, verbose=verbose)
+    if workers <= 1 or len(file_paths) < PARALLEL_PARSE_MIN_FILES:
+        yield from map(parse, file_paths)
+        return
+
+    if executor == 'thread':
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(parse, file_paths)
+        return
+    chunksize = max(1, min(256, len(file_paths) // (workers * 4)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse, file_paths, chunksize=chunksize)
+
+def _finalize_host_record(host_in_inventory, data, file_path, verbose=False):
+    """
+    파싱된 데이터의 호스트명을 보정하고 'Collected' / 'Parsing Failed / No Data' 상태를 결정합니다.
+    프로세스 풀이나 캐시에서 받은 레코드도 문자열을 공유하도록 intern한 HostRecord를 반환합니다.
+    """
+    # 파일 내부에서 파싱된 호스트명이 있다면 사용, 없다면 인벤토리 호스트명을 사용
+    actual_hostname_in_file = data.hostname
+    if actual_hostname_in_file == 'N/A' or actual_hostname_in_file == '':
+        data.hostname = host_in_inventory # 파싱 실패 시 인벤토리 호스트명 사용
+
+    # ---HOST: 라인을 성공적으로 파싱하고, 내용도 유의미하면 'Collected' 상태로 업데이트
+    # 유효한 IP 주소나 CPU 모델이 하나라도 있으면 성공으로 간주
+    if data.hostname != 'N/A' and (data.ip_addresses != _NO_IP_ADDRESSES or data.cpu_model != 'N/A' or data.system_manufacturer != 'N/A'):
+        data.status = 'Collected'
+        if verbose:
+            print(f"-> 호스트 '{data.hostname}' 데이터 파싱 성공. HTML 보고서에 포함됩니다.")
+    else:
+        data.status = 'Parsing Failed / No Data'
+        if verbose:
+            print(f"-> 경고: 호스트 '{host_in_inventory}'의 데이터 파싱 실패 또는 유의미한 데이터 부족. HTML 보고서에 'Parsing Failed'로 표시됩니다.")
+            print(f"    (파일 '{file_path}'의 '---HOST:' 라인과 내용 형식을 확인하세요.)")
+    return data.intern_values()
+
+def print_parse_summary(all_hosts_hw_data, max_listed=10):
+    """
+    상태별 호스트 수와 실패한 호스트 일부를 요약하여 출력합니다.
+    """
+    hosts_by_status = {}
+    for host, data in all_hosts_hw_data.items():
+        hosts_by_status.setdefault(data.status, []).append(host)
+
+    print(f"\n파싱 요약: 전체 {len(all_hosts_hw_data)}개 호스트")
+    for status, hosts in hosts_by_status.items():
+        print(f"  - {status}: {len(hosts)}개")
+        if status != 'Collected':
+            listed = ', '.join(hosts[:max_listed])
+            more = f" 외 {len(hosts) - max_listed}개" if len(hosts) > max_listed else ""
+            print(f"      {listed}{more}")
+
+def load_parse_cache(cache_file):
+    """
+    파싱 캐시를 읽어 {호스트: 캐시 엔트리} 딕셔너리를 반환합니다.
+    파일이 없거나, 손상되었거나, 스키마 버전이 다르면 빈 캐시를 반환합니다.
+    """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"경고: 파싱 캐시 '{cache_file}'를 읽을 수 없어 무시합니다: {e}")
+        return {}
+    if not isinstance(cache, dict) or cache.get('schema_version') != PARSE_CACHE_SCHEMA_VERSION:
+        print(f"정보: 파싱 캐시 '{cache_file}'의 스키마 버전이 달라 캐시를 새로 만듭니다.")
+        return {}
+    return cache.get('entries', {})
+
+# 캐시를 저장할 때 mtime이 이 시간(초) 이내였던 raw 파일은, 같은 시각 안에 같은 크기로 다시 쓰였을 수 있으므로
+# 다음 실행에서 크기/mtime만으로 적중시키지 않고 내용 해시를 비교합니다. (_INVENTORY_RACY_SECONDS와 같은 방식)
+_PARSE_CACHE_RACY_SECONDS = 2
+
+def save_parse_cache(cache_file, entries):
+    """
+    파싱 캐시를 임시 파일에 쓴 뒤 교체하여, 중단되더라도 캐시 파일이 손상되지 않도록 합니다.
+    저장 시각 기준으로 mtime이 _PARSE_CACHE_RACY_SECONDS 이내인 엔트리는 'racy'로 표시합니다.
+    """
+    racy_after_ns = time.time_ns() - _PARSE_CACHE_RACY_SECONDS * 1_000_000_000
+    for entry in entries.values():
+        if entry['mtime_ns'] >= racy_after_ns:
+            entry['racy'] = True
+    cache_dir = os.path.dirname(cache_file)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    tmp_file = f"{cache_file}.tmp"
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'schema_version': PARSE_CACHE_SCHEMA_VERSION, 'entries': entries},
+                      f, ensure_ascii=False, separators=(',', ':'), default=HostRecord.to_dict)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"경고: 파싱 캐시 '{cache_file}'를 저장하지 못했습니다: {e}")
+
+# raw 파일의 수집 메타데이터 줄 (collect.started_at=... 등). 수집할 때마다 바뀌므로 캐시 해시에서 뺍니다.
+_COLLECT_META_LINE_RE = re.compile(rb'^[ \t]*collect\.([^=\r\n]*)=([^\r\n]*)(?:\r?\n)?', re.MULTILINE)
+
+def raw_content_digest(content):
+    """
+    raw 파일 내용(bytes)에서 collect.* 줄을 뺀 나머지의 해시(blake2b, 16바이트, 16진수)와
+    collect.* 메타데이터 딕셔너리(없으면 None)를 반환합니다. 수집 시각만 다른 raw 파일은 해시가 같습니다.
+    """
+    collect_meta = None
+    if b'collect.' in content:
+        for match in _COLLECT_META_LINE_RE.finditer(content):
+            value = match.group(2).decode('utf-8', errors='replace').strip()
+            if value and value != 'N/A':
+                if collect_meta is None:
+                    collect_meta = {}
+                collect_meta[match.group(1).decode('utf-8', errors='replace').strip()] = value
+        content = _COLLECT_META_LINE_RE.sub(b'', content)
+    return hashlib.blake2b(content, digest_size=16).hexdigest(), collect_meta
+
+def file_content_digest(file_path):
+    """
+    raw 파일의 raw_content_digest 결과 (collect.* 줄을 뺀 내용의 해시, collect.* 메타데이터)를 반환합니다.
+    """
+    with open(file_path, 'rb') as f:
+        return raw_content_digest(f.read())
+
+def _lookup_parse_cache(cache_entries, host, entry):
+    """
+    캐시에서 raw 파일에 해당하는 파싱 결과를 찾습니다.
+    크기, mtime, ctime, inode가 모두 같고 캐시를 저장할 때 racy하지 않았으면 파일을 읽지 않고 적중으로 처리하고,
+    아니면 collect.* 줄을 뺀 내용 해시를 비교합니다.
+    (적중 시 레코드 또는 None, 적중 시 collect.* 메타데이터 또는 None, 갱신할 캐시 엔트리의 기본 정보)를 반환합니다.
+    """
+    st = entry.stat()
+    cached = cache_entries.get(host)
+    if (cached and not cached.get('racy') and cached.get('size') == st.st_size and cached.get('mtime_ns') == st.st_mtime_ns
+            and cached.get('ctime_ns') == st.st_ctime_ns and cached.get('ino') == st.st_ino):
+        return cached['record'], cached.get('collect'), cached
+
+    # 매 실행마다 fetched_hw_data를 다시 만들고 수집 시각도 바뀌므로 mtime이나 원문 해시로는 부족합니다.
+    if isinstance(entry, PackEntry):
+        digest, collect_meta = raw_content_digest(read_pack_member_bytes(entry.path))
+    else:
+        digest, collect_meta = file_content_digest(entry.path)
+    new_entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'ctime_ns': st.st_ctime_ns, 'ino': st.st_ino,
+                 'digest': digest}
+    if cached and cached.get('digest') == digest:
+        new_entry['record'] = cached['record']
+        if collect_meta:
+            new_entry['collect'] = collect_meta
+        return cached['record'], collect_meta, new_entry
+    return None, None, new_entry
+
+def _store_parsed_records(all_hosts_hw_data, hosts_to_parse, workers, executor, verbose, parse_seconds, collect_meta):
+    """
+    hosts_to_parse의 (호스트, raw 파일)을 파싱하여 all_hosts_hw_data에 넣고, 파싱한 (호스트, 레코드)를 차례로 내보내는 제너레이터입니다.
+    호스트별 파싱 시간은 parse_seconds에, 수집 메타데이터(collect.*)는 레코드에서 떼어 collect_meta에 모읍니다.
+    parse_all_hw_data_files와 watch의 reparse_changed_hosts가 같이 사용합니다.
+    """
+    parsed = _parse_raw_hw_files([path for _, path in hosts_to_parse], workers, executor, verbose)
+    for (host, file_path), (data, seconds) in zip(hosts_to_parse, parsed):
+        parse_seconds[host] = seconds
+        if data.collect_meta:
+            collect_meta[host] = data.collect_meta
+            data.collect_meta = None
+        else:
+            collect_meta.pop(host, None)
+        if verbose:
+            print(f"\n호스트 '{host}'의 하드웨어 정보 파싱 완료: {file_path}")
+        all_hosts_hw_data[host] = _finalize_host_record(host, data, file_path, verbose)
+        yield host, data
+
+def parse_all_hw_data_files(base_dir, inventory_file, workers=1, executor='process', verbose=False,
+                            cache_file=None, stats=None):
     """
     inventory.ini의 모든 호스트 목록을 가져와
     각 호스트의 Raw 데이터 파일을 읽고 파싱하거나, 실패 상태를 표시합니다.
+
+    base_dir는 os.scandir로 한 번만 나열하며(.hwpack 파일이면 pack의 색인을 읽음), 파싱은 workers개의 프로세스(executor='process')
+    또는 스레드(executor='thread') 풀에서 수행됩니다. 결과는 항상 인벤토리 순서를 따릅니다.
+    verbose가 True이면 호스트별 진행 상황을, False이면 마지막에 요약만 출력합니다.
+    cache_file이 주어지면 내용이 바뀌지 않은 raw 파일은 파싱하지 않고 캐시된 결과를 사용합니다.
+    stats 딕셔너리가 주어지면 캐시 적중/미적중 수와 함께, 호스트별 파싱 소요 시간(parse_seconds)과
+    raw 파일의 수집 메타데이터(collect: collect.* 키)를 기록합니다.
     """
     all_hosts_hw_data = {}
     
@@ -172,72 +1215,88 @@ def parse_all_hw_data_files(base_dir, inventory_file):
         print(f"오류: 인벤토리 파일 '{inventory_file}'에서 대상 호스트를 찾을 수 없습니다. 보고서가 생성되지 않습니다.")
         return all_hosts_hw_data
 
-    # 2. 각 호스트에 대한 기본 '수집 실패' 엔트리 초기화
-    for host in all_target_hosts:
-        all_hosts_hw_data[host] = {
-            'hostname': host,
-            'status': 'Collection Failed',
-            'ip_addresses': ['N/A'],
-            'cpu': {'model': 'N/A', 'logical_cpus': 'N/A', 'cores_per_socket': 'N/A', 'threads_per_core': 'N/A'},
-            'system_info': {'manufacturer': 'N/A', 'product_name': 'N/A', 'serial_number': 'N/A', 'version': 'N/A'},
-            'mainboard': {'manufacturer': 'N/A', 'product': 'N/A', 'serial': 'N/A', 'version': 'N/A'},
-            'bios': {'vendor': 'N/A', 'version': 'N/A'},
-            'os': {'distribution': 'N/A', 'version': 'N/A', 'kernel': 'N/A'},
-            'memory_mb': 'N/A'
-        }
+    # 2. 인벤토리 순서를 유지하기 위해 호스트 자리만 먼저 만들고, 레코드는 파싱/매칭 결과로 채웁니다.
+    all_hosts_hw_data = dict.fromkeys(all_target_hosts)
 
-    # 3. fetched_hw_data 디렉토리가 존재하는지 확인
-    if not os.path.exists(base_dir):
-        print(f"경고: 데이터 수집 디렉토리 '{base_dir}'를 찾을 수 없습니다. 모든 호스트는 '수집 실패'로 표시됩니다.")
+    # 3. fetched_hw_data 디렉토리를 한 번만 나열하거나 pack의 색인을 읽음 (없으면 모두 '수집 실패')
+    try:
+        raw_files = scan_raw_data(base_dir)
+    except (FileNotFoundError, NotADirectoryError, ValueError) as e:
+        if isinstance(e, ValueError):
+            print(f"경고: {e} 모든 호스트는 '수집 실패'로 표시됩니다.")
+        else:
+            print(f"경고: 데이터 수집 디렉토리 '{base_dir}'를 찾을 수 없습니다. 모든 호스트는 '수집 실패'로 표시됩니다.")
+        for host in all_target_hosts:
+            all_hosts_hw_data[host] = HostRecord(host, 'Collection Failed')
         return all_hosts_hw_data
 
-    # 4. 수집된 Raw 데이터 파일 파싱 및 성공한 호스트 정보 업데이트
+    # 4. 인벤토리 호스트와 Raw 데이터 파일을 메모리에서 매칭 (변경되지 않은 파일은 캐시 사용)
+    cache_entries = load_parse_cache(cache_file) if cache_file else {}
+    new_cache_entries = {}
+    hosts_to_parse = []
+    cache_hits = 0
+    collect_meta = {}
     for host_in_inventory in all_target_hosts:
-        filename = f"{host_in_inventory}_raw_hw.txt"
-        file_path = os.path.join(base_dir, filename)
-
-        if os.path.exists(file_path):
-            print(f"\n호스트 '{host_in_inventory}'의 하드웨어 정보 파싱 시도 중: {file_path}")
-            data = parse_raw_hw_data(file_path)
-            
-            # 파일 내부에서 파싱된 호스트명이 있다면 사용, 없다면 인벤토리 호스트명을 사용
-            actual_hostname_in_file = data.get('hostname', 'N/A')
-            if actual_hostname_in_file == 'N/A' or actual_hostname_in_file == '':
-                data['hostname'] = host_in_inventory # 파싱 실패 시 인벤토리 호스트명 사용
-
-            # ---HOST: 라인을 성공적으로 파싱하고, 내용도 유의미하면 'Collected' 상태로 업데이트
-            # 유효한 IP 주소나 CPU 모델이 하나라도 있으면 성공으로 간주
-            if data['hostname'] != 'N/A' and (data['ip_addresses'] != ['N/A'] or data['cpu']['model'] != 'N/A' or data['system_info']['manufacturer'] != 'N/A'):
-                data['status'] = 'Collected'
-                print(f"-> 호스트 '{data['hostname']}' 데이터 파싱 성공. HTML 보고서에 포함됩니다.")
-            else:
-                data['status'] = 'Parsing Failed / No Data'
-                print(f"-> 경고: 호스트 '{host_in_inventory}'의 데이터 파싱 실패 또는 유의미한 데이터 부족. HTML 보고서에 'Parsing Failed'로 표시됩니다.")
-                print(f"    (파일 '{file_path}'의 '---HOST:' 라인과 내용 형식을 확인하세요.)")
-                
-            all_hosts_hw_data[host_in_inventory] = data
-        else:
-            # 파일이 존재하지 않는 경우 (Ansible 수집 실패)
-            print(f"\n호스트 '{host_in_inventory}'의 Raw 데이터 파일이 존재하지 않습니다: {file_path}")
-            all_hosts_hw_data[host_in_inventory]['status'] = 'Collection Failed'
+        entry = raw_files.get(host_in_inventory)
+        if entry is not None:
+            if cache_file:
+                cached_record, cached_collect, new_cache_entries[host_in_inventory] = _lookup_parse_cache(
+                    cache_entries, host_in_inventory, entry)
+                if cached_record is not None:
+                    cache_hits += 1
+                    if cached_collect:
+                        collect_meta[host_in_inventory] = cached_collect
+                    record = cached_record if isinstance(cached_record, HostRecord) else HostRecord.from_dict(cached_record)
+                    new_cache_entries[host_in_inventory]['record'] = record
+                    all_hosts_hw_data[host_in_inventory] = _finalize_host_record(host_in_inventory, record, entry.path, verbose)
+                    continue
+            hosts_to_parse.append((host_in_inventory, entry.path))
+            continue
+        # 파일이 존재하지 않는 경우 (Ansible 수집 실패)
+        all_hosts_hw_data[host_in_inventory] = HostRecord(host_in_inventory, 'Collection Failed')
+        if verbose:
+            print(f"\n호스트 '{host_in_inventory}'의 Raw 데이터 파일이 존재하지 않습니다: {os.path.join(base_dir, host_in_inventory + RAW_FILE_SUFFIX)}")
             print(f"-> 호스트 '{host_in_inventory}' 데이터 수집 실패. HTML 보고서에 'Collection Failed'로 표시됩니다.")
+    del raw_files, cache_entries # 파싱 중 최대 메모리를 줄이기 위해 매칭이 끝난 목록은 바로 해제합니다.
+
+    # 5. 수집된 Raw 데이터 파일 파싱 및 성공한 호스트 정보 업데이트
+    parse_seconds = {}
+    for host_in_inventory, data in _store_parsed_records(all_hosts_hw_data, hosts_to_parse, workers, executor, verbose,
+                                                         parse_seconds, collect_meta):
+        if cache_file:
+            if data.status in ('Collected', 'Parsing Failed / No Data'):
+                new_cache_entries[host_in_inventory]['record'] = data
+                if host_in_inventory in collect_meta:
+                    new_cache_entries[host_in_inventory]['collect'] = collect_meta[host_in_inventory]
+            else:
+                del new_cache_entries[host_in_inventory] # 읽기/파싱 오류는 캐시하지 않음
+
+    if cache_file:
+        # 인벤토리에서 빠졌거나 raw 파일이 사라진 호스트는 캐시에서도 제거됩니다.
+        save_parse_cache(cache_file, new_cache_entries)
+        print(f"파싱 캐시: 적중 {cache_hits}개, 미적중 {len(hosts_to_parse)}개 ({cache_file})")
+    if stats is not None:
+        stats['cache_hits'] = cache_hits
+        stats['cache_misses'] = len(hosts_to_parse) if cache_file else 0
+        stats['parsed_files'] = len(hosts_to_parse)
+        stats['parse_seconds'] = parse_seconds
+        stats['collect'] = collect_meta
 
+    if not verbose:
+        print_parse_summary(all_hosts_hw_data)
     return all_hosts_hw_data
 
-def generate_html_report(all_hosts_hw_data, output_file):
+def _html_page_head(title):
     """
-    모든 호스트의 하드웨어 데이터를 기반으로 HTML 보고서를 생성합니다.
+    HTML 보고서 페이지의 공통 <head>와 본문 시작 부분을 반환합니다.
     """
-    # 결과 디렉토리가 없으면 생성
-    os.makedirs(RESULT_DIR, exist_ok=True) # <--- 디렉토리 생성 추가
-
-    html_content = f"""
+    return f"""
 <!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>하드웨어 자산 보고서 (Bash 전용)</title>
+    <title>{html.escape(title)}</title>
     <!-- Tailwind CSS CDN -->
     <script src="https://cdn.tailwindcss.com"></script>
     <style>
@@ -323,145 +1382,2408 @@ def generate_html_report(all_hosts_hw_data, output_file):
         .info-card p strong {{
             color: #1f2937; /* text-gray-900 */
         }}
+
+        .search-box {{
+            margin-bottom: 2rem; /* mb-8 */
+        }}
+        .search-box input {{
+            width: 100%;
+            border: 1px solid #d1d5db; /* border-gray-300 */
+            border-radius: 0.375rem; /* rounded-md */
+            padding: 0.5rem 1rem; /* px-4 py-2 */
+        }}
+        .search-box ul li {{
+            padding: 0.25rem 0; /* py-1 */
+            font-size: 0.875rem; /* text-sm */
+        }}
     </style>
 </head>
 <body class="bg-gray-100 p-4 sm:p-6 lg:p-8">
     <div class="container mx-auto rounded-lg shadow-lg p-6 sm:p-8 lg:p-10">
-        <h1 class="text-3xl sm:text-4xl font-bold text-gray-900 mb-6 text-center">하드웨어 자산 보고서 (Bash 전용)</h1>
-        
+        <h1 class="text-3xl sm:text-4xl font-bold text-gray-900 mb-6 text-center">{html.escape(title)}</h1>
+    """
+
+_HTML_REPORT_TITLE = "하드웨어 자산 보고서 (Bash 전용)"
+
+_HTML_REPORT_INTRO = """
         <p class="text-gray-700 mb-8 text-center">
             이 보고서는 원격 서버에 Python 인터프리터가 필요 없이 Bash 명령어를 통해서 수집된 하드웨어 자산 정보를 표시합니다.
             CPU, IP 주소, 메인보드, 시스템 벤더, OS 및 메모리 정보가 포함됩니다.
         </p>
     """
 
-    if not all_hosts_hw_data:
-        html_content += """
-        <div class="text-center text-gray-600 text-lg py-10 rounded-md bg-white border border-gray-200 p-6">
-            <p>보고서를 생성할 데이터가 없습니다. Ansible 플레이북 실행 결과를 확인하세요。</p>
+_HTML_PAGE_TAIL = """
+    </div>
+</body>
+</html>
+    """
+
+_HTML_SEARCH_BOX = """
+        <div class="search-box">
+            <input id="hw-search" type="search" autocomplete="off" placeholder="호스트명, IP, 시리얼, CPU 모델, OS로 검색">
+            <p id="hw-search-count" class="text-gray-600 text-sm mt-2"></p>
+            <ul id="hw-search-results" class="mt-2"></ul>
         </div>
-        """
-    else:
-        # 호스트 이름을 알파벳 순으로 정렬하여 출력합니다.
-        for hostname_from_file in sorted(all_hosts_hw_data.keys()):
-            hw = all_hosts_hw_data[hostname_from_file]
-            
-            # 상태에 따른 CSS 클래스 결정
-            section_class = "host-section"
-            status_class = "collected" # 기본값
-            if hw.get('status') == 'Collection Failed':
-                section_class += " failed"
-                status_class = "failed"
-            elif hw.get('status') == 'Parsing Failed / No Data':
-                section_class += " parsing-failed"
-                status_class = "parsing-failed"
-
-            html_content += f"""
-        <div class="{section_class} rounded-md shadow-sm">
+    """
+
+# 검색 인덱스(JSON)를 읽어 입력할 때마다 필터링합니다. DOM을 검색하지 않고 미리 만든 인덱스만 사용합니다.
+# 한 페이지 보고서에서는 호스트 섹션을 숨기거나 보이고, 분할 보고서에서는 결과 링크 목록을 보여줍니다.
+_HTML_SEARCH_SCRIPT = """
+    <script>
+    (function () {
+        var index = JSON.parse(document.getElementById('hw-search-index').textContent);
+        var rows = index.rows;
+        var haystack = rows.map(function (r) {
+            return [r[0], r[1], r[2], r[3], index.cpu_models[r[4]], index.os_names[r[5]]].join(' ').toLowerCase();
+        });
+        var sections = index.pages.length ? null : rows.map(function (r, i) { return document.getElementById('host-' + i); });
+        var input = document.getElementById('hw-search');
+        var count = document.getElementById('hw-search-count');
+        var results = document.getElementById('hw-search-results');
+        var maxResults = 200;
+        var timer = null;
+
+        function render() {
+            var terms = input.value.toLowerCase().split(/\\s+/).filter(Boolean);
+            var matches = [];
+            for (var i = 0; i < rows.length; i++) {
+                var ok = true;
+                for (var t = 0; t < terms.length && ok; t++) { ok = haystack[i].indexOf(terms[t]) !== -1; }
+                if (sections) { sections[i].style.display = ok ? '' : 'none'; }
+                if (ok) { matches.push(i); }
+            }
+            count.textContent = terms.length ? matches.length + ' / ' + rows.length + '개 호스트 일치' : '';
+            if (sections) { return; }
+            results.textContent = '';
+            if (!terms.length) { return; }
+            matches.slice(0, maxResults).forEach(function (i) {
+                var r = rows[i];
+                var li = document.createElement('li');
+                var a = document.createElement('a');
+                a.href = index.pages[r[7]] + '#host-' + i;
+                a.className = 'text-indigo-600';
+                a.textContent = r[0];
+                li.appendChild(a);
+                li.appendChild(document.createTextNode(' - ' + r[1] + ' / ' + index.cpu_models[r[4]] + ' / ' + r[6]));
+                results.appendChild(li);
+            });
+        }
+
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(render, 100);
+        });
+    })();
+    </script>
+    """
+
+def _host_status_classes(status):
+    """
+    호스트 상태에 따른 (섹션 CSS 클래스, 상태 배지 CSS 클래스)를 반환합니다.
+    """
+    if status == 'Collection Failed':
+        return "host-section failed", "failed"
+    if status == 'Parsing Failed / No Data':
+        return "host-section parsing-failed", "parsing-failed"
+    return "host-section", "collected"
+
+def _render_host_section(anchor_id, hostname_from_file, hw):
+    """
+    호스트 한 대(HostRecord)의 HTML 카드 블록을 반환합니다. 모든 값은 HTML 이스케이프됩니다.
+    """
+    e = html.escape
+    section_class, status_class = _host_status_classes(hw.status)
+    return f"""
+        <div id="{anchor_id}" class="{section_class} rounded-md shadow-sm">
             <h2 class="text-xl sm:text-2xl font-semibold text-gray-800 mb-4">
-                호스트: <span class="text-indigo-600 break-all">{hostname_from_file}</span>
-                <span class="status {status_class}">{hw.get('status', 'Unknown')}</span>
+                호스트: <span class="text-indigo-600 break-all">{e(hostname_from_file)}</span>
+                <span class="status {status_class}">{e(hw.status)}</span>
             </h2>
             <div class="info-grid">
                 <div class="info-card">
                     <h3>시스템 정보</h3>
-                    <p><strong>호스트명:</strong> {hw.get('hostname', 'N/A')}</p>
-                    <p><strong>시스템 벤더:</strong> {hw['system_info'].get('manufacturer', 'N/A')}</p>
-                    <p><strong>제품명:</strong> {hw['system_info'].get('product_name', 'N/A')}</p>
-                    <p><strong>세부 모델/버전:</strong> {hw['system_info'].get('version', 'N/A')}</p>
-                    <p><strong>시리얼 번호:</strong> {hw['system_info'].get('serial_number', 'N/A')}</p>
+                    <p><strong>호스트명:</strong> {e(hw.hostname)}</p>
+                    <p><strong>시스템 벤더:</strong> {e(hw.system_manufacturer)}</p>
+                    <p><strong>제품명:</strong> {e(hw.system_product_name)}</p>
+                    <p><strong>세부 모델/버전:</strong> {e(hw.system_version)}</p>
+                    <p><strong>시리얼 번호:</strong> {e(hw.system_serial_number)}</p>
                 </div>
                 <div class="info-card">
                     <h3>CPU 정보</h3>
-                    <p><strong>모델:</strong> {hw['cpu'].get('model', 'N/A')}</p>
-                    <p><strong>논리 CPU 수:</strong> {hw['cpu'].get('logical_cpus', 'N/A')}</p>
-                    <p><strong>소켓당 코어 수:</strong> {hw['cpu'].get('cores_per_socket', 'N/A')}</p>
-                    <p><strong>코어당 스레드 수:</strong> {hw['cpu'].get('threads_per_core', 'N/A')}</p>
+                    <p><strong>모델:</strong> {e(hw.cpu_model)}</p>
+                    <p><strong>논리 CPU 수:</strong> {e(hw.cpu_logical_cpus)}</p>
+                    <p><strong>소켓당 코어 수:</strong> {e(hw.cpu_cores_per_socket)}</p>
+                    <p><strong>코어당 스레드 수:</strong> {e(hw.cpu_threads_per_core)}</p>
                 </div>
                 <div class="info-card">
                     <h3>네트워크 정보</h3>
-                    <p><strong>IP 주소:</strong> {', '.join(hw.get('ip_addresses', ['N/A']))}</p>
+                    <p><strong>IP 주소:</strong> {e(', '.join(hw.ip_addresses))}</p>
                 </div>
                 <div class="info-card">
                     <h3>메인보드 정보</h3>
-                    <p><strong>제조사:</strong> {hw['mainboard'].get('manufacturer', 'N/A')}</p>
-                    <p><strong>제품명:</strong> {hw['mainboard'].get('product', 'N/A')}</p>
-                    <p><strong>시리얼:</strong> {hw['mainboard'].get('serial', 'N/A')}</p>
-                    <p><strong>버전:</strong> {hw['mainboard'].get('version', 'N/A')}</p>
+                    <p><strong>제조사:</strong> {e(hw.board_manufacturer)}</p>
+                    <p><strong>제품명:</strong> {e(hw.board_product)}</p>
+                    <p><strong>시리얼:</strong> {e(hw.board_serial)}</p>
+                    <p><strong>버전:</strong> {e(hw.board_version)}</p>
                 </div>
                 <div class="info-card">
                     <h3>BIOS 정보</h3>
-                    <p><strong>벤더:</strong> {hw['bios'].get('vendor', 'N/A')}</p>
-                    <p><strong>버전:</strong> {hw['bios'].get('version', 'N/A')}</p>
+                    <p><strong>벤더:</strong> {e(hw.bios_vendor)}</p>
+                    <p><strong>버전:</strong> {e(hw.bios_version)}</p>
                 </div>
                 <div class="info-card">
                     <h3>OS 및 메모리</h3>
-                    <p><strong>배포판:</strong> {hw['os'].get('distribution', 'N/A')}</p>
-                    <p><strong>버전:</strong> {hw['os'].get('version', 'N/A')}</p>
-                    <p><strong>커널:</strong> {hw['os'].get('kernel', 'N/A')}</p>
-                    <p><strong>총 메모리:</strong> {hw.get('memory_mb', 'N/A')} MB</p>
+                    <p><strong>배포판:</strong> {e(hw.os_distribution)}</p>
+                    <p><strong>버전:</strong> {e(hw.os_version)}</p>
+                    <p><strong>커널:</strong> {e(hw.os_kernel)}</p>
+                    <p><strong>총 메모리:</strong> {e(hw.memory_mb)} MB</p>
                 </div>
             </div>
         </div>
             """
 
-    html_content += """
-    </div>
-</body>
-</html>
+def build_search_index(sorted_hosts, all_hosts_hw_data, shard_size=0, page_files=()):
     """
+    호스트명, IP, 시리얼, CPU 모델, OS로 검색할 수 있는 압축된 검색 인덱스를 만듭니다.
+    행 순서는 sorted_hosts 순서와 같으며, i번째 행의 호스트 섹션 id는 'host-<i>'입니다.
+    CPU 모델과 OS 이름은 중복이 많으므로 문자열 표의 번호로 저장합니다.
+    """
+    cpu_models, os_names = {}, {}
+    rows = []
+    for i, host in enumerate(sorted_hosts):
+        hw = all_hosts_hw_data[host]
+        os_name = f"{hw.os_distribution} {hw.os_version}"
+        rows.append([
+            host,
+            ' '.join(hw.ip_addresses),
+            hw.system_serial_number,
+            hw.board_serial,
+            cpu_models.setdefault(hw.cpu_model, len(cpu_models)),
+            os_names.setdefault(os_name, len(os_names)),
+            hw.status,
+            i // shard_size if shard_size else 0,
+        ])
+    return {
+        'version': 1,
+        'fields': ['host', 'ip_addresses', 'serial_number', 'board_serial', 'cpu_model', 'os', 'status', 'page'],
+        'cpu_models': list(cpu_models),
+        'os_names': list(os_names),
+        'pages': [os.path.basename(path) for path in page_files],
+        'rows': rows,
+    }
+
+def _search_index_script_tag(search_index):
+    """
+    검색 인덱스를 페이지에 포함하기 위한 <script type="application/json"> 태그를 반환합니다.
+    (file:// 로 연 보고서에서도 별도 요청 없이 인덱스를 사용할 수 있습니다)
+    """
+    payload = json.dumps(search_index, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    return f"""
+    <script type="application/json" id="hw-search-index">{payload}</script>
+    """
+
+def _shard_file_path(output_file, shard_number):
+    root, ext = os.path.splitext(output_file)
+    return f"{root}_hosts_{shard_number:04d}{ext or '.html'}"
+
+def _remove_stale_shards(output_file, shard_count):
+    """
+    이전 실행에서 만들어졌지만 이번에는 필요 없는 분할 페이지 파일을 삭제합니다.
+    """
+    shard_number = shard_count + 1
+    while os.path.exists(_shard_file_path(output_file, shard_number)):
+        os.remove(_shard_file_path(output_file, shard_number))
+        shard_number += 1
+
+def write_search_index(search_index, output_file):
+    """
+    검색 인덱스를 다른 도구에서도 사용할 수 있도록 JSON 파일로 저장합니다.
+    """
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(search_index, f, ensure_ascii=False, separators=(',', ':'))
+
+# HTML 보고서의 자원 요약 표마다 표시할 최대 그룹 수 (전체 그룹은 자원 요약 JSON 파일에 있습니다)
+HTML_MAX_SUMMARY_ROWS = 20
+
+def _format_memory_gib(memory_mb):
+    return f"{memory_mb / 1024:,.1f}"
+
+def _render_summary_section(summary):
+    """
+    보고서 맨 위에 표시할 '자원 요약' 블록(전체 합계와 요약 기준별 표)을 반환합니다.
+    """
+    e = html.escape
+    totals = summary['totals']
+    status_text = ', '.join(f"{e(status)} {count:,}개" for status, count in summary['status_counts'].items())
+    tables = []
+    for name, title in summary['dimensions'].items():
+        rows = summary['groups'][name]
+        body = '\n'.join(f"""                    <tr class="border-t border-gray-200">
+                        <td class="pr-4 py-1 break-all">{e(row['key'])}</td><td class="pr-4 text-right">{row['hosts']:,}</td>
+                        <td class="pr-4 text-right">{row['logical_cpus']:,}</td><td class="pr-4 text-right">{row['cores']:,}</td>
+                        <td class="text-right">{_format_memory_gib(row['memory_mb'])}</td>
+                    </tr>""" for row in rows[:HTML_MAX_SUMMARY_ROWS])
+        more = f'<p class="mt-1">외 {len(rows) - HTML_MAX_SUMMARY_ROWS}개 그룹은 자원 요약 JSON 파일을 확인하세요.</p>' if len(rows) > HTML_MAX_SUMMARY_ROWS else ""
+        tables.append(f"""
+            <div class="info-card">
+                <h3>{e(title)}별</h3>
+                <table class="w-full text-left">
+                    <thead><tr><th>{e(title)}</th><th class="text-right">호스트</th><th class="text-right">논리 CPU</th><th class="text-right">코어</th><th class="text-right">메모리(GiB)</th></tr></thead>
+                    <tbody>
+{body}
+                    </tbody>
+                </table>{more}
+            </div>""")
+    return f"""
+        <div class="info-card mb-4">
+            <h3>자원 요약</h3>
+            <p>전체 {summary['hosts_total']:,}개 호스트 ({status_text})</p>
+            <p>수집 성공 {totals['hosts']:,}개 호스트 합계: 논리 CPU {totals['logical_cpus']:,}개, 코어 {totals['cores']:,}개, 메모리 {_format_memory_gib(totals['memory_mb'])} GiB</p>
+        </div>
+        <div class="info-grid mb-8">{''.join(tables)}
+        </div>
+    """
+
+# HTML 보고서의 변경 사항 표에 표시할 최대 행 수 (전체 내역은 변경 내역 JSON 파일에 있습니다)
+HTML_MAX_CHANGE_ROWS = 500
+
+def _render_changes_section(changes, host_links):
+    """
+    보고서 맨 위에 표시할 '이전 실행 대비 변경 사항' 블록을 반환합니다.
+    host_links는 {인벤토리 호스트명: 호스트 섹션 링크}입니다.
+    """
+    e = html.escape
+    summary = changes['summary']
+    labels = {'changed': '변경', 'added': '추가', 'removed': '제거'}
+    rows = []
+    for entry in changes['hosts']:
+        link = host_links.get(entry['host'])
+        host_html = f'<a class="text-indigo-600" href="{e(link)}">{e(entry["host"])}</a>' if link else e(entry['host'])
+        field_changes = entry['fields'] or [{'field': '-', 'old': '', 'new': entry['status']}]
+        for change in field_changes:
+            rows.append(f"""                    <tr class="border-t border-gray-200">
+                        <td class="pr-4 py-1">{host_html}</td><td class="pr-4">{labels[entry['change']]}</td>
+                        <td class="pr-4">{e(change['field'])}</td><td class="pr-4">{e(str(change['old']))}</td><td>{e(str(change['new']))}</td>
+                    </tr>""")
+    more = ""
+    if len(rows) > HTML_MAX_CHANGE_ROWS:
+        more = f'<p class="mt-2">외 {len(rows) - HTML_MAX_CHANGE_ROWS}개 행은 변경 내역 JSON 파일을 확인하세요.</p>'
+        rows = rows[:HTML_MAX_CHANGE_ROWS]
+    table = ""
+    if rows:
+        table = f"""
+            <table class="w-full text-left mt-2">
+                <thead><tr><th>호스트</th><th>구분</th><th>필드</th><th>이전</th><th>현재</th></tr></thead>
+                <tbody>
+{chr(10).join(rows)}
+                </tbody>
+            </table>{more}"""
+    return f"""
+        <div class="info-card mb-8">
+            <h3>이전 실행 대비 변경 사항 ({e(str(changes.get('previous_run_at')))} &rarr; {e(str(changes.get('current_run_at')))})</h3>
+            <p>변경 {summary['changed']}개, 추가 {summary['added']}개, 제거 {summary['removed']}개, 변경 없음 {summary['unchanged']}개</p>{table}
+        </div>
+    """
+
+def _render_shard_list(sorted_hosts, shard_size, page_files):
+    """
+    분할 보고서의 색인 페이지에 표시할 페이지 목록(페이지별 첫/마지막 호스트)을 반환합니다.
+    """
+    items = []
+    for n, page_file in enumerate(page_files):
+        first = sorted_hosts[n * shard_size]
+        last = sorted_hosts[min(len(sorted_hosts), (n + 1) * shard_size) - 1]
+        items.append(f'                <li><a class="text-indigo-600" href="{html.escape(os.path.basename(page_file))}">'
+                     f'페이지 {n + 1}</a>: {html.escape(first)} ~ {html.escape(last)}</li>')
+    return f"""
+        <div class="info-card">
+            <h3>호스트 페이지 ({len(sorted_hosts)}개 호스트, 페이지당 {shard_size}개)</h3>
+            <ul>
+{chr(10).join(items)}
+            </ul>
+        </div>
+    """
+
+def _write_html_shard(page_file, shard_number, shard_count, sorted_hosts, all_hosts_hw_data, shard_size, index_file_name):
+    """
+    분할 보고서의 호스트 페이지 하나를 기록합니다. 섹션 id는 전체 정렬 순서 기준 'host-<i>'입니다.
+    """
+    first_index = (shard_number - 1) * shard_size
+    with open(page_file, 'w', encoding='utf-8') as f:
+        f.write(_html_page_head(f"{_HTML_REPORT_TITLE} - {shard_number}/{shard_count}"))
+        f.write(f"""
+        <p class="text-gray-700 mb-8 text-center">
+            <a class="text-indigo-600" href="{html.escape(index_file_name)}">&larr; 검색 및 전체 목록으로 돌아가기</a>
+        </p>
+    """)
+        for i in range(first_index, min(len(sorted_hosts), first_index + shard_size)):
+            hostname_from_file = sorted_hosts[i]
+            f.write(_render_host_section(f"host-{i}", hostname_from_file, all_hosts_hw_data[hostname_from_file]))
+        f.write(_HTML_PAGE_TAIL)
+
+def generate_html_report(all_hosts_hw_data, output_file, shard_size=HTML_SHARD_SIZE, search_index_file=SEARCH_INDEX_FILE,
+                         changes=None, summary=None, only_hosts=None):
+    """
+    모든 호스트의 하드웨어 데이터를 기반으로 HTML 보고서를 생성합니다.
+
+    호스트 섹션은 문자열로 모으지 않고 파일에 바로 기록합니다.
+    호스트 수가 shard_size보다 많으면 output_file은 검색창과 페이지 목록만 있는 색인 페이지가 되고,
+    호스트 카드는 shard_size개씩 '<보고서>_hosts_NNNN.html' 페이지로 나뉩니다. (shard_size=0이면 분할하지 않음)
+    두 방식 모두 검색 인덱스가 페이지에 포함되며, search_index_file에도 JSON으로 저장됩니다.
+    summary(build_fleet_summary의 자원 요약)와 changes(compute_fleet_changes의 변경 내역)가 주어지면
+    맨 위에 자원 요약과 변경 사항 블록을 표시합니다.
+    only_hosts(호스트 목록)가 주어지면 분할 페이지 중 그 호스트가 있는 페이지만 다시 씁니다.
+    (색인 페이지와 검색 인덱스는 항상 다시 씁니다. 감시 모드에서 바뀐 호스트만 반영할 때 사용합니다)
+    """
+    # 결과 디렉토리가 없으면 생성
+    os.makedirs(RESULT_DIR, exist_ok=True) # <--- 디렉토리 생성 추가
+
+    # 호스트 이름을 알파벳 순으로 정렬하여 출력합니다.
+    sorted_hosts = sorted(all_hosts_hw_data.keys())
+    sharded = bool(shard_size) and len(sorted_hosts) > shard_size
+    page_files = []
+    if sharded:
+        page_files = [_shard_file_path(output_file, n + 1) for n in range(-(-len(sorted_hosts) // shard_size))]
+    search_index = build_search_index(sorted_hosts, all_hosts_hw_data, shard_size if sharded else 0, page_files)
 
     try:
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"HTML 보고서가 성공적으로 생성되었습니다: {output_file}")
+            f.write(_html_page_head(_HTML_REPORT_TITLE))
+            f.write(_HTML_REPORT_INTRO)
+
+            if not all_hosts_hw_data:
+                f.write("""
+        <div class="text-center text-gray-600 text-lg py-10 rounded-md bg-white border border-gray-200 p-6">
+            <p>보고서를 생성할 데이터가 없습니다. Ansible 플레이북 실행 결과를 확인하세요。</p>
+        </div>
+        """)
+            else:
+                if summary is not None:
+                    f.write(_render_summary_section(summary))
+                if changes is not None:
+                    host_links = {host: f"{os.path.basename(page_files[i // shard_size]) if sharded else ''}#host-{i}"
+                                  for i, host in enumerate(sorted_hosts)}
+                    f.write(_render_changes_section(changes, host_links))
+                f.write(_HTML_SEARCH_BOX)
+                if sharded:
+                    f.write(_render_shard_list(sorted_hosts, shard_size, page_files))
+                else:
+                    for i, hostname_from_file in enumerate(sorted_hosts):
+                        f.write(_render_host_section(f"host-{i}", hostname_from_file, all_hosts_hw_data[hostname_from_file]))
+                f.write(_search_index_script_tag(search_index))
+                f.write(_HTML_SEARCH_SCRIPT)
+
+            f.write(_HTML_PAGE_TAIL)
+
+        if only_hosts is not None and page_files:
+            positions = {host: i for i, host in enumerate(sorted_hosts)}
+            shard_numbers = sorted({positions[host] // shard_size + 1 for host in only_hosts if host in positions})
+        else:
+            shard_numbers = range(1, len(page_files) + 1)
+        for shard_number in shard_numbers:
+            page_file = page_files[shard_number - 1]
+            _write_html_shard(page_file, shard_number, len(page_files), sorted_hosts, all_hosts_hw_data,
+                              shard_size, os.path.basename(output_file))
+        _remove_stale_shards(output_file, len(page_files))
+        if search_index_file:
+            write_search_index(search_index, search_index_file)
+
+        if sharded and only_hosts is not None:
+            print(f"HTML 보고서가 갱신되었습니다: {output_file} (호스트 페이지 {len(shard_numbers)}/{len(page_files)}개 다시 씀)")
+        elif sharded:
+            print(f"HTML 보고서가 성공적으로 생성되었습니다: {output_file} (호스트 페이지 {len(page_files)}개)")
+        else:
+            print(f"HTML 보고서가 성공적으로 생성되었습니다: {output_file}")
     except Exception as e:
         print(f"HTML 보고서 생성 중 오류가 발생했습니다: {e}")
 
-def generate_yaml_report(all_hosts_hw_data, output_file):
+# libyaml이 설치되어 있으면 C로 구현된 Dumper를 사용합니다. (순수 Python Dumper보다 수십 배 빠름)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+def generate_yaml_report(all_hosts_hw_data, output_file, verbose=False):
     """
     모든 호스트의 하드웨어 데이터를 기반으로 YAML 보고서를 생성합니다.
     실패한 호스트는 YAML 보고서에서 제외됩니다.
+    전체 데이터를 한 번에 dump하지 않고 호스트 단위로 HostRecord.to_dict()를 만들어 기록합니다. (결과 문서는 동일)
     """
     # 결과 디렉토리가 없으면 생성
     os.makedirs(RESULT_DIR, exist_ok=True) # <--- 디렉토리 생성 추가
 
     print(f"YAML 보고서 생성 중: {output_file}")
-    filtered_data_for_yaml = {}
-    for hostname, data in all_hosts_hw_data.items():
-        if data.get('status') == 'Collected': # 'Collected' 상태인 호스트만 포함
-            clean_data = data.copy()
-            clean_data.pop('status', None) 
-            filtered_data_for_yaml[hostname] = clean_data
-        else:
-            print(f"정보: 호스트 '{hostname}'은(는) 수집 실패 또는 파싱 실패 상태이므로 YAML 보고서에서 제외됩니다.")
-
+    excluded_count = 0
     try:
         with open(output_file, 'w', encoding='utf-8') as f:
-            yaml.dump(filtered_data_for_yaml, f, default_flow_style=False, allow_unicode=True, indent=2, width=80, sort_keys=False)
+            for hostname, data in all_hosts_hw_data.items():
+                if data.status != 'Collected': # 'Collected' 상태인 호스트만 포함
+                    excluded_count += 1
+                    if verbose:
+                        print(f"정보: 호스트 '{hostname}'은(는) 수집 실패 또는 파싱 실패 상태이므로 YAML 보고서에서 제외됩니다.")
+                    continue
+                yaml.dump({hostname: data.to_dict(include_status=False)}, f, Dumper=_YAML_DUMPER, default_flow_style=False,
+                          allow_unicode=True, indent=2, width=80, sort_keys=False)
+            if excluded_count == len(all_hosts_hw_data):
+                # 포함된 호스트가 없으면 한 번에 dump하던 때처럼 빈 매핑('{}')을 씁니다. (빈 파일은 None으로 읽힘)
+                yaml.dump({}, f, Dumper=_YAML_DUMPER, default_flow_style=False)
+        if excluded_count:
+            print(f"정보: 수집 실패 또는 파싱 실패 상태인 호스트 {excluded_count}개는 YAML 보고서에서 제외되었습니다.")
         print(f"YAML 보고서가 성공적으로 생성되었습니다: {output_file}")
     except Exception as e:
         print(f"오류: YAML 보고서 생성 중 오류 발생: {e}")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("사용법: python process_hw_info_bash_only.py <inventory_file>")
-        sys.exit(1)
-    
-    inventory_file_path = sys.argv[1]
+# CSV, SQLite 등 평면 형식 내보내기에서 사용하는 (열 이름, 필드 경로, SQLite 타입)
+# 필드 경로는 HostRecord의 'section.key' 경로(HOST_RECORD_FIELDS)입니다. IP 주소 목록은 공백으로 이어 붙입니다.
+FLAT_REPORT_FIELDS = [
+    ('hostname', 'hostname', 'TEXT'),
+    ('status', 'status', 'TEXT'),
+    ('ip_addresses', 'ip_addresses', 'TEXT'),
+    ('cpu_model', 'cpu.model', 'TEXT'),
+    ('cpu_logical_cpus', 'cpu.logical_cpus', 'INTEGER'),
+    ('cpu_cores_per_socket', 'cpu.cores_per_socket', 'INTEGER'),
+    ('cpu_threads_per_core', 'cpu.threads_per_core', 'INTEGER'),
+    ('system_manufacturer', 'system_info.manufacturer', 'TEXT'),
+    ('system_product_name', 'system_info.product_name', 'TEXT'),
+    ('system_serial_number', 'system_info.serial_number', 'TEXT'),
+    ('system_version', 'system_info.version', 'TEXT'),
+    ('board_manufacturer', 'mainboard.manufacturer', 'TEXT'),
+    ('board_product', 'mainboard.product', 'TEXT'),
+    ('board_serial', 'mainboard.serial', 'TEXT'),
+    ('board_version', 'mainboard.version', 'TEXT'),
+    ('bios_vendor', 'bios.vendor', 'TEXT'),
+    ('bios_version', 'bios.version', 'TEXT'),
+    ('os_distribution', 'os.distribution', 'TEXT'),
+    ('os_version', 'os.version', 'TEXT'),
+    ('os_kernel', 'os.kernel', 'TEXT'),
+    ('memory_mb', 'memory_mb', 'INTEGER'),
+]
+
+def get_field(hw, field_path):
+    """
+    HostRecord에서 'section.key' 형식의 필드 경로 값을 문자열로 반환합니다.
+    """
+    value = getattr(hw, FIELD_PATH_SLOTS[field_path])
+    if isinstance(value, tuple):
+        return ' '.join(value)
+    return value
+
+def flatten_host_record(inventory_host, hw):
+    """
+    호스트 데이터를 [인벤토리 호스트명, FLAT_REPORT_FIELDS 순서의 값들] 리스트로 변환합니다.
+    """
+    return [inventory_host] + [get_field(hw, field_path) for _, field_path, _ in FLAT_REPORT_FIELDS]
+
+def _to_int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _jsonl_record_line(inventory_host, hw):
+    return json.dumps({'inventory_host': inventory_host, **hw.to_dict()}, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+def _csv_line(row):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+def _csv_record_line(inventory_host, hw):
+    return _csv_line(flatten_host_record(inventory_host, hw))
+
+def export_jsonl(all_hosts_hw_data, output_file):
+    """
+    호스트 한 대당 JSON 객체 한 줄(JSON Lines)로 기록합니다. 실패한 호스트도 status와 함께 포함됩니다.
+    """
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for inventory_host, hw in all_hosts_hw_data.items():
+            f.write(_jsonl_record_line(inventory_host, hw))
+
+def export_csv(all_hosts_hw_data, output_file):
+    """
+    FLAT_REPORT_FIELDS 열을 가진 평면 CSV로 기록합니다. (스프레드시트용, UTF-8 BOM 포함)
+    """
+    with open(output_file, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['inventory_host'] + [column for column, _, _ in FLAT_REPORT_FIELDS])
+        for inventory_host, hw in all_hosts_hw_data.items():
+            writer.writerow(flatten_host_record(inventory_host, hw))
+
+def export_sqlite(all_hosts_hw_data, output_file):
+    """
+    FLAT_REPORT_FIELDS 열을 가진 hosts 테이블 하나로 된 SQLite 데이터베이스를 새로 만듭니다.
+    INTEGER 열의 'N/A' 값은 NULL로 저장됩니다. 임시 파일에 기록한 뒤 교체합니다.
+    """
+    int_columns = [i + 1 for i, (_, _, sql_type) in enumerate(FLAT_REPORT_FIELDS) if sql_type == 'INTEGER']
+
+    def rows():
+        for inventory_host, hw in all_hosts_hw_data.items():
+            row = flatten_host_record(inventory_host, hw)
+            for i in int_columns:
+                row[i] = _to_int_or_none(row[i])
+            yield row
+
+    tmp_file = f"{output_file}.tmp"
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+    columns = ', '.join(f"{column} {sql_type}" for column, _, sql_type in FLAT_REPORT_FIELDS)
+    placeholders = ', '.join('?' * (len(FLAT_REPORT_FIELDS) + 1))
+    conn = sqlite3.connect(tmp_file)
+    try:
+        conn.execute(f"CREATE TABLE hosts (inventory_host TEXT PRIMARY KEY, {columns})")
+        conn.executemany(f"INSERT INTO hosts VALUES ({placeholders})", rows())
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_file, output_file)
+
+# 내보내기 형식 이름 -> (내보내기 함수, 기본 출력 파일). 새 형식은 여기에 등록합니다.
+EXPORTERS = {
+    'jsonl': (export_jsonl, os.path.join(RESULT_DIR, "hardware_inventory_report_bash_only.jsonl")),
+    'csv': (export_csv, os.path.join(RESULT_DIR, "hardware_inventory_report_bash_only.csv")),
+    'sqlite': (export_sqlite, os.path.join(RESULT_DIR, "hardware_inventory_report_bash_only.sqlite")),
+}
+
+def export_reports(all_hosts_hw_data, formats):
+    """
+    지정한 형식들로 호스트 데이터를 내보내고 {형식: 출력 파일} 딕셔너리를 반환합니다.
+    """
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    written = {}
+    for name in formats:
+        export, output_file = EXPORTERS[name]
+        try:
+            export(all_hosts_hw_data, output_file)
+            written[name] = output_file
+            print(f"{name.upper()} 내보내기가 성공적으로 생성되었습니다: {output_file}")
+        except Exception as e:
+            print(f"오류: {name.upper()} 내보내기 중 오류 발생: {e}")
+    return written
+
+def update_sqlite_export(all_hosts_hw_data, output_file, hosts):
+    """
+    기존 SQLite 내보내기 파일의 hosts 테이블에서 주어진 호스트의 행만 갱신합니다. (감시 모드용)
+    파일이 없거나 갱신할 행이 없으면 False를 반환하며, 이때는 전체를 다시 만들어야 합니다.
+    """
+    if not os.path.exists(output_file):
+        return False
+    int_columns = [i for i, (_, _, sql_type) in enumerate(FLAT_REPORT_FIELDS) if sql_type == 'INTEGER']
+    assignments = ', '.join(f"{column} = ?" for column, _, _ in FLAT_REPORT_FIELDS)
+    conn = sqlite3.connect(output_file)
+    try:
+        updated = 0
+        for host in hosts:
+            row = [get_field(all_hosts_hw_data[host], field_path) for _, field_path, _ in FLAT_REPORT_FIELDS]
+            for i in int_columns:
+                row[i] = _to_int_or_none(row[i])
+            updated += conn.execute(f"UPDATE hosts SET {assignments} WHERE inventory_host = ?", row + [host]).rowcount
+        if updated != len(hosts):
+            conn.rollback()
+            return False
+        conn.commit()
+    finally:
+        conn.close()
+    return True
+
+# 줄 단위 내보내기 형식 -> (호스트 한 줄을 만드는 함수, 머리글 줄, 파일 인코딩)
+# 감시 모드는 호스트별 줄을 메모리에 유지하고, 바뀐 호스트의 줄만 다시 만들어 파일을 교체합니다.
+LINE_EXPORT_FORMATS = {
+    'jsonl': (_jsonl_record_line, '', 'utf-8'),
+    'csv': (_csv_record_line, _csv_line(['inventory_host'] + [column for column, _, _ in FLAT_REPORT_FIELDS]), 'utf-8-sig'),
+}
+
+def write_line_export(all_hosts_hw_data, output_file, name, lines, hosts=None):
+    """
+    줄 단위 내보내기 파일(JSONL, CSV)을 lines({호스트: 줄})로 기록합니다. (결과는 export_jsonl/export_csv와 같음)
+    hosts가 None이면 모든 호스트의 줄을, 주어지면 그 호스트의 줄만 다시 만듭니다. 임시 파일에 쓴 뒤 교체합니다.
+    """
+    format_line, header_line, encoding = LINE_EXPORT_FORMATS[name]
+    if hosts is None:
+        lines.clear()
+        hosts = all_hosts_hw_data
+    for host in hosts:
+        lines[host] = format_line(host, all_hosts_hw_data[host])
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'w', encoding=encoding, newline='') as f:
+        f.write(header_line)
+        f.writelines(lines.values())
+    os.replace(tmp_file, output_file)
+
+def update_exports(all_hosts_hw_data, formats, hosts, line_caches):
+    """
+    바뀐 호스트(hosts)를 내보내기 파일에 반영합니다. (감시 모드용, hosts가 None이면 전체)
+    JSONL, CSV는 line_caches[형식]에 유지한 호스트별 줄 중 바뀐 줄만 다시 만들고, SQLite는 해당 행만 갱신합니다.
+    부분 갱신을 할 수 없으면 export_reports와 같이 전체를 다시 만듭니다.
+    """
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    full_formats = []
+    for name in formats:
+        output_file = EXPORTERS[name][1]
+        try:
+            if name in LINE_EXPORT_FORMATS:
+                lines = line_caches.setdefault(name, {})
+                write_line_export(all_hosts_hw_data, output_file, name, lines, hosts if lines else None)
+            elif hosts is None or not update_sqlite_export(all_hosts_hw_data, output_file, hosts):
+                full_formats.append(name)
+                continue
+        except (OSError, sqlite3.Error) as e:
+            print(f"오류: {name.upper()} 내보내기 중 오류 발생: {e}")
+            continue
+        print(f"{name.upper()} 내보내기가 갱신되었습니다: {output_file}"
+              + (f" (호스트 {len(hosts)}개)" if hosts is not None else ""))
+    return export_reports(all_hosts_hw_data, full_formats)
+
+def _parse_export_formats(value):
+    formats = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in formats if name not in EXPORTERS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"지원하지 않는 형식: {', '.join(unknown)} (사용 가능: {', '.join(EXPORTERS)})")
+    return formats
+
+# 자원 요약에서 묶어 보는 기준: (이름, 표시 이름, 값을 이어 붙일 HostRecord 슬롯들)
+SUMMARY_DIMENSIONS = [
+    ('manufacturer', '시스템 제조사', ('system_manufacturer',)),
+    ('cpu_model', 'CPU 모델', ('cpu_model',)),
+    ('os', 'OS 배포판/버전', ('os_distribution', 'os_version')),
+    ('bios_version', 'BIOS 버전', ('bios_version',)),
+]
+# 자원 요약에서 합계를 내는 수치 열 (cores는 논리 CPU 수 / 코어당 스레드 수로 계산한 물리 코어 수)
+SUMMARY_METRICS = ['logical_cpus', 'cores', 'memory_mb']
+
+def _to_count(value):
+    """
+    '80' 같은 숫자 문자열을 정수로, 'N/A' 등 숫자가 아닌 값은 -1(값 없음)로 변환합니다.
+    """
+    return int(value) if value.isdigit() else -1
+
+def _attrgetter_tuple(slot):
+    get_value = operator.attrgetter(slot)
+    return lambda hw: (get_value(hw),)
+
+def build_fleet_columns(all_hosts_hw_data):
+    """
+    수집에 성공한 호스트들을 자원 요약용 열(column) 형식으로 한 번에 변환합니다.
+        metrics: {수치 열: array('q')} (값이 없으면 -1)
+        codes:   {요약 기준: array('l')} (labels[기준]의 번호)
+        labels:  {요약 기준: [값 문자열, ...]}
+    문자열 필드는 여기서 한 번만 숫자/번호로 바뀌므로, 요약 기준을 여러 개 계산해도 다시 변환하지 않습니다.
+    """
+    metrics = {name: array('q') for name in SUMMARY_METRICS}
+    codes = {name: array('l') for name, _, _ in SUMMARY_DIMENSIONS}
+    label_codes = {name: {} for name, _, _ in SUMMARY_DIMENSIONS}
+    logical_column, cores_column, memory_column = metrics['logical_cpus'], metrics['cores'], metrics['memory_mb']
+    # (슬롯 값들을 꺼내는 함수, 슬롯 값 -> 번호 표, 번호 열); 같은 값 조합은 슬롯 값 튜플로 바로 찾습니다
+    dimension_columns = [(operator.attrgetter(*slots) if len(slots) > 1 else _attrgetter_tuple(slots[0]), {},
+                          label_codes[name], codes[name])
+                         for name, _, slots in SUMMARY_DIMENSIONS]
+
+    for hw in all_hosts_hw_data.values():
+        if hw.status != 'Collected':
+            continue
+        logical_cpus = _to_count(hw.cpu_logical_cpus)
+        threads_per_core = _to_count(hw.cpu_threads_per_core)
+        logical_column.append(logical_cpus)
+        cores_column.append(logical_cpus // threads_per_core if logical_cpus > 0 and threads_per_core > 0 else -1)
+        memory_column.append(_to_count(hw.memory_mb))
+        for get_values, value_codes, table, column in dimension_columns:
+            values = get_values(hw)
+            code = value_codes.get(values)
+            if code is None:
+                label = ' '.join(value for value in values if value != 'N/A') or 'N/A'
+                code = table.get(label)
+                if code is None:
+                    code = table[label] = len(table)
+                value_codes[values] = code
+            column.append(code)
+
+    return {
+        'hosts': len(logical_column),
+        'metrics': metrics,
+        'codes': codes,
+        'labels': {name: list(table) for name, table in label_codes.items()},
+    }
+
+def _sum_known(values):
+    known = [value for value in values if value >= 0]
+    return sum(known), len(values) - len(known)
+
+def aggregate_fleet_columns(columns):
+    """
+    build_fleet_columns의 열로 전체 합계와 요약 기준별 (호스트 수, 수치 열 합계, 값이 없는 호스트 수)를 계산합니다.
+    그룹은 호스트 수가 많은 순서로 정렬됩니다.
+    """
+    metrics = columns['metrics']
+    totals = {'hosts': columns['hosts']}
+    for metric, values in metrics.items():
+        totals[metric], totals[f'{metric}_missing'] = _sum_known(values)
+
+    groups = {}
+    for name, _, _ in SUMMARY_DIMENSIONS:
+        labels = columns['labels'][name]
+        codes = columns['codes'][name]
+        host_counts = [0] * len(labels)
+        for code in codes:
+            host_counts[code] += 1
+        rows = [{'key': label, 'hosts': count} for label, count in zip(labels, host_counts)]
+        for metric, values in metrics.items():
+            sums = [0] * len(labels)
+            missing = [0] * len(labels)
+            for code, value in zip(codes, values):
+                if value >= 0:
+                    sums[code] += value
+                else:
+                    missing[code] += 1
+            for row, total, missing_count in zip(rows, sums, missing):
+                row[metric] = total
+                row[f'{metric}_missing'] = missing_count
+        rows.sort(key=lambda row: (-row['hosts'], row['key']))
+        groups[name] = rows
+    return {'totals': totals, 'groups': groups}
+
+def build_fleet_summary(all_hosts_hw_data):
+    """
+    자원 요약 딕셔너리를 만듭니다. 상태별 호스트 수와 수집에 성공한 호스트 기준의 합계/그룹별 합계를 포함합니다.
+    """
+    status_counts = {}
+    for hw in all_hosts_hw_data.values():
+        status_counts[hw.status] = status_counts.get(hw.status, 0) + 1
+    summary = aggregate_fleet_columns(build_fleet_columns(all_hosts_hw_data))
+    return {
+        'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'hosts_total': len(all_hosts_hw_data),
+        'status_counts': status_counts,
+        'dimensions': {name: title for name, title, _ in SUMMARY_DIMENSIONS},
+        **summary,
+    }
+
+def write_fleet_summary(summary, summary_file):
+    os.makedirs(os.path.dirname(summary_file) or '.', exist_ok=True)
+    tmp_file = f"{summary_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_file, summary_file)
+
+# 실행 간 변경 감지 스냅샷의 스키마 버전
+SNAPSHOT_SCHEMA_VERSION = 1
+
+# 변경 감지에서 비교하는 열 (FLAT_REPORT_FIELDS에서 status를 제외한 하드웨어/OS 필드)
+_CHANGE_COLUMNS = [column for column, _, _ in FLAT_REPORT_FIELDS if column != 'status']
+
+def host_fingerprint(inventory_host, hw):
+    """
+    호스트의 평면화된 필드 값 전체에 대한 해시를 반환합니다. 값이 같으면 지문도 같습니다.
+    """
+    joined = '\x1f'.join(flatten_host_record(inventory_host, hw))
+    return hashlib.blake2b(joined.encode('utf-8'), digest_size=12).hexdigest()
+
+def _change_fields(hw):
+    return {column: get_field(hw, field_path) for column, field_path, _ in FLAT_REPORT_FIELDS if column != 'status'}
+
+def load_fleet_snapshot(snapshot_file):
+    """
+    이전 실행의 스냅샷을 읽습니다. 없거나 읽을 수 없으면 None을 반환합니다.
+    """
+    try:
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"경고: 이전 스냅샷 '{snapshot_file}'를 읽을 수 없어 변경 감지를 건너뜁니다: {e}")
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('schema_version') != SNAPSHOT_SCHEMA_VERSION:
+        print(f"정보: 이전 스냅샷 '{snapshot_file}'의 스키마 버전이 달라 변경 감지를 건너뜁니다.")
+        return None
+    return snapshot
+
+def save_fleet_snapshot(snapshot_file, snapshot):
+    tmp_file = f"{snapshot_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_file, snapshot_file)
+
+def compute_fleet_changes(previous_snapshot, all_hosts_hw_data, run_at=None):
+    """
+    이전 스냅샷과 이번 실행의 호스트 데이터를 비교하여 (변경 내역, 새 스냅샷)을 반환합니다.
+
+    호스트마다 지문(host_fingerprint)을 먼저 비교하므로 바뀌지 않은 호스트는 필드 비교 없이 넘어갑니다.
+    수집/파싱에 실패한 호스트는 상태 변화만 보고하고, 마지막으로 수집에 성공했던 필드 값을 스냅샷에 유지합니다.
+    그래서 실패 후 다시 수집된 호스트는 마지막 성공 시점의 값과 비교됩니다.
+    previous_snapshot이 None이면 (첫 실행) 변경 내역은 None입니다.
+    """
+    run_at = run_at or time.strftime('%Y-%m-%d %H:%M:%S')
+    previous_hosts = previous_snapshot['hosts'] if previous_snapshot else {}
+    new_hosts = {}
+    changed_hosts = []
+    unchanged_count = 0
+
+    for inventory_host, hw in all_hosts_hw_data.items():
+        fingerprint = host_fingerprint(inventory_host, hw)
+        previous = previous_hosts.get(inventory_host)
+        if previous is not None and previous['fp'] == fingerprint:
+            new_hosts[inventory_host] = previous
+            unchanged_count += 1
+            continue
+
+        status = hw.status
+        collected = status == 'Collected'
+        fields = _change_fields(hw) if collected else (previous or {}).get('fields')
+        new_hosts[inventory_host] = {'fp': fingerprint, 'status': status, 'fields': fields}
+        if previous is None:
+            changed_hosts.append({'host': inventory_host, 'change': 'added', 'status': status, 'fields': []})
+            continue
+
+        field_changes = []
+        if previous['status'] != status:
+            field_changes.append({'field': 'status', 'old': previous['status'], 'new': status})
+        if collected and previous.get('fields'):
+            for column in _CHANGE_COLUMNS:
+                old_value = previous['fields'].get(column, 'N/A')
+                if old_value != fields[column]:
+                    field_changes.append({'field': column, 'old': old_value, 'new': fields[column]})
+        if field_changes:
+            changed_hosts.append({'host': inventory_host, 'change': 'changed', 'status': status, 'fields': field_changes})
+        else:
+            unchanged_count += 1
+
+    for inventory_host, previous in previous_hosts.items():
+        if inventory_host not in all_hosts_hw_data:
+            changed_hosts.append({'host': inventory_host, 'change': 'removed', 'status': previous['status'], 'fields': []})
+
+    new_snapshot = {'schema_version': SNAPSHOT_SCHEMA_VERSION, 'run_at': run_at, 'hosts': new_hosts}
+    if previous_snapshot is None:
+        return None, new_snapshot
+
+    summary = {'changed': 0, 'added': 0, 'removed': 0, 'unchanged': unchanged_count}
+    for entry in changed_hosts:
+        summary[entry['change']] += 1
+    changes = {
+        'previous_run_at': previous_snapshot.get('run_at'),
+        'current_run_at': run_at,
+        'summary': summary,
+        'hosts': changed_hosts,
+    }
+    return changes, new_snapshot
+
+def write_fleet_changes(changes, changes_file):
+    os.makedirs(os.path.dirname(changes_file) or '.', exist_ok=True)
+    tmp_file = f"{changes_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(changes, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_file, changes_file)
+
+def detect_fleet_changes(all_hosts_hw_data, snapshot_file, changes_file):
+    """
+    이전 스냅샷과 비교하여 변경 내역을 changes_file(JSON)에 기록하고 새 스냅샷을 저장합니다.
+    변경 내역 딕셔너리를 반환하며, 첫 실행이면 None을 반환합니다.
+    """
+    previous_snapshot = load_fleet_snapshot(snapshot_file)
+    changes, new_snapshot = compute_fleet_changes(previous_snapshot, all_hosts_hw_data)
+    os.makedirs(os.path.dirname(snapshot_file) or '.', exist_ok=True)
+    if changes is None:
+        print("정보: 이전 실행 스냅샷이 없어 변경 감지를 건너뜁니다. (다음 실행부터 비교합니다)")
+    else:
+        write_fleet_changes(changes, changes_file)
+        summary = changes['summary']
+        print(f"변경 감지: 변경 {summary['changed']}개, 추가 {summary['added']}개, 제거 {summary['removed']}개, "
+              f"변경 없음 {summary['unchanged']}개 ({changes_file})")
+    save_fleet_snapshot(snapshot_file, new_snapshot)
+    return changes
+
+# 실행 이력 저장소의 스키마 버전 (PRAGMA user_version)
+HISTORY_SCHEMA_VERSION = 1
+
+# 이력 조회에 사용하는 인덱스: (인덱스 이름, 테이블, 열 목록)
+_HISTORY_INDEXES = [
+    ('idx_snap_inventory_host', 'host_snapshots', 'inventory_host, run_at'),
+    ('idx_snap_hostname', 'host_snapshots', 'hostname, run_at'),
+    ('idx_snap_serial', 'host_snapshots', 'system_serial_number, run_at'),
+    ('idx_snap_board_serial', 'host_snapshots', 'board_serial, run_at'),
+    ('idx_snap_cpu_model', 'host_snapshots', 'cpu_model, run_at'),
+    ('idx_snap_bios_version', 'host_snapshots', 'bios_version, run_at'),
+    ('idx_snap_run_at', 'host_snapshots', 'run_at'),
+    ('idx_ips_ip', 'host_ips', 'ip, run_at'),
+]
+
+def open_history_db(db_file):
+    """
+    실행 이력 SQLite 저장소를 열고, 필요하면 테이블과 인덱스를 만듭니다.
+    runs(실행), host_snapshots(실행별 호스트 스냅샷), host_ips(실행별 호스트 IP) 테이블로 구성됩니다.
+    """
+    db_dir = os.path.dirname(db_file)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, HISTORY_SCHEMA_VERSION):
+        conn.close()
+        raise RuntimeError(f"이력 저장소 '{db_file}'의 스키마 버전({version})을 지원하지 않습니다.")
+    if version == 0:
+        columns = ', '.join(f"{column} {sql_type}" for column, _, sql_type in FLAT_REPORT_FIELDS)
+        with conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_at TEXT NOT NULL,
+                inventory_file TEXT,
+                host_count INTEGER)""")
+            conn.execute(f"""CREATE TABLE IF NOT EXISTS host_snapshots (
+                run_id INTEGER NOT NULL REFERENCES runs(run_id),
+                run_at TEXT NOT NULL,
+                inventory_host TEXT NOT NULL,
+                {columns},
+                PRIMARY KEY (run_id, inventory_host))""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS host_ips (
+                run_id INTEGER NOT NULL REFERENCES runs(run_id),
+                run_at TEXT NOT NULL,
+                inventory_host TEXT NOT NULL,
+                ip TEXT NOT NULL)""")
+            for index_name, table, index_columns in _HISTORY_INDEXES:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({index_columns})")
+            conn.execute(f"PRAGMA user_version = {HISTORY_SCHEMA_VERSION}")
+    return conn
+
+def record_history(all_hosts_hw_data, db_file, inventory_file=None, run_at=None):
+    """
+    이번 실행의 모든 호스트 데이터를 실행 시각과 함께 이력 저장소에 추가하고 run_id를 반환합니다.
+    실행 시각은 로컬 시간 'YYYY-MM-DD HH:MM:SS' 형식으로 저장됩니다.
+    """
+    run_at = run_at or time.strftime('%Y-%m-%d %H:%M:%S')
+    int_columns = [i + 1 for i, (_, _, sql_type) in enumerate(FLAT_REPORT_FIELDS) if sql_type == 'INTEGER']
+    placeholders = ', '.join('?' * (len(FLAT_REPORT_FIELDS) + 3))
+
+    conn = open_history_db(db_file)
+    try:
+        with conn:
+            run_id = conn.execute("INSERT INTO runs (run_at, inventory_file, host_count) VALUES (?, ?, ?)",
+                                  (run_at, inventory_file, len(all_hosts_hw_data))).lastrowid
+
+            def snapshot_rows():
+                for inventory_host, hw in all_hosts_hw_data.items():
+                    row = flatten_host_record(inventory_host, hw)
+                    for i in int_columns:
+                        row[i] = _to_int_or_none(row[i])
+                    yield [run_id, run_at] + row
+
+            def ip_rows():
+                for inventory_host, hw in all_hosts_hw_data.items():
+                    for ip in hw.ip_addresses:
+                        if ip != 'N/A':
+                            yield (run_id, run_at, inventory_host, ip)
+
+            conn.executemany(f"INSERT INTO host_snapshots VALUES ({placeholders})", snapshot_rows())
+            conn.executemany("INSERT INTO host_ips VALUES (?, ?, ?, ?)", ip_rows())
+    finally:
+        conn.close()
+    return run_id
+
+# query 하위 명령의 필터 옵션 -> host_snapshots 열 이름
+_HISTORY_QUERY_FILTERS = [
+    ('host', 'inventory_host'),
+    ('hostname', 'hostname'),
+    ('serial', 'system_serial_number'),
+    ('board_serial', 'board_serial'),
+    ('cpu_model', 'cpu_model'),
+    ('bios_version', 'bios_version'),
+    ('status', 'status'),
+]
+
+# query 결과에 표시하는 열
+_HISTORY_QUERY_COLUMNS = ['run_at', 'inventory_host', 'hostname', 'status', 'ip_addresses', 'system_serial_number',
+                          'board_serial', 'cpu_model', 'bios_version', 'os_distribution', 'os_version', 'os_kernel', 'memory_mb']
+
+def query_history(db_file, filters=None, ip=None, since=None, until=None, latest=False, limit=None):
+    """
+    이력 저장소에서 조건에 맞는 호스트 스냅샷을 (열 이름 리스트, 행 리스트)로 반환합니다.
+    filters는 {host_snapshots 열 이름: 값}이며, 값에 '%'가 있으면 LIKE로, 없으면 정확히 비교합니다.
+    since/until은 run_at 문자열과 비교하는 [since, until) 범위입니다.
+    latest가 True이면 호스트마다 조건에 맞는 가장 최근 스냅샷만 반환합니다.
+    """
+    where, params = [], []
+    for column, value in (filters or {}).items():
+        where.append(f"s.{column} {'LIKE' if '%' in value else '='} ?")
+        params.append(value)
+    if ip:
+        where.append("EXISTS (SELECT 1 FROM host_ips i WHERE i.ip = ? AND i.run_id = s.run_id AND i.inventory_host = s.inventory_host)")
+        params.append(ip)
+    if since:
+        where.append("s.run_at >= ?")
+        params.append(since)
+    if until:
+        where.append("s.run_at < ?")
+        params.append(until)
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+    select_columns = ', '.join(f"s.{column}" for column in _HISTORY_QUERY_COLUMNS)
+
+    if latest:
+        sql = (f"SELECT {select_columns} FROM host_snapshots s JOIN ("
+               f"SELECT inventory_host, MAX(run_id) AS run_id FROM host_snapshots s {where_sql} GROUP BY inventory_host"
+               f") m ON s.inventory_host = m.inventory_host AND s.run_id = m.run_id ORDER BY s.inventory_host")
+    else:
+        sql = f"SELECT {select_columns} FROM host_snapshots s {where_sql} ORDER BY s.run_at, s.inventory_host"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+
+    conn = open_history_db(db_file)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+    return _HISTORY_QUERY_COLUMNS, rows
+
+def _date_range_bound(value, end=False):
+    """
+    'YYYY-MM-DD'는 그날 0시(end=True이면 다음 날 0시)로, 그 외 값은 그대로 run_at 비교 값으로 사용합니다.
+    """
+    if value and len(value) == 10:
+        day = time.strptime(value, '%Y-%m-%d')
+        if end:
+            day = time.localtime(time.mktime(day) + 36 * 3600) # DST와 무관하게 다음 날로 이동
+        return time.strftime('%Y-%m-%d 00:00:00', day)
+    return value
+
+def _print_table(columns, rows):
+    widths = [len(column) for column in columns]
+    text_rows = [['' if value is None else str(value) for value in row] for row in rows]
+    for row in text_rows:
+        widths = [max(width, len(value)) for width, value in zip(widths, row)]
+    print('  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in text_rows:
+        print('  '.join(value.ljust(width) for value, width in zip(row, widths)))
+
+def run_query(argv):
+    """
+    query 모드: 실행 이력 저장소에서 호스트 스냅샷을 조회합니다.
+    예) BIOS 버전 X를 사용한 호스트:  query --bios-version X --date 2025-01-31 --latest
+        시리얼 Z가 어느 호스트에 있었는지:  query --serial Z
+    """
+    parser = argparse.ArgumentParser(prog="process_hw_info_bash_only.py query",
+                                     description="하드웨어 자산 실행 이력 조회")
+    parser.add_argument('--db', default=HISTORY_DB_FILE, help=f"이력 저장소 경로 (기본값: {HISTORY_DB_FILE})")
+    parser.add_argument('--host', help="인벤토리 호스트명")
+    parser.add_argument('--hostname', help="서버에서 수집된 호스트명")
+    parser.add_argument('--serial', help="시스템 시리얼 번호")
+    parser.add_argument('--board-serial', help="메인보드 시리얼")
+    parser.add_argument('--ip', help="IP 주소")
+    parser.add_argument('--cpu-model', help="CPU 모델 ('%%'를 포함하면 LIKE 패턴)")
+    parser.add_argument('--bios-version', help="BIOS 버전")
+    parser.add_argument('--status', help="수집 상태 (예: Collected, Collection Failed)")
+    parser.add_argument('--date', help="해당 날짜(YYYY-MM-DD)의 실행만 조회")
+    parser.add_argument('--since', help="이 시각 이후의 실행만 조회 (YYYY-MM-DD 또는 'YYYY-MM-DD HH:MM:SS')")
+    parser.add_argument('--until', help="이 시각 이전의 실행만 조회 (YYYY-MM-DD이면 그날까지 포함)")
+    parser.add_argument('--latest', action='store_true', help="호스트마다 조건에 맞는 가장 최근 스냅샷만 표시")
+    parser.add_argument('--runs', action='store_true', help="저장된 실행 목록을 표시")
+    parser.add_argument('--limit', type=int, help="최대 행 수")
+    parser.add_argument('--format', choices=['table', 'json', 'csv'], default='table', help="출력 형식 (기본값: table)")
+    args = parser.parse_args(argv)
+    if args.date and (args.since or args.until):
+        parser.error("--date는 --since/--until과 함께 사용할 수 없습니다.")
+
+    if not os.path.exists(args.db):
+        print(f"오류: 이력 저장소 '{args.db}'를 찾을 수 없습니다. 먼저 보고서를 생성하세요.")
+        return 1
+
+    started = time.perf_counter()
+    if args.runs:
+        conn = open_history_db(args.db)
+        try:
+            columns = ['run_id', 'run_at', 'inventory_file', 'host_count']
+            rows = conn.execute("SELECT run_id, run_at, inventory_file, host_count FROM runs ORDER BY run_id").fetchall()
+        finally:
+            conn.close()
+    else:
+        filters = {column: getattr(args, option) for option, column in _HISTORY_QUERY_FILTERS
+                   if getattr(args, option)}
+        since = _date_range_bound(args.date or args.since)
+        until = _date_range_bound(args.date or args.until, end=True)
+        columns, rows = query_history(args.db, filters, ip=args.ip, since=since, until=until,
+                                      latest=args.latest, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.format == 'json':
+        for row in rows:
+            print(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+    elif args.format == 'csv':
+        writer = csv.writer(sys.stdout)
+        writer.writerow(columns)
+        writer.writerows(rows)
+    else:
+        _print_table(columns, rows)
+        print(f"\n{len(rows)}개 행 ({elapsed_ms:.1f} ms)")
+    return 0
+
+# 수집 일정(schedule) 상태 파일의 스키마 버전
+SCHEDULE_SCHEMA_VERSION = 1
+# 마지막 수집 후 이 시간(초)이 지난 호스트를 다시 수집합니다.
+SCHEDULE_TTL = 24 * 3600
+# 실패한 호스트는 SCHEDULE_RETRY_BASE초 뒤에 다시 시도하고, 연속으로 실패할 때마다 간격을 두 배로(최대 SCHEDULE_RETRY_MAX초) 늘립니다.
+SCHEDULE_RETRY_BASE = 10 * 60
+SCHEDULE_RETRY_MAX = 6 * 3600
+# 수집 대상을 고른 이유 (우선순위 순서)
+SCHEDULE_REASONS = ('failed', 'new', 'stale')
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_duration(value):
+    """
+    '90', '30m', '6h', '1d' 형식의 기간을 초(int)로 반환합니다. (argparse type으로 사용)
+    """
+    text = value.strip().lower()
+    unit = _DURATION_UNITS.get(text[-1:])
+    try:
+        seconds = int(float(text[:-1] if unit else text) * (unit or 1))
+    except ValueError:
+        seconds = -1
+    if seconds < 0:
+        raise argparse.ArgumentTypeError(f"기간 형식이 올바르지 않습니다: {value} (예: 90, 30m, 6h, 1d)")
+    return seconds
+
+def _format_epoch(seconds):
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(seconds)) if seconds else ''
+
+def load_collect_schedule(schedule_file):
+    """
+    수집 일정 상태를 읽습니다. 없거나 읽을 수 없으면 None을 반환합니다. (모든 호스트가 새 호스트로 취급됩니다)
+    """
+    try:
+        with open(schedule_file, 'r', encoding='utf-8') as f:
+            schedule = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"경고: 수집 일정 상태 '{schedule_file}'를 읽을 수 없어 처음부터 다시 만듭니다: {e}")
+        return None
+    if not isinstance(schedule, dict) or schedule.get('schema_version') != SCHEDULE_SCHEMA_VERSION:
+        print(f"정보: 수집 일정 상태 '{schedule_file}'의 스키마 버전이 달라 처음부터 다시 만듭니다.")
+        return None
+    return schedule
+
+def save_collect_schedule(schedule_file, schedule):
+    os.makedirs(os.path.dirname(schedule_file) or '.', exist_ok=True)
+    tmp_file = f"{schedule_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(schedule, ensure_ascii=False, separators=(',', ':'))) # json.dump와 달리 C 인코더를 사용
+    os.replace(tmp_file, schedule_file)
+
+def update_collect_schedule(all_hosts_hw_data, raw_data, schedule_file, now=None, hosts=None):
+    """
+    이번 보고서의 호스트 상태로 수집 일정 상태를 갱신하고, 보고서에 일정의 결과를 합칩니다.
+
+    호스트마다 마지막으로 받은 raw 데이터의 시각(data_at, raw 파일/레코드의 mtime), 그 상태(status),
+    마지막 시도 시각(attempted_at), 연속 실패 횟수(failures)를 기록합니다.
+    schedule 하위 명령이 고른 대상(pending)은 계획 시각 이후에 raw 데이터가 새로 생겼는지로 성공/실패를 판단합니다.
+    (raw 파일에는 수집 시각 메타데이터가 들어 있어 ansible fetch도 매번 파일을 다시 씁니다)
+    대상이 아니었던 호스트는 이전 raw 데이터를 그대로 보고서에 포함하지만, 마지막 시도가 실패한 호스트는
+    예전 raw 데이터가 남아 있더라도 전체 수집과 같이 'Collection Failed'로 표시합니다.
+    hosts가 주어지면 (watch에서 raw 파일이 바뀐 호스트) 그 호스트만 다시 판단하고, 나머지 호스트의 상태와
+    아직 판단하지 않은 대상은 그대로 둡니다.
+    (대상 수, 성공 수, 실패 수, 이전 raw 데이터 대신 'Collection Failed'로 표시한 호스트 수)를 반환합니다.
+    """
+    now = int(now or time.time())
+    schedule = load_collect_schedule(schedule_file) or {}
+    previous_hosts = schedule.get('hosts', {})
+    pending = schedule.get('pending') or {}
+    planned_at = pending.get('planned_at', now)
+    pending_hosts = set(pending.get('hosts', ()))
+    try:
+        raw_files = scan_raw_data(raw_data)
+    except (FileNotFoundError, NotADirectoryError, ValueError):
+        raw_files = {}
+
+    if hosts is None:
+        host_states, hosts = {}, all_hosts_hw_data
+    else:
+        host_states, hosts = dict(previous_hosts), [host for host in hosts if host in all_hosts_hw_data]
+    targets = collected = failed = marked_failed = 0
+    for inventory_host in hosts:
+        hw = all_hosts_hw_data[inventory_host]
+        entry = previous_hosts.get(inventory_host) or {'status': None, 'data_at': None, 'attempted_at': None, 'failures': 0}
+        raw_entry = raw_files.get(inventory_host)
+        data_at = raw_entry.stat().st_mtime_ns // 1_000_000_000 if raw_entry is not None else None
+        new_data = data_at is not None and (entry['data_at'] is None or data_at > entry['data_at'])
+        if inventory_host in pending_hosts:
+            targets += 1
+            pending_hosts.discard(inventory_host)
+            entry['attempted_at'] = planned_at
+            if data_at is not None and data_at >= planned_at:
+                entry['status'], entry['data_at'] = hw.status, data_at
+            else:
+                entry['status'] = 'Collection Failed'
+            entry['failures'] = 0 if entry['status'] == 'Collected' else entry['failures'] + 1
+            if entry['status'] == 'Collected':
+                collected += 1
+            else:
+                failed += 1
+        elif data_at is None:
+            entry['status'] = 'Collection Failed'
+        elif new_data: # 일정과 관계없이(전체 수집 등) 새로 받은 raw 데이터
+            entry['status'], entry['data_at'] = hw.status, data_at
+            if hw.status == 'Collected':
+                entry['failures'] = 0
+        elif entry['status'] != 'Collection Failed':
+            entry['status'] = hw.status
+        if entry['status'] == 'Collection Failed' and hw.status != 'Collection Failed':
+            all_hosts_hw_data[inventory_host] = HostRecord(inventory_host, 'Collection Failed')
+            marked_failed += 1
+        host_states[inventory_host] = entry
+
+    # 전체를 판단했으면 인벤토리에 없는 대상도 정리하고, 일부만 판단했으면 남은 대상을 다음 판단으로 넘깁니다.
+    if hosts is all_hosts_hw_data or not pending_hosts:
+        pending = None
+    else:
+        pending = {'planned_at': planned_at, 'hosts': [host for host in pending['hosts'] if host in pending_hosts]}
+    save_collect_schedule(schedule_file, {'schema_version': SCHEDULE_SCHEMA_VERSION, 'updated_at': now,
+                                          'hosts': host_states, 'pending': pending})
+    return targets, collected, failed, marked_failed
+
+def apply_collect_schedule(all_hosts_hw_data, raw_data, schedule_file, hosts=None):
+    """
+    파싱 직후 update_collect_schedule로 수집 일정 상태를 갱신하고 결과를 출력합니다.
+    (보고서, watch, serve가 --schedule일 때 같은 방식으로 사용합니다) 오류가 나도 보고서 생성은 계속합니다.
+    """
+    try:
+        targets, collected, failed, marked_failed = update_collect_schedule(all_hosts_hw_data, raw_data, schedule_file,
+                                                                            hosts=hosts)
+    except Exception as e:
+        print(f"오류: 수집 일정 상태 갱신 중 오류 발생: {e}")
+        return
+    parts = [f"대상 {targets}개 중 성공 {collected}개, 실패 {failed}개"] if targets else []
+    if marked_failed:
+        parts.append(f"마지막 수집에 실패하여 이전 raw 데이터 대신 'Collection Failed'로 표시 {marked_failed}개")
+    if parts:
+        print(f"수집 일정: {', '.join(parts)} ({schedule_file})")
+
+def collect_retry_delay(failures, retry_base=SCHEDULE_RETRY_BASE, retry_max=SCHEDULE_RETRY_MAX):
+    """
+    연속 failures번 실패한 호스트를 다시 시도하기까지 기다릴 시간(초)입니다.
+    """
+    return min(retry_max, retry_base * 2 ** max(0, failures - 1))
+
+def plan_collection(schedule, hosts, now=None, ttl=SCHEDULE_TTL, retry_base=SCHEDULE_RETRY_BASE,
+                    retry_max=SCHEDULE_RETRY_MAX, max_hosts=0):
+    """
+    다음에 수집할 호스트를 우선순위 순서로 골라 ([(호스트, 이유)], 분류별 호스트 수)를 반환합니다.
+
+    실패한 호스트(재시도 대기 시간이 지난 것, 연속 실패가 적고 오래전에 시도한 것부터),
+    일정 상태에 없는 새 호스트(인벤토리 순서), 마지막 수집 후 ttl초가 지난 호스트(오래된 것부터) 순서입니다.
+    max_hosts가 0보다 크면 그 수까지만 고르고 나머지는 다음 실행으로 미룹니다(deferred).
+    """
+    now = int(now or time.time())
+    previous_hosts = (schedule or {}).get('hosts', {})
+    candidates = {reason: [] for reason in SCHEDULE_REASONS}
+    counts = {'backoff': 0, 'fresh': 0}
+    for host in hosts:
+        entry = previous_hosts.get(host)
+        if entry is None:
+            candidates['new'].append((0, host))
+        elif entry['status'] != 'Collected':
+            attempted_at = entry['attempted_at'] or 0
+            if entry['failures'] and now < attempted_at + collect_retry_delay(entry['failures'], retry_base, retry_max):
+                counts['backoff'] += 1
+                continue
+            candidates['failed'].append(((entry['failures'], attempted_at), host))
+        elif entry['data_at'] is None or now - entry['data_at'] >= ttl:
+            candidates['stale'].append((entry['data_at'] or 0, host))
+        else:
+            counts['fresh'] += 1
+
+    targets = []
+    for reason in SCHEDULE_REASONS:
+        ordered = candidates[reason] if reason == 'new' else sorted(candidates[reason])
+        targets.extend((host, reason) for _, host in ordered)
+    counts['deferred'] = max(0, len(targets) - max_hosts) if max_hosts > 0 else 0
+    if counts['deferred']:
+        targets = targets[:max_hosts]
+    for reason in SCHEDULE_REASONS:
+        counts[reason] = 0
+    for _, reason in targets:
+        counts[reason] += 1
+    return targets, counts
+
+def run_schedule(argv):
+    """
+    schedule 모드: 마지막 수집 상태와 TTL로 다시 수집할 호스트만 골라 수집기 대상 목록 파일을 만듭니다.
+    수집 후 보고서를 만들면 대상의 성공/실패가 일정 상태에 반영되고, 나머지 호스트는 이전 raw 데이터로 보고서에 합쳐집니다.
+    """
+    parser = argparse.ArgumentParser(prog="process_hw_info_bash_only.py schedule",
+                                     description="다시 수집할 호스트(실패/신규/오래된 호스트) 목록 만들기")
+    parser.add_argument('inventory_file', help="Ansible 인벤토리 파일 경로")
+    parser.add_argument('--schedule-file', default=SCHEDULE_FILE,
+                        help=f"수집 일정 상태 파일 경로 (기본값: {SCHEDULE_FILE})")
+    parser.add_argument('--output', default=SCHEDULE_TARGETS_FILE,
+                        help=f"수집 대상 목록 파일 (한 줄에 하나, 기본값: {SCHEDULE_TARGETS_FILE})")
+    parser.add_argument('--ttl', type=parse_duration, default=SCHEDULE_TTL,
+                        help="마지막 수집 후 이 기간이 지나면 다시 수집 (예: 30m, 6h, 1d, 기본값: 1d)")
+    parser.add_argument('--retry-base', type=parse_duration, default=SCHEDULE_RETRY_BASE,
+                        help="실패한 호스트의 첫 재시도 간격, 연속 실패마다 두 배 (기본값: 10m)")
+    parser.add_argument('--retry-max', type=parse_duration, default=SCHEDULE_RETRY_MAX,
+                        help="재시도 간격의 최댓값 (기본값: 6h)")
+    parser.add_argument('--max-hosts', type=int, default=0,
+                        help="한 번에 수집할 최대 호스트 수, 나머지는 다음 실행으로 미룸 (0: 제한 없음, 기본값: 0)")
+    parser.add_argument('--dry-run', action='store_true', help="대상 목록만 출력하고 파일과 일정 상태는 바꾸지 않음")
+    parser.add_argument('--verbose', action='store_true', help="수집 대상 호스트를 모두 출력")
+    args = parser.parse_args(argv)
+
+    hosts = parse_inventory_hosts(args.inventory_file)
+    if not hosts:
+        print(f"오류: 인벤토리 파일 '{args.inventory_file}'에서 대상 호스트를 찾을 수 없습니다.")
+        return 1
+    now = int(time.time())
+    schedule = load_collect_schedule(args.schedule_file)
+    targets, counts = plan_collection(schedule, hosts, now, args.ttl, args.retry_base, args.retry_max, args.max_hosts)
+
+    if args.verbose or args.dry_run:
+        previous_hosts = (schedule or {}).get('hosts', {})
+        rows = []
+        for host, reason in targets:
+            entry = previous_hosts.get(host) or {}
+            rows.append([host, reason, entry.get('status') or '', _format_epoch(entry.get('data_at')),
+                         _format_epoch(entry.get('attempted_at')), entry.get('failures', 0)])
+        _print_table(['host', 'reason', 'status', 'data_at', 'attempted_at', 'failures'], rows)
+        print()
+    print(f"수집 대상 {len(targets)}개: 실패 재시도 {counts['failed']}개, 신규 {counts['new']}개, 오래됨 {counts['stale']}개 "
+          f"(재시도 대기 {counts['backoff']}개, 최신 {counts['fresh']}개, 다음으로 미룸 {counts['deferred']}개)")
+    if args.dry_run:
+        return 0
+
+    try:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        tmp_file = f"{args.output}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.writelines(f"{host}\n" for host, _ in targets)
+        os.replace(tmp_file, args.output)
+        schedule = schedule or {'schema_version': SCHEDULE_SCHEMA_VERSION, 'updated_at': now, 'hosts': {}}
+        schedule['pending'] = {'planned_at': now, 'hosts': [host for host, _ in targets]} if targets else None
+        save_collect_schedule(args.schedule_file, schedule)
+    except OSError as e:
+        print(f"오류: 수집 대상 목록 저장 중 오류 발생: {e}")
+        return 1
+    print(f"수집 대상 목록이 저장되었습니다: {args.output}")
+    if targets:
+        print("수집한 뒤 보고서를 --schedule과 함께 만들어야 결과가 수집 일정 상태에 반영됩니다. (SCHEDULE=1이면 자동)")
+    return 0
+
+# 측정 파일에 나열할 가장 느린 호스트 수
+METRICS_SLOWEST_HOSTS = 20
+
+@contextlib.contextmanager
+def _timed_phase(phases, name):
+    """
+    with 블록의 실행 시간(초)을 phases[name]에 기록합니다.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = round(time.perf_counter() - started, 6)
+
+def _latency_summary(seconds_by_host):
+    """
+    호스트별 소요 시간의 합계, 평균, p50, p95, 최대값을 반환합니다.
+    """
+    values = sorted(seconds_by_host.values())
+    if not values:
+        return {'count': 0}
+    def percentile(fraction):
+        return round(values[min(len(values) - 1, int(fraction * len(values)))], 6)
+    return {
+        'count': len(values),
+        'total': round(sum(values), 6),
+        'mean': round(sum(values) / len(values), 6),
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'max': round(values[-1], 6),
+    }
+
+def _slowest_hosts(seconds_by_host, limit=METRICS_SLOWEST_HOSTS):
+    slowest = sorted(seconds_by_host.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{'host': host, 'seconds': round(seconds, 6)} for host, seconds in slowest]
+
+def _collect_seconds(meta):
+    """
+    raw 파일의 수집 메타데이터에서 (원격 스크립트 실행 시간, 수집기가 잰 전체 시간)을 계산합니다.
+    전체 시간은 Python 수집기만 기록하며(ssh 접속과 권한 상승 포함), 값이 없으면 None입니다.
+    """
+    script_seconds = wall_seconds = None
+    try:
+        if 'started_at' in meta and 'finished_at' in meta:
+            script_seconds = round(max(0.0, float(meta['finished_at']) - float(meta['started_at'])), 6)
+        if 'wall_seconds' in meta:
+            wall_seconds = float(meta['wall_seconds'])
+    except ValueError:
+        pass
+    return script_seconds, wall_seconds
+
+def build_run_metrics(all_hosts_hw_data, phases, parse_stats, options=None):
+    """
+    보고서 생성 한 번의 측정 결과를 JSON으로 저장할 수 있는 딕셔너리로 만듭니다.
+        phases: 단계별 소요 시간(초). 수집 단계는 run_all_hw_bash_only.sh가 --collect-seconds로 전달합니다.
+        parse_stats: parse_all_hw_data_files의 stats (캐시 적중 수, 호스트별 파싱 시간, 수집 메타데이터)
+    """
+    parse_seconds = parse_stats.get('parse_seconds', {})
+    collect_meta = parse_stats.get('collect', {})
+    script_seconds, wall_seconds = {}, {}
+    hosts = {}
+    status_counts = {}
+    for host, hw in all_hosts_hw_data.items():
+        status = hw.status
+        status_counts[status] = status_counts.get(status, 0) + 1
+        entry = {'status': status, 'parse_seconds': None, 'collect_script_seconds': None,
+                 'collect_wall_seconds': None, 'collect_method': None}
+        if host in parse_seconds:
+            entry['parse_seconds'] = round(parse_seconds[host], 6)
+        meta = collect_meta.get(host)
+        if meta:
+            entry['collect_script_seconds'], entry['collect_wall_seconds'] = _collect_seconds(meta)
+            entry['collect_method'] = meta.get('method')
+            if entry['collect_script_seconds'] is not None:
+                script_seconds[host] = entry['collect_script_seconds']
+            if entry['collect_wall_seconds'] is not None:
+                wall_seconds[host] = entry['collect_wall_seconds']
+        hosts[host] = entry
+
+    return {
+        'schema_version': 1,
+        'run_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'options': options or {},
+        'hosts_total': len(all_hosts_hw_data),
+        'status_counts': status_counts,
+        'phases': phases,
+        'processing_seconds': round(sum(seconds for name, seconds in phases.items() if name != 'collect'), 6),
+        'parse': {
+            'cache_hits': parse_stats.get('cache_hits', 0),
+            'cache_misses': parse_stats.get('cache_misses', 0),
+            'parsed_files': parse_stats.get('parsed_files', 0),
+            'latency': _latency_summary(parse_seconds),
+            'slowest_hosts': _slowest_hosts(parse_seconds),
+        },
+        'collect': {
+            'script_latency': _latency_summary(script_seconds),
+            'wall_latency': _latency_summary(wall_seconds),
+            'slowest_hosts': _slowest_hosts(wall_seconds or script_seconds),
+        },
+        'hosts': hosts,
+    }
+
+def write_metrics(metrics, metrics_file):
+    os.makedirs(os.path.dirname(metrics_file) or '.', exist_ok=True)
+    tmp_file = f"{metrics_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_file, metrics_file)
+
+def print_metrics_summary(metrics, limit=5):
+    print("\n단계별 소요 시간:")
+    for name, seconds in metrics['phases'].items():
+        print(f"  - {name}: {seconds:.3f}초")
+    slowest = metrics['collect']['slowest_hosts'][:limit]
+    if slowest:
+        print("수집이 가장 느린 호스트: " + ', '.join(f"{item['host']}({item['seconds']:.2f}초)" for item in slowest))
+    slowest = metrics['parse']['slowest_hosts'][:limit]
+    if slowest:
+        print("파싱이 가장 느린 호스트: " + ', '.join(f"{item['host']}({item['seconds'] * 1000:.1f}ms)" for item in slowest))
+
+def run_report(argv):
+    """
+    기본 모드: 인벤토리의 모든 호스트를 파싱하여 HTML/YAML 보고서를 생성합니다.
+    """
+    if len(argv) < 1:
+        print("사용법: python process_hw_info_bash_only.py <inventory_file> [옵션]")
+        print("        python process_hw_info_bash_only.py query [--serial S] [--bios-version V] [--date YYYY-MM-DD] ...")
+        print("        python process_hw_info_bash_only.py bench-parse <raw_file_or_dir> [...]")
+        print("        python process_hw_info_bash_only.py watch <inventory_file> [--interval S] [--export jsonl,csv,sqlite] ...")
+        print("        python process_hw_info_bash_only.py serve <inventory_file> | --from-export <jsonl_file> [--port N]")
+        print("        python process_hw_info_bash_only.py pack [fetched_hw_data] [--output FILE.hwpack] [--remove-files]")
+        print("        python process_hw_info_bash_only.py schedule <inventory_file> [--ttl 1d] [--max-hosts N] [--output FILE]")
+        return 1
+
+    parser = argparse.ArgumentParser(prog="process_hw_info_bash_only.py",
+                                     description="수집된 raw 하드웨어 데이터로 HTML/YAML 보고서 생성")
+    parser.add_argument('inventory_file', help="Ansible 인벤토리 파일 경로")
+    parser.add_argument('--raw-data', default=FETCHED_HW_DATA_DIR,
+                        help=f"raw 파일 디렉토리 또는 {HW_PACK_SUFFIX} 파일 (기본값: {FETCHED_HW_DATA_DIR})")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="파싱에 사용할 worker 수 (0: CPU 개수, 1: 순차 처리, 기본값: 0)")
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process',
+                        help="병렬 파싱 방식 (기본값: process)")
+    parser.add_argument('--verbose', action='store_true', help="호스트별 파싱 진행 상황을 출력")
+    parser.add_argument('--cache-file', default=PARSE_CACHE_FILE,
+                        help=f"파싱 결과 캐시 파일 경로 (기본값: {PARSE_CACHE_FILE})")
+    parser.add_argument('--no-cache', action='store_true', help="파싱 캐시를 사용하지 않고 모든 파일을 다시 파싱")
+    parser.add_argument('--shard-size', type=int, default=HTML_SHARD_SIZE,
+                        help=f"HTML 보고서의 페이지당 호스트 수 (0: 한 페이지, 기본값: {HTML_SHARD_SIZE})")
+    parser.add_argument('--export', type=_parse_export_formats, default=[],
+                        help=f"추가로 생성할 내보내기 형식, 쉼표로 구분 ({', '.join(EXPORTERS)})")
+    parser.add_argument('--history-db', default=HISTORY_DB_FILE,
+                        help=f"실행 이력 저장소 경로 (기본값: {HISTORY_DB_FILE})")
+    parser.add_argument('--no-history', action='store_true', help="이번 실행을 이력 저장소에 기록하지 않음")
+    parser.add_argument('--snapshot-file', default=SNAPSHOT_FILE,
+                        help=f"변경 감지에 사용할 이전 실행 스냅샷 경로 (기본값: {SNAPSHOT_FILE})")
+    parser.add_argument('--changes-file', default=CHANGES_FILE,
+                        help=f"변경 내역 JSON 파일 경로 (기본값: {CHANGES_FILE})")
+    parser.add_argument('--no-changes', action='store_true', help="이전 실행과의 변경 감지를 하지 않음")
+    parser.add_argument('--schedule-file', default=SCHEDULE_FILE,
+                        help=f"수집 일정 상태 파일 경로 (기본값: {SCHEDULE_FILE})")
+    parser.add_argument('--schedule', action='store_true',
+                        help="수집 일정 상태를 갱신하고 마지막 수집에 실패한 호스트를 보고서에 반영 (SCHEDULE=1이 사용)")
+    parser.add_argument('--summary-file', default=SUMMARY_FILE,
+                        help=f"자원 요약 JSON 파일 경로 (기본값: {SUMMARY_FILE})")
+    parser.add_argument('--no-summary', action='store_true', help="자원 요약을 만들지 않음")
+    parser.add_argument('--metrics', nargs='?', const=METRICS_FILE, default=None, metavar='FILE',
+                        help=f"단계별 소요 시간과 호스트별 파싱/수집 시간을 JSON으로 기록 (기본 경로: {METRICS_FILE})")
+    parser.add_argument('--profile', nargs='?', const=PROFILE_FILE, default=None, metavar='FILE',
+                        help=f"cProfile 결과를 저장 (기본 경로: {PROFILE_FILE}, 병렬 파싱 worker 프로세스는 제외)")
+    parser.add_argument('--collect-seconds', type=float, default=None,
+                        help="수집 단계 소요 시간(초). run_all_hw_bash_only.sh가 측정 파일에 포함하도록 전달합니다.")
+    args = parser.parse_args(argv)
+
+    if not args.profile:
+        return _run_report(args)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return _run_report(args)
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(args.profile) or '.', exist_ok=True)
+        profiler.dump_stats(args.profile)
+        print(f"\ncProfile 결과가 저장되었습니다: {args.profile} (누적 시간 상위 15개)")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+def _run_report(args):
+    inventory_file_path = args.inventory_file
+    workers = args.workers or os.cpu_count() or 1
+    phases = {}
+    if args.collect_seconds is not None:
+        phases['collect'] = args.collect_seconds
+    parse_stats = {}
     
     print("Python 스크립트 실행 중...")
     
     # 모든 호스트의 하드웨어 정보 파싱
-    all_hosts_hw_data = parse_all_hw_data_files(FETCHED_HW_DATA_DIR, inventory_file_path)
+    with _timed_phase(phases, 'parse'):
+        all_hosts_hw_data = parse_all_hw_data_files(args.raw_data, inventory_file_path,
+                                                    workers=workers, executor=args.executor, verbose=args.verbose,
+                                                    cache_file=None if args.no_cache else args.cache_file,
+                                                    stats=parse_stats)
+
+    # 수집 일정 상태 갱신 (schedule로 일부 호스트만 수집했으면 나머지는 이전 raw 데이터로 합쳐짐)
+    if args.schedule and all_hosts_hw_data:
+        with _timed_phase(phases, 'schedule'):
+            apply_collect_schedule(all_hosts_hw_data, args.raw_data, args.schedule_file)
+
+    # 이전 실행과 비교하여 변경 감지
+    changes = None
+    if not args.no_changes and all_hosts_hw_data:
+        with _timed_phase(phases, 'changes'):
+            try:
+                changes = detect_fleet_changes(all_hosts_hw_data, args.snapshot_file, args.changes_file)
+            except Exception as e:
+                print(f"오류: 변경 감지 중 오류 발생: {e}")
+
+    # 제조사/CPU 모델/OS/BIOS 버전별 자원 요약
+    summary = None
+    if not args.no_summary and all_hosts_hw_data:
+        with _timed_phase(phases, 'summary'):
+            summary = build_fleet_summary(all_hosts_hw_data)
+            try:
+                write_fleet_summary(summary, args.summary_file)
+                print(f"자원 요약이 저장되었습니다: {args.summary_file}")
+            except OSError as e:
+                print(f"오류: 자원 요약 저장 중 오류 발생: {e}")
 
     # HTML 보고서 생성
-    generate_html_report(all_hosts_hw_data, HTML_REPORT_FILE)
+    with _timed_phase(phases, 'html'):
+        generate_html_report(all_hosts_hw_data, HTML_REPORT_FILE, shard_size=args.shard_size, changes=changes,
+                             summary=summary)
     
     # YAML 보고서 생성
-    generate_yaml_report(all_hosts_hw_data, YAML_REPORT_FILE)
+    with _timed_phase(phases, 'yaml'):
+        generate_yaml_report(all_hosts_hw_data, YAML_REPORT_FILE, verbose=args.verbose)
+
+    # JSON Lines / CSV / SQLite 내보내기
+    with _timed_phase(phases, 'exports'):
+        exported_files = export_reports(all_hosts_hw_data, args.export)
+
+    # 실행 이력 저장소에 이번 실행 추가
+    if not args.no_history and all_hosts_hw_data:
+        with _timed_phase(phases, 'history'):
+            try:
+                run_id = record_history(all_hosts_hw_data, args.history_db, inventory_file_path)
+                print(f"실행 이력이 저장되었습니다: {args.history_db} (run_id={run_id})")
+            except Exception as e:
+                print(f"오류: 실행 이력 저장 중 오류 발생: {e}")
+
+    if args.metrics:
+        options = {'inventory_file': inventory_file_path, 'raw_data': args.raw_data, 'workers': workers,
+                   'executor': args.executor, 'cache': not args.no_cache, 'shard_size': args.shard_size, 'export': args.export}
+        metrics = build_run_metrics(all_hosts_hw_data, phases, parse_stats, options)
+        try:
+            write_metrics(metrics, args.metrics)
+            print_metrics_summary(metrics)
+            print(f"측정 결과가 저장되었습니다: {args.metrics}")
+        except OSError as e:
+            print(f"오류: 측정 결과 저장 중 오류 발생: {e}")
     
     print("\n--- 다음 단계를 진행하세요 ---")
     print(f"HTML 보고서가 생성되었습니다: {HTML_REPORT_FILE}")
     print(f"YAML 보고서가 생성되었습니다: {YAML_REPORT_FILE}")
+    for name, output_file in exported_files.items():
+        print(f"{name.upper()} 내보내기가 생성되었습니다: {output_file}")
     print("이 파일을 웹 브라우저에서 열어 내용을 확인할 수 있습니다.")
+    return 0
+
+# 감시(watch) 모드에서 디렉토리를 다시 확인하는 간격(초). inotify를 쓸 수 없을 때는 이 간격으로 전체를 다시 확인합니다.
+WATCH_INTERVAL = 2.0
+# 첫 변경 후 이 시간(초) 동안 이어지는 변경을 모아 한 번에 반영합니다. (수집기가 여러 파일을 연달아 쓸 때)
+WATCH_DEBOUNCE_SECONDS = 1.0
+# YAML 보고서는 전체를 다시 써야 하므로, 변경이 있을 때 이 간격(초)마다 그리고 종료할 때만 다시 씁니다.
+WATCH_YAML_INTERVAL = 300.0
+
+# inotify(7) 상수 (<sys/inotify.h>)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+# struct inotify_event { int wd; uint32_t mask; uint32_t cookie; uint32_t len; char name[]; }
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+class _PollingWatcher:
+    """
+    inotify를 사용할 수 없을 때의 감시자. wait()는 interval초를 기다린 뒤 항상 전체를 다시 확인하도록 알립니다.
+    """
+    method = 'polling'
+    event_driven = False
+
+    def __init__(self, base_dir, interval):
+        self.base_dir = base_dir
+        self.interval = interval
+
+    def wait(self, timeout):
+        time.sleep(max(0.0, timeout))
+        return set(), True
+
+    def close(self):
+        pass
+
+class _InotifyWatcher:
+    """
+    ctypes로 호출한 inotify로 base_dir의 파일 쓰기 완료/이동/삭제를 감시합니다.
+    wait()는 (바뀐 파일 이름 집합, 디렉토리 전체를 다시 확인해야 하는지)를 반환합니다.
+    디렉토리가 지워지면(run_all_hw_bash_only.sh의 rm -rf 등) 다시 생길 때까지 interval초마다 감시를 다시 시도합니다.
+    """
+    method = 'inotify'
+    event_driven = True
+
+    def __init__(self, base_dir, interval, libc):
+        self.base_dir = base_dir
+        self.interval = interval
+        self.libc = libc
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.wd = None
+        self._add_watch()
+
+    def _add_watch(self):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(self.base_dir), _INOTIFY_WATCH_MASK)
+        self.wd = wd if wd >= 0 else None
+        return self.wd is not None
+
+    def wait(self, timeout):
+        if self.wd is None:
+            time.sleep(max(0.0, min(timeout, self.interval)))
+            return set(), self._add_watch()
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return set(), False
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return set(), False
+
+        names, rescan_all = set(), False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                rescan_all = True # 이벤트 큐가 넘쳐 일부 이벤트가 버려졌습니다.
+            elif mask & (_IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED):
+                if wd == self.wd:
+                    if mask & _IN_MOVE_SELF:
+                        self.libc.inotify_rm_watch(self.fd, wd)
+                    self.wd = None
+                    rescan_all = True
+            elif name:
+                names.add(os.fsdecode(name))
+        return names, rescan_all
+
+    def close(self):
+        os.close(self.fd)
+
+def open_raw_dir_watcher(base_dir, interval=WATCH_INTERVAL, polling=False):
+    """
+    raw 파일 디렉토리 감시자를 반환합니다. 가능하면 inotify를, 그렇지 않으면(리눅스가 아니거나 polling=True) 주기적 확인을 사용합니다.
+    """
+    if not polling:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            return _InotifyWatcher(base_dir, interval, libc)
+        except (OSError, AttributeError) as e:
+            print(f"정보: inotify를 사용할 수 없어 {interval}초 간격으로 디렉토리를 확인합니다: {e}")
+    return _PollingWatcher(base_dir, interval)
+
+def _file_signature(file_path):
+    """
+    일반 파일의 (크기, mtime_ns)를 반환합니다. 파일이 없으면 None을 반환합니다.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns) if stat.S_ISREG(st.st_mode) else None
+
+def scan_raw_file_signatures(base_dir, hosts):
+    """
+    base_dir를 한 번 나열하여 hosts에 속한 호스트의 {호스트: raw 파일의 (크기, mtime_ns)}를 반환합니다.
+    """
+    try:
+        raw_files = scan_raw_hw_files(base_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+    signatures = {}
+    for host, entry in raw_files.items():
+        if host in hosts:
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            signatures[host] = (st.st_size, st.st_mtime_ns)
+    return signatures
+
+def find_changed_hosts(base_dir, signatures, hosts, names=(), rescan_all=False):
+    """
+    감시자가 알려 준 파일 이름(names)만, 또는 rescan_all이면 디렉토리 전체를 확인하여
+    raw 파일이 새로 생기거나, (크기, mtime)이 바뀌거나, 사라진 호스트의 집합을 반환합니다. signatures는 여기서 갱신됩니다.
+    """
+    if rescan_all:
+        current = scan_raw_file_signatures(base_dir, hosts)
+        changed = {host for host, signature in current.items() if signatures.get(host) != signature}
+        changed.update(host for host in signatures if host not in current)
+    else:
+        current, changed = {}, set()
+        suffix_len = len(RAW_FILE_SUFFIX)
+        for name in names:
+            host = name[:-suffix_len]
+            if not name.endswith(RAW_FILE_SUFFIX) or host not in hosts:
+                continue
+            signature = _file_signature(os.path.join(base_dir, name))
+            if signature is not None:
+                current[host] = signature
+            if signatures.get(host) != signature:
+                changed.add(host)
+    for host in changed:
+        if host in current:
+            signatures[host] = current[host]
+        else:
+            signatures.pop(host, None)
+    return changed
+
+def reparse_changed_hosts(all_hosts_hw_data, base_dir, changed_hosts, signatures, workers=1, executor='process', verbose=False,
+                          stats=None):
+    """
+    바뀐 호스트만 다시 파싱하여 all_hosts_hw_data를 갱신합니다. raw 파일이 사라진 호스트는 'Collection Failed'가 됩니다.
+    parse_all_hw_data_files와 같은 파싱 단계(_store_parsed_records)를 사용하므로, 결과는 같은 디렉토리를 전체 처리한 것과 같습니다.
+    stats가 주어지면 (parse_all_hw_data_files의 stats) 바뀐 호스트의 parse_seconds와 수집 메타데이터(collect)를 갱신합니다.
+    """
+    stats = {} if stats is None else stats
+    parse_seconds, collect_meta = stats.setdefault('parse_seconds', {}), stats.setdefault('collect', {})
+    hosts_to_parse = []
+    for host in changed_hosts:
+        if host in signatures:
+            hosts_to_parse.append((host, os.path.join(base_dir, host + RAW_FILE_SUFFIX)))
+        else:
+            all_hosts_hw_data[host] = HostRecord(host, 'Collection Failed')
+            parse_seconds.pop(host, None)
+            collect_meta.pop(host, None)
+    for _ in _store_parsed_records(all_hosts_hw_data, hosts_to_parse, workers, executor, verbose, parse_seconds, collect_meta):
+        pass
+
+def _watch_fleet_changes(all_hosts_hw_data, args, change_baseline):
+    """
+    감시 모드의 변경 내역을 계산하여 changes_file에 기록합니다. 기본 모드가 마지막으로 저장한 스냅샷과
+    현재 데이터를 비교하므로, 같은 시점에 기본 모드를 실행한 것과 같은 변경 내역이 나옵니다.
+    스냅샷은 저장하지 않으며, change_baseline({'signature', 'snapshot'})에 읽어 둔 스냅샷은 파일이 바뀔 때만 다시 읽습니다.
+    """
+    signature = _file_signature(args.snapshot_file)
+    if 'snapshot' not in change_baseline or change_baseline['signature'] != signature:
+        change_baseline['signature'] = signature
+        change_baseline['snapshot'] = load_fleet_snapshot(args.snapshot_file)
+    changes, _ = compute_fleet_changes(change_baseline['snapshot'], all_hosts_hw_data)
+    if changes is not None:
+        write_fleet_changes(changes, args.changes_file)
+    return changes
+
+def _write_watch_reports(all_hosts_hw_data, args, export_line_caches, change_baseline, updated_hosts=None):
+    """
+    감시 모드의 보고서를 씁니다. updated_hosts가 None이면 전체를, 주어지면 그 호스트가 있는 HTML 페이지와
+    색인 페이지, 검색 인덱스, 변경 내역, 자원 요약, 내보내기 파일의 해당 호스트만 다시 씁니다.
+    (YAML 보고서는 호출하는 쪽에서 따로 씁니다)
+    """
+    changes = None
+    if not args.no_changes:
+        try:
+            changes = _watch_fleet_changes(all_hosts_hw_data, args, change_baseline)
+        except Exception as e:
+            print(f"오류: 변경 감지 중 오류 발생: {e}")
+    summary = None
+    if not args.no_summary:
+        summary = build_fleet_summary(all_hosts_hw_data)
+        try:
+            write_fleet_summary(summary, args.summary_file)
+        except OSError as e:
+            print(f"오류: 자원 요약 저장 중 오류 발생: {e}")
+    generate_html_report(all_hosts_hw_data, HTML_REPORT_FILE, shard_size=args.shard_size, changes=changes,
+                         summary=summary, only_hosts=updated_hosts)
+    update_exports(all_hosts_hw_data, args.export, updated_hosts, export_line_caches)
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def run_watch(argv):
+    """
+    watch 모드: 전체 보고서를 한 번 만든 뒤 raw 파일 디렉토리를 감시하며, raw 파일이 바뀐 호스트만 다시 파싱하여
+    HTML 보고서의 해당 페이지, 검색 인덱스, 변경 내역, 자원 요약, 내보내기 파일에 반영합니다. 파싱 결과는 메모리에 유지합니다.
+    인벤토리 파일이 바뀌면 전체를 다시 만듭니다. 변경 감지의 스냅샷과 실행 이력은 기본 모드에서만 저장합니다.
+    """
+    parser = argparse.ArgumentParser(prog="process_hw_info_bash_only.py watch",
+                                     description="raw 파일 디렉토리를 감시하며 바뀐 호스트만 보고서에 반영")
+    parser.add_argument('inventory_file', help="Ansible 인벤토리 파일 경로")
+    parser.add_argument('--raw-data', default=FETCHED_HW_DATA_DIR,
+                        help=f"감시할 raw 파일 디렉토리 (기본값: {FETCHED_HW_DATA_DIR})")
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                        help=f"디렉토리 확인 간격(초), inotify를 쓸 수 없을 때의 확인 주기 (기본값: {WATCH_INTERVAL})")
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE_SECONDS,
+                        help=f"변경을 모아서 반영할 시간(초) (기본값: {WATCH_DEBOUNCE_SECONDS})")
+    parser.add_argument('--poll', action='store_true', help="inotify 대신 주기적으로 디렉토리 전체를 확인")
+    parser.add_argument('--yaml-interval', type=float, default=WATCH_YAML_INTERVAL,
+                        help=f"변경이 있을 때 YAML 보고서를 다시 쓰는 최소 간격(초) (기본값: {WATCH_YAML_INTERVAL})")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="파싱에 사용할 worker 수 (0: CPU 개수, 1: 순차 처리, 기본값: 0)")
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process',
+                        help="병렬 파싱 방식 (기본값: process)")
+    parser.add_argument('--verbose', action='store_true', help="호스트별 파싱 진행 상황을 출력")
+    parser.add_argument('--cache-file', default=PARSE_CACHE_FILE,
+                        help=f"시작할 때 사용할 파싱 결과 캐시 파일 경로 (기본값: {PARSE_CACHE_FILE})")
+    parser.add_argument('--no-cache', action='store_true', help="파싱 캐시를 사용하지 않고 모든 파일을 다시 파싱")
+    parser.add_argument('--shard-size', type=int, default=HTML_SHARD_SIZE,
+                        help=f"HTML 보고서의 페이지당 호스트 수 (0: 한 페이지, 기본값: {HTML_SHARD_SIZE})")
+    parser.add_argument('--export', type=_parse_export_formats, default=[],
+                        help=f"함께 갱신할 내보내기 형식, 쉼표로 구분 ({', '.join(EXPORTERS)})")
+    parser.add_argument('--snapshot-file', default=SNAPSHOT_FILE,
+                        help=f"변경 감지에서 비교할 기본 모드의 마지막 실행 스냅샷 경로 (기본값: {SNAPSHOT_FILE})")
+    parser.add_argument('--changes-file', default=CHANGES_FILE,
+                        help=f"변경 내역 JSON 파일 경로 (기본값: {CHANGES_FILE})")
+    parser.add_argument('--no-changes', action='store_true', help="변경 감지를 하지 않음")
+    parser.add_argument('--summary-file', default=SUMMARY_FILE,
+                        help=f"자원 요약 JSON 파일 경로 (기본값: {SUMMARY_FILE})")
+    parser.add_argument('--no-summary', action='store_true', help="자원 요약을 만들지 않음")
+    parser.add_argument('--schedule-file', default=SCHEDULE_FILE,
+                        help=f"수집 일정 상태 파일 경로 (기본값: {SCHEDULE_FILE})")
+    parser.add_argument('--schedule', action='store_true',
+                        help="바뀐 호스트마다 수집 일정 상태를 갱신하고 마지막 수집에 실패한 호스트를 보고서에 반영")
+    args = parser.parse_args(argv)
+    if is_hw_pack(args.raw_data):
+        parser.error(f"watch는 raw 파일 디렉토리만 감시할 수 있습니다. ({HW_PACK_SUFFIX} 파일은 기본 모드나 serve에서 사용하세요)")
+    raw_dir = args.raw_data
+    workers = args.workers or os.cpu_count() or 1
+    export_line_caches = {} # {내보내기 형식: {호스트: 줄}}
+    change_baseline = {} # 변경 감지에서 비교할 기본 모드의 스냅샷 (_watch_fleet_changes)
+    parse_stats = {} # 호스트별 파싱 시간과 수집 메타데이터 (바뀐 호스트를 다시 파싱할 때마다 갱신)
+
+    def build_all():
+        # 감시를 먼저 시작하고 파일 상태를 기록한 뒤 파싱하므로, 그 사이의 변경도 다음 확인에서 반영됩니다.
+        hosts = set(parse_inventory_hosts(args.inventory_file))
+        signatures = scan_raw_file_signatures(raw_dir, hosts)
+        stats = {}
+        all_hosts_hw_data = parse_all_hw_data_files(raw_dir, args.inventory_file,
+                                                    workers=workers, executor=args.executor, verbose=args.verbose,
+                                                    cache_file=None if args.no_cache else args.cache_file, stats=stats)
+        if all_hosts_hw_data:
+            parse_stats.clear()
+            parse_stats.update(stats)
+            if args.schedule:
+                apply_collect_schedule(all_hosts_hw_data, raw_dir, args.schedule_file)
+            export_line_caches.clear()
+            _write_watch_reports(all_hosts_hw_data, args, export_line_caches, change_baseline)
+            generate_yaml_report(all_hosts_hw_data, YAML_REPORT_FILE, verbose=args.verbose)
+        return all_hosts_hw_data, signatures
+
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    sys.stdout.reconfigure(line_buffering=True) # 로그 파일로 출력을 돌려도 갱신 내역이 바로 기록되도록 합니다.
+    watcher = open_raw_dir_watcher(raw_dir, args.interval, polling=args.poll)
+    inventory_signature = _file_signature(args.inventory_file)
+    all_hosts_hw_data, signatures = build_all()
+    if not all_hosts_hw_data:
+        watcher.close()
+        return 1
+    print(f"\n'{raw_dir}' 감시를 시작합니다. ({watcher.method}, 종료: Ctrl+C)")
+
+    yaml_dirty = False
+    yaml_written_at = time.monotonic()
+    try:
+        while True:
+            names, rescan_all = watcher.wait(args.interval)
+            if watcher.event_driven and (names or rescan_all):
+                deadline = time.monotonic() + args.debounce
+                while (remaining := deadline - time.monotonic()) > 0:
+                    more_names, more_rescan = watcher.wait(remaining)
+                    names |= more_names
+                    rescan_all = rescan_all or more_rescan
+
+            current_inventory_signature = _file_signature(args.inventory_file)
+            if current_inventory_signature != inventory_signature:
+                print(f"\n인벤토리 파일 '{args.inventory_file}'이(가) 바뀌어 전체 보고서를 다시 만듭니다.")
+                inventory_signature = current_inventory_signature
+                rebuilt, rebuilt_signatures = build_all()
+                if rebuilt:
+                    all_hosts_hw_data, signatures = rebuilt, rebuilt_signatures
+                    yaml_dirty = False
+                    yaml_written_at = time.monotonic()
+                continue
+
+            if names or rescan_all:
+                started = time.perf_counter()
+                changed = find_changed_hosts(raw_dir, signatures, all_hosts_hw_data, names, rescan_all)
+                if changed:
+                    reparse_changed_hosts(all_hosts_hw_data, raw_dir, changed, signatures,
+                                          workers=workers, executor=args.executor, verbose=args.verbose, stats=parse_stats)
+                    if args.schedule:
+                        apply_collect_schedule(all_hosts_hw_data, raw_dir, args.schedule_file, hosts=changed)
+                    updated_hosts = [host for host in all_hosts_hw_data if host in changed]
+                    _write_watch_reports(all_hosts_hw_data, args, export_line_caches, change_baseline, updated_hosts)
+                    yaml_dirty = True
+                    listed = ', '.join(f"{host}({all_hosts_hw_data[host].status})" for host in updated_hosts[:10])
+                    more = f" 외 {len(updated_hosts) - 10}개" if len(updated_hosts) > 10 else ""
+                    print(f"[{time.strftime('%H:%M:%S')}] 호스트 {len(updated_hosts)}개 갱신 "
+                          f"({time.perf_counter() - started:.2f}초): {listed}{more}")
+
+            if yaml_dirty and time.monotonic() - yaml_written_at >= args.yaml_interval:
+                generate_yaml_report(all_hosts_hw_data, YAML_REPORT_FILE, verbose=args.verbose)
+                yaml_dirty = False
+                yaml_written_at = time.monotonic()
+    except KeyboardInterrupt:
+        print("\n감시를 종료합니다.")
+    finally:
+        watcher.close()
+    if yaml_dirty:
+        generate_yaml_report(all_hosts_hw_data, YAML_REPORT_FILE, verbose=args.verbose)
+    return 0
+
+# 검색 서비스(serve)의 기본 주소. 외부에 열려면 --bind로 지정합니다.
+SERVE_BIND = "127.0.0.1"
+SERVE_PORT = 8080
+SERVE_DEFAULT_LIMIT = 50
+SERVE_MAX_LIMIT = 1000
+
+def _join_known(*values):
+    return ' '.join(value for value in values if value != 'N/A') or 'N/A'
+
+# 검색 필드 -> 호스트(인벤토리 호스트명, HostRecord)에서 색인할 값들. 값은 소문자로 색인하며 'N/A'는 색인하지 않습니다.
+SEARCH_FIELDS = {
+    'hostname': lambda host, hw: (host, hw.hostname),
+    'ip': lambda host, hw: hw.ip_addresses,
+    'serial': lambda host, hw: (hw.system_serial_number, hw.board_serial),
+    'cpu_model': lambda host, hw: (hw.cpu_model,),
+    'vendor': lambda host, hw: (hw.system_manufacturer, hw.board_manufacturer, hw.bios_vendor),
+    'bios_version': lambda host, hw: (hw.bios_version,),
+    'os': lambda host, hw: (_join_known(hw.os_distribution, hw.os_version), hw.os_kernel),
+    'status': lambda host, hw: (hw.status,),
+}
+# q 검색어가 필드를 지정하지 않았을 때 찾는 필드 (status는 필터로만 사용)
+SEARCH_DEFAULT_FIELDS = [field for field in SEARCH_FIELDS if field != 'status']
+SEARCH_MATCH_MODES = ('prefix', 'substring', 'exact')
+
+class FleetSearchIndex:
+    """
+    파싱된 fleet을 메모리에 두고 SEARCH_FIELDS마다 역색인({소문자 값: 호스트 번호 또는 번호 리스트})을 만듭니다.
+    호스트 번호는 인벤토리 순서이며, 앞부분 검색은 정렬된 값 목록에서 bisect로 찾습니다.
+    부분 문자열 검색은 필드의 값을 '\0'으로 이어 붙인 문자열 하나에서 str.find로 찾은 뒤 위치로 값을 찾습니다.
+    한 번 만든 뒤에는 바뀌지 않으므로 여러 스레드에서 동시에 검색해도 됩니다.
+    """
+    def __init__(self, all_hosts_hw_data):
+        self.all_hosts_hw_data = all_hosts_hw_data
+        self.hosts = list(all_hosts_hw_data)
+        self.host_ids = {host: i for i, host in enumerate(self.hosts)}
+        self.postings = {field: {} for field in SEARCH_FIELDS}
+        self.labels = {field: {} for field in SEARCH_FIELDS} # 소문자로 바뀐 값의 원래 표기
+        for i, (host, hw) in enumerate(all_hosts_hw_data.items()):
+            for field, get_values in SEARCH_FIELDS.items():
+                postings, labels = self.postings[field], self.labels[field]
+                for value in get_values(host, hw):
+                    if value == 'N/A' or not value:
+                        continue
+                    key = value.lower()
+                    if key != value:
+                        labels.setdefault(key, value)
+                    else:
+                        key = value
+                    ids = postings.get(key)
+                    # 대부분의 값(호스트명, IP, 시리얼)은 호스트 하나에만 있으므로 번호 하나로 저장합니다.
+                    if ids is None:
+                        postings[key] = i
+                    elif isinstance(ids, int):
+                        if ids != i:
+                            postings[key] = [ids, i]
+                    elif ids[-1] != i:
+                        ids.append(i)
+        self.sorted_keys = {field: sorted(postings) for field, postings in self.postings.items()}
+        self.key_blobs, self.key_offsets = {}, {}
+        for field, keys in self.sorted_keys.items():
+            self.key_blobs[field] = '\0'.join(keys)
+            self.key_offsets[field] = offsets = array('q')
+            position = 0
+            for key in keys:
+                offsets.append(position)
+                position += len(key) + 1
+        self.summary = build_fleet_summary(all_hosts_hw_data) if all_hosts_hw_data else None
+
+    def _matching_keys(self, field, term, match):
+        if match == 'exact':
+            return [term] if term in self.postings[field] else []
+        keys = self.sorted_keys[field]
+        if match == 'substring':
+            if not term or '\0' in term:
+                return keys if not term else []
+            blob, offsets = self.key_blobs[field], self.key_offsets[field]
+            matched = []
+            position = blob.find(term)
+            while position >= 0:
+                i = bisect.bisect_right(offsets, position) - 1
+                matched.append(keys[i])
+                if i + 1 == len(keys):
+                    break
+                position = blob.find(term, offsets[i + 1])
+            return matched
+        start = bisect.bisect_left(keys, term)
+        end = start
+        while end < len(keys) and keys[end].startswith(term):
+            end += 1
+        return keys[start:end]
+
+    def lookup(self, field, term, match='prefix'):
+        """
+        field에서 term과 일치하는(대소문자 무시) 값을 가진 호스트 번호의 집합을 반환합니다.
+        """
+        postings = self.postings[field]
+        ids = set()
+        for key in self._matching_keys(field, term.lower(), match):
+            posting = postings[key]
+            if isinstance(posting, int):
+                ids.add(posting)
+            else:
+                ids.update(posting)
+        return ids
+
+    def search(self, q=None, fields=SEARCH_DEFAULT_FIELDS, match='prefix', filters=()):
+        """
+        q가 fields 중 하나와 일치하고, filters의 (필드, 값들) 조건을 모두 만족하는(같은 필드의 값끼리는 OR, 정확히 일치)
+        호스트 번호를 인벤토리 순서로 반환합니다. q와 filters가 모두 없으면 모든 호스트를 반환합니다.
+        """
+        candidates = None
+        if q:
+            candidates = set().union(*(self.lookup(field, q, match) for field in fields))
+        for field, values in filters:
+            matched = set().union(*(self.lookup(field, value, 'exact') for value in values))
+            candidates = matched if candidates is None else candidates & matched
+        return range(len(self.hosts)) if candidates is None else sorted(candidates)
+
+    def field_values(self, field, prefix='', limit=SERVE_DEFAULT_LIMIT):
+        """
+        field의 값과 그 값을 가진 호스트 수를 호스트 수가 많은 순서로 반환합니다. (prefix로 시작하는 값만)
+        """
+        postings, labels = self.postings[field], self.labels[field]
+        keys = self._matching_keys(field, prefix.lower(), 'prefix') if prefix else self.sorted_keys[field]
+        counts = [(labels.get(key, key), 1 if isinstance(postings[key], int) else len(postings[key])) for key in keys]
+        counts.sort(key=lambda item: (-item[1], item[0]))
+        return counts[:limit]
+
+    def host_document(self, host_id):
+        host = self.hosts[host_id]
+        return {'inventory_host': host, **self.all_hosts_hw_data[host].to_dict()}
+
+def _query_int(params, name, default, maximum=None):
+    value = params.get(name, [str(default)])[-1]
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"'{name}'은(는) 정수여야 합니다: {value}")
+    if number < 0:
+        raise ValueError(f"'{name}'은(는) 0 이상이어야 합니다: {value}")
+    return min(number, maximum) if maximum is not None else number
+
+def search_fleet(index, params):
+    """
+    GET /hosts 요청의 검색 파라미터(parse_qs 결과)로 검색하여 응답 딕셔너리를 반환합니다. 잘못된 파라미터는 ValueError입니다.
+        q: 검색어, field: 검색할 필드(쉼표로 구분, 기본값: status를 제외한 모든 필드), match: prefix|substring|exact
+        <검색 필드>=값: 필터 (여러 번 지정하면 OR), offset, limit: 페이지
+    """
+    started = time.perf_counter()
+    q = params.get('q', [''])[-1].strip()
+    match = params.get('match', ['prefix'])[-1]
+    if match not in SEARCH_MATCH_MODES:
+        raise ValueError(f"지원하지 않는 match: {match} (사용 가능: {', '.join(SEARCH_MATCH_MODES)})")
+    fields = SEARCH_DEFAULT_FIELDS
+    if 'field' in params:
+        fields = [field.strip() for field in params['field'][-1].split(',') if field.strip()]
+    filters = [(field, params[field]) for field in SEARCH_FIELDS if field in params]
+    unknown = [field for field in fields if field not in SEARCH_FIELDS]
+    unknown += [name for name in params if name not in SEARCH_FIELDS and name not in ('q', 'field', 'match', 'offset', 'limit')]
+    if unknown:
+        raise ValueError(f"지원하지 않는 필드: {', '.join(unknown)} (사용 가능: {', '.join(SEARCH_FIELDS)})")
+    offset = _query_int(params, 'offset', 0)
+    limit = _query_int(params, 'limit', SERVE_DEFAULT_LIMIT, SERVE_MAX_LIMIT)
+
+    host_ids = index.search(q, fields, match, filters)
+    return {
+        'total': len(host_ids),
+        'offset': offset,
+        'limit': limit,
+        'hosts': [index.host_document(host_id) for host_id in host_ids[offset:offset + limit]],
+        'took_ms': round((time.perf_counter() - started) * 1000, 3),
+    }
+
+class FleetRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    검색 서비스의 HTTP JSON API. (GET만 지원)
+        /hosts?q=&field=&match=&<필드>=&offset=&limit=   호스트 검색
+        /hosts/<인벤토리 호스트명>                         호스트 한 대
+        /fields, /fields/<필드>?prefix=&limit=            검색 필드 목록, 필드 값별 호스트 수
+        /summary                                          자원 요약 (hardware_inventory_summary.json과 같은 형식)
+    """
+    server_version = "hwinfo-serve/1"
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = urllib.parse.parse_qs(url.query)
+        parts = [urllib.parse.unquote(part) for part in url.path.split('/') if part]
+        index = self.server.fleet_index
+        try:
+            if parts == ['hosts']:
+                self._send_json(200, search_fleet(index, params))
+            elif len(parts) == 2 and parts[0] == 'hosts':
+                host_id = index.host_ids.get(parts[1])
+                if host_id is None:
+                    self._send_json(404, {'error': f"호스트를 찾을 수 없습니다: {parts[1]}"})
+                else:
+                    self._send_json(200, index.host_document(host_id))
+            elif parts == ['fields']:
+                self._send_json(200, {'fields': {field: len(index.postings[field]) for field in SEARCH_FIELDS},
+                                      'match': list(SEARCH_MATCH_MODES)})
+            elif len(parts) == 2 and parts[0] == 'fields' and parts[1] in SEARCH_FIELDS:
+                values = index.field_values(parts[1], params.get('prefix', [''])[-1],
+                                            _query_int(params, 'limit', SERVE_DEFAULT_LIMIT, SERVE_MAX_LIMIT))
+                self._send_json(200, {'field': parts[1], 'values': [{'value': value, 'hosts': count} for value, count in values]})
+            elif parts == ['summary']:
+                self._send_json(200, index.summary)
+            elif not parts:
+                self._send_json(200, {'hosts': len(index.hosts), 'endpoints': ['/hosts', '/hosts/<host>', '/fields',
+                                                                               '/fields/<field>', '/summary']})
+            else:
+                self._send_json(404, {'error': f"알 수 없는 경로: {url.path}"})
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def load_hosts_from_jsonl(jsonl_file):
+    """
+    JSON Lines 내보내기(--export jsonl) 파일에서 {인벤토리 호스트: HostRecord}를 읽습니다.
+    """
+    all_hosts_hw_data = {}
+    with open(jsonl_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                record = HostRecord.from_dict(data)
+                all_hosts_hw_data[data['inventory_host']] = record
+    return all_hosts_hw_data
+
+def run_serve(argv):
+    """
+    serve 모드: 파싱한 fleet(raw 파일 또는 마지막 JSON Lines 내보내기)을 메모리에 올리고 역색인을 만든 뒤,
+    검색/조회용 HTTP JSON API(FleetRequestHandler)를 제공합니다.
+    """
+    parser = argparse.ArgumentParser(prog="process_hw_info_bash_only.py serve",
+                                     description="파싱된 하드웨어 정보를 검색하는 로컬 HTTP JSON API")
+    parser.add_argument('inventory_file', nargs='?', help="Ansible 인벤토리 파일 경로 (raw 파일을 파싱하여 불러옴)")
+    parser.add_argument('--from-export', metavar='JSONL', help="raw 파일 대신 JSON Lines 내보내기 파일에서 불러옴")
+    parser.add_argument('--raw-data', default=FETCHED_HW_DATA_DIR,
+                        help=f"raw 파일 디렉토리 또는 {HW_PACK_SUFFIX} 파일 (기본값: {FETCHED_HW_DATA_DIR})")
+    parser.add_argument('--bind', default=SERVE_BIND, help=f"접속을 받을 주소 (기본값: {SERVE_BIND})")
+    parser.add_argument('--port', type=int, default=SERVE_PORT, help=f"포트 (기본값: {SERVE_PORT})")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="파싱에 사용할 worker 수 (0: CPU 개수, 1: 순차 처리, 기본값: 0)")
+    parser.add_argument('--cache-file', default=PARSE_CACHE_FILE,
+                        help=f"파싱 결과 캐시 파일 경로 (기본값: {PARSE_CACHE_FILE})")
+    parser.add_argument('--no-cache', action='store_true', help="파싱 캐시를 사용하지 않고 모든 파일을 다시 파싱")
+    parser.add_argument('--schedule-file', default=SCHEDULE_FILE,
+                        help=f"수집 일정 상태 파일 경로 (기본값: {SCHEDULE_FILE})")
+    parser.add_argument('--schedule', action='store_true',
+                        help="수집 일정 상태를 갱신하고 마지막 수집에 실패한 호스트를 검색 결과에 반영 (raw 파일에서 불러올 때)")
+    parser.add_argument('--verbose', action='store_true', help="요청마다 접속 로그를 출력")
+    args = parser.parse_args(argv)
+    if bool(args.inventory_file) == bool(args.from_export):
+        parser.error("인벤토리 파일 또는 --from-export 중 하나를 지정하세요.")
+    if args.schedule and args.from_export:
+        parser.error("--schedule은 raw 파일에서 불러올 때만 사용할 수 있습니다. (내보내기에는 이미 반영되어 있음)")
+
+    started = time.perf_counter()
+    if args.from_export:
+        try:
+            all_hosts_hw_data = load_hosts_from_jsonl(args.from_export)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"오류: 내보내기 파일 '{args.from_export}'을(를) 읽을 수 없습니다: {e}")
+            return 1
+    else:
+        all_hosts_hw_data = parse_all_hw_data_files(args.raw_data, args.inventory_file,
+                                                    workers=args.workers or os.cpu_count() or 1,
+                                                    cache_file=None if args.no_cache else args.cache_file)
+        if all_hosts_hw_data and args.schedule:
+            apply_collect_schedule(all_hosts_hw_data, args.raw_data, args.schedule_file)
+    if not all_hosts_hw_data:
+        print("오류: 불러온 호스트가 없습니다.")
+        return 1
+    index = FleetSearchIndex(all_hosts_hw_data)
+    print(f"호스트 {len(index.hosts)}개를 불러와 색인했습니다. ({time.perf_counter() - started:.2f}초)")
+
+    server = http.server.ThreadingHTTPServer((args.bind, args.port), FleetRequestHandler)
+    server.fleet_index = index
+    server.verbose = args.verbose
+    print(f"검색 서비스: http://{args.bind}:{server.server_address[1]}/hosts?q=... (종료: Ctrl+C)")
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n검색 서비스를 종료합니다.")
+    finally:
+        server.server_close()
+    return 0
+
+def run_pack(argv):
+    """
+    pack 모드: fetched_hw_data의 raw 파일들을 pack 파일 하나에 압축하여 추가하거나, pack을 조회/색인 재생성합니다.
+    """
+    parser = argparse.ArgumentParser(prog="process_hw_info_bash_only.py pack",
+                                     description="raw 하드웨어 데이터 파일을 압축된 pack 파일로 묶기")
+    parser.add_argument('source_dir', nargs='?', default=FETCHED_HW_DATA_DIR,
+                        help=f"묶을 *_raw_hw.txt 파일이 있는 디렉토리 (기본값: {FETCHED_HW_DATA_DIR})")
+    parser.add_argument('--output', help=f"추가할 pack 파일 (기본값: {PACK_DIR}hw_raw_<날짜-시각>{HW_PACK_SUFFIX})")
+    parser.add_argument('--compression', choices=list(PACK_COMPRESSIONS), default='deflate',
+                        help="레코드 압축 방식 (기본값: deflate)")
+    parser.add_argument('--remove-files', action='store_true', help="pack에 추가한 뒤 원본 raw 파일을 삭제")
+    parser.add_argument('--list', metavar='PACK', help="pack에 들어 있는 호스트별 원문/압축 크기를 출력")
+    parser.add_argument('--cat', nargs=2, metavar=('PACK', 'HOST'), help="pack에서 호스트의 raw 파일 내용을 출력")
+    parser.add_argument('--reindex', metavar='PACK', help="pack을 처음부터 훑어 색인 파일을 다시 만듦")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.reindex:
+            with open(args.reindex, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if buffer[:len(_PACK_MAGIC)] != _PACK_MAGIC:
+                    raise ValueError(f"pack 파일이 아닙니다: {args.reindex}")
+                records, end = _scan_pack_records(buffer)
+                write_hw_pack_index(args.reindex, {record.host: record.offset for record in records}, len(buffer))
+            damaged = f", 끝부분 {os.path.getsize(args.reindex) - end}바이트 손상" if end < os.path.getsize(args.reindex) else ""
+            print(f"색인을 다시 만들었습니다: {_pack_index_path(args.reindex)} (레코드 {len(records)}개{damaged})")
+            return 0
+        if args.list:
+            pack = HwPack(args.list)
+            columns = ['host', 'raw_bytes', 'packed_bytes', 'mtime']
+            rows = [[record.host, record.raw_len, record.data_len,
+                     time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.mtime_ns / 1e9))] for record in pack.records()]
+            _print_table(columns, rows)
+            print(f"\n호스트 {len(rows)}개, 원문 {sum(row[1] for row in rows)} bytes, pack {len(pack.buffer)} bytes")
+            return 0
+        if args.cat:
+            pack = HwPack(args.cat[0])
+            record = pack.find(args.cat[1])
+            if record is None:
+                print(f"오류: pack에 호스트 '{args.cat[1]}'의 레코드가 없습니다.")
+                return 1
+            sys.stdout.write(pack.read(record).decode('utf-8'))
+            return 0
+
+        output = args.output or os.path.join(PACK_DIR, f"hw_raw_{time.strftime('%Y%m%d-%H%M%S')}{HW_PACK_SUFFIX}")
+        if not is_hw_pack(output):
+            print(f"오류: pack 파일 이름은 '{HW_PACK_SUFFIX}'로 끝나야 합니다: {output}")
+            return 1
+        files, raw_bytes, packed_bytes = pack_raw_hw_files(args.source_dir, output, args.compression, args.remove_files)
+    except (OSError, ValueError) as e:
+        print(f"오류: {e}")
+        return 1
+    ratio = f", {raw_bytes / packed_bytes:.1f}배 압축" if packed_bytes else ""
+    print(f"raw 파일 {files}개를 pack에 추가했습니다: {output} (원문 {raw_bytes} bytes -> {packed_bytes} bytes{ratio})")
+    return 0
+
+def run_bench_parse(argv):
+    """
+    bench-parse 모드: raw 파일(또는 디렉토리 안의 *_raw_hw.txt)의 파싱 처리량을 측정합니다.
+    """
+    parser = argparse.ArgumentParser(prog="process_hw_info_bash_only.py bench-parse",
+                                     description="raw 하드웨어 데이터 파싱 처리량 측정")
+    parser.add_argument('paths', nargs='+', help="raw 파일 또는 *_raw_hw.txt 파일이 있는 디렉토리")
+    parser.add_argument('--repeat', type=int, default=3, help="반복 횟수 (가장 빠른 회차 기준, 기본값: 3)")
+    args = parser.parse_args(argv)
+
+    file_paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            file_paths.extend(sorted(entry.path for entry in os.scandir(path)
+                                     if entry.is_file() and entry.name.endswith('_raw_hw.txt')))
+        else:
+            file_paths.append(path)
+    if not file_paths:
+        print("오류: 측정할 raw 파일이 없습니다.")
+        return 1
+
+    result = benchmark_parse_throughput(file_paths, repeat=args.repeat)
+    print(f"파싱 처리량: {result['files']}개 파일, {result['bytes']} bytes, {result['seconds']:.4f}초")
+    print(f"  -> {result['files_per_sec']:.1f} files/s, {result['mb_per_sec']:.2f} MB/s")
+    return 0
+
+# 첫 번째 인자로 선택되는 하위 명령. 그 외의 인자는 기존 방식(인벤토리 경로)으로 처리합니다.
+SUBCOMMANDS = {
+    'query': run_query,
+    'bench-parse': run_bench_parse,
+    'watch': run_watch,
+    'serve': run_serve,
+    'pack': run_pack,
+    'schedule': run_schedule,
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+    return run_report(argv)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,25 @@
 INVENTORY_FILE="inventory.ini"
 ANSIBLE_HW_PLAYBOOK="collect_hw_info_bash_only.yml" # 플레이북 이름
 PYTHON_PROCESS_SCRIPT="process_hw_info_bash_only.py" # Python 스크립트 이름
+PYTHON_COLLECT_SCRIPT="collect_hw_info_async.py" # Python 수집기 (COLLECTOR=python일 때 사용)
+# 수집 방식: ansible(기본값) 또는 python (ssh를 직접 병렬 실행하는 asyncio 수집기)
+COLLECTOR="${COLLECTOR:-ansible}"
 RESULT_DIR="result" # 결과 디렉토리 변수
+# METRICS=1이면 단계별/호스트별 소요 시간을 result/hardware_inventory_metrics.json에 기록하고,
+# PROFILE=1이면 보고서 처리 과정의 cProfile 결과를 result/hardware_inventory_profile.prof에 저장합니다.
+METRICS="${METRICS:-0}"
+PROFILE="${PROFILE:-0}"
+# PACK=1이면 raw 파일을 실행마다 archive/ 아래의 pack 파일(.hwpack) 하나로 묶어 보관하고, 보고서도 그 pack에서 만듭니다.
+PACK="${PACK:-0}"
+PACK_FILE="archive/hw_raw_$(date +%Y%m%d-%H%M%S).hwpack"
+# SCHEDULE=1이면 모든 호스트 대신 실패했거나 마지막 수집 후 SCHEDULE_TTL(기본값 1d)이 지난 호스트만 수집하고,
+# 나머지 호스트는 이전 raw 데이터로 보고서에 합칩니다. (SCHEDULE_MAX_HOSTS로 한 번에 수집할 호스트 수 제한)
+SCHEDULE="${SCHEDULE:-0}"
+SCHEDULE_TARGETS_FILE="$RESULT_DIR/hw_collect_targets.txt"
+if [ "$SCHEDULE" = "1" ] && [ "$PACK" = "1" ]; then
+    # 이전 raw 데이터를 합치려면 실행마다 새 pack이 아니라 같은 pack에 계속 추가해야 합니다.
+    PACK_FILE="archive/hw_raw_schedule.hwpack"
+fi
 
 # HTML 보고서 파일의 경로를 절대 경로로 지정합니다.
 # $(pwd)는 현재 작업 디렉토리의 절대 경로를 반환합니다.
@@ -20,9 +38,11 @@ show_manual_open_message() {
     echo "--------------------------------------------------------------"
 }
 
-# fetched_hw_data 디렉토리 초기화 (이전 실행 결과 제거)
-echo "--- 기존 fetched_hw_data 디렉토리 삭제 (선택 사항) ---"
-rm -rf fetched_hw_data
+# fetched_hw_data 디렉토리 초기화 (이전 실행 결과 제거, SCHEDULE=1이면 이전 raw 데이터를 보고서에 합치므로 유지)
+if [ "$SCHEDULE" != "1" ]; then
+    echo "--- 기존 fetched_hw_data 디렉토리 삭제 (선택 사항) ---"
+    rm -rf fetched_hw_data
+fi
 mkdir -p fetched_hw_data # 새로운 fetched_hw_data 디렉토리 생성
 
 # result 디렉토리 생성
@@ -32,22 +52,6 @@ mkdir -p "$RESULT_DIR" # result 디렉토리 생성
 echo "--- 하드웨어 자산 보고서 생성 프로세스 시작 (Bash 전용 모드) ---"
 echo "경고: SSH 호스트 키 검증이 비활성화됩니다. (StrictHostKeyChecking=no)"
 
-# 1. 원격 서버에서 하드웨어 정보 수집
-echo -e "\n[단계 1/2] 원격 서버에서 하드웨어 정보 수집 중..."
-# ANSIBLE_BECOME_ASK_PASS=true 환경 변수를 설정하여 Ansible이 sudo/su 비밀번호를 물어보도록 합니다.
-ANSIBLE_BECOME_ASK_PASS=true ansible-playbook -i "$INVENTORY_FILE" "$ANSIBLE_HW_PLAYBOOK" --ssh-common-args='-o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null'
-
-# Ansible 플레이북 실행 결과($?)를 확인합니다.
-ANSIBLE_EXIT_CODE=$?
-
-if [ $ANSIBLE_EXIT_CODE -ne 0 ]; then
-    echo "Ansible 플레이북 실행 중 일부 오류가 발생했습니다 (종료 코드: $ANSIBLE_EXIT_CODE)."
-    echo "Python 스크립트가 성공 및 실패한 호스트 정보를 처리합니다."
-fi
-
-# 2. 가져온 하드웨어 데이터를 기반으로 HTML 보고서 생성
-echo -e "\n[단계 2/2] 가져온 하드웨어 데이터를 기반으로 HTML 보고서 생성 중..."
-
 # Python 실행 파일 확인 (python3 우선, 없으면 python 시도)
 PYTHON_EXECUTABLE=""
 if command -v python3 &> /dev/null; then
@@ -59,7 +63,78 @@ else
     exit 1
 fi
 
-"$PYTHON_EXECUTABLE" "$PYTHON_PROCESS_SCRIPT" "$INVENTORY_FILE" # 인벤토리 파일 경로를 인자로 전달
+# 수집 대상 선정: 마지막 수집 상태와 TTL로 다시 수집할 호스트 목록을 만듭니다.
+SKIP_COLLECT=0
+if [ "$SCHEDULE" = "1" ]; then
+    echo -e "\n--- 다시 수집할 호스트 선정 (SCHEDULE=1) ---"
+    SCHEDULE_OPTIONS=(--output "$SCHEDULE_TARGETS_FILE" --ttl "${SCHEDULE_TTL:-1d}" --max-hosts "${SCHEDULE_MAX_HOSTS:-0}")
+    if ! "$PYTHON_EXECUTABLE" "$PYTHON_PROCESS_SCRIPT" schedule "$INVENTORY_FILE" "${SCHEDULE_OPTIONS[@]}"; then
+        echo "오류: 수집 대상 선정에 실패했습니다."
+        exit 1
+    fi
+    if [ ! -s "$SCHEDULE_TARGETS_FILE" ]; then
+        SKIP_COLLECT=1
+    fi
+fi
+
+# 1. 원격 서버에서 하드웨어 정보 수집
+echo -e "\n[단계 1/2] 원격 서버에서 하드웨어 정보 수집 중..."
+COLLECT_STARTED=$(date +%s)
+if [ "$SKIP_COLLECT" = "1" ]; then
+    echo "다시 수집할 호스트가 없습니다. 이전 raw 데이터로 보고서를 만듭니다."
+elif [ "$COLLECTOR" = "python" ]; then
+    # ansible-playbook 대신 같은 수집 스크립트를 ssh로 병렬 실행합니다. (COLLECT_FORKS로 동시 접속 수 조절)
+    COLLECT_OPTIONS=()
+    if [ "$METRICS" = "1" ]; then
+        COLLECT_OPTIONS+=(--metrics "$RESULT_DIR/hardware_collect_metrics.json")
+    fi
+    if [ "$PACK" = "1" ]; then
+        COLLECT_OPTIONS+=(--pack "$PACK_FILE")
+    fi
+    if [ "$SCHEDULE" = "1" ]; then
+        COLLECT_OPTIONS+=(--hosts "$SCHEDULE_TARGETS_FILE")
+    fi
+    "$PYTHON_EXECUTABLE" "$PYTHON_COLLECT_SCRIPT" "$INVENTORY_FILE" --forks "${COLLECT_FORKS:-50}" --ask-become-pass "${COLLECT_OPTIONS[@]}"
+else
+    # ANSIBLE_BECOME_ASK_PASS=true 환경 변수를 설정하여 Ansible이 sudo/su 비밀번호를 물어보도록 합니다.
+    ANSIBLE_OPTIONS=()
+    if [ "$SCHEDULE" = "1" ]; then
+        ANSIBLE_OPTIONS+=(--limit "@$SCHEDULE_TARGETS_FILE")
+    fi
+    ANSIBLE_BECOME_ASK_PASS=true ansible-playbook -i "$INVENTORY_FILE" "$ANSIBLE_HW_PLAYBOOK" --ssh-common-args='-o StrictHostKeyChecking=no -o UserKnownHostsFile=/dev/null' "${ANSIBLE_OPTIONS[@]}"
+fi
+
+# 수집 단계 실행 결과($?)를 확인합니다.
+COLLECT_EXIT_CODE=$?
+COLLECT_SECONDS=$(( $(date +%s) - COLLECT_STARTED ))
+
+if [ "$PACK" = "1" ] && [ "$COLLECTOR" != "python" ] && [ "$SKIP_COLLECT" != "1" ]; then
+    # ansible-playbook이 가져온 raw 파일을 pack으로 묶고 원본 파일은 지웁니다.
+    "$PYTHON_EXECUTABLE" "$PYTHON_PROCESS_SCRIPT" pack fetched_hw_data --output "$PACK_FILE" --remove-files
+fi
+
+if [ $COLLECT_EXIT_CODE -ne 0 ]; then
+    echo "하드웨어 정보 수집 중 일부 오류가 발생했습니다 (종료 코드: $COLLECT_EXIT_CODE)."
+    echo "Python 스크립트가 성공 및 실패한 호스트 정보를 처리합니다."
+fi
+
+# 2. 가져온 하드웨어 데이터를 기반으로 HTML 보고서 생성
+echo -e "\n[단계 2/2] 가져온 하드웨어 데이터를 기반으로 HTML 보고서 생성 중..."
+
+PROCESS_OPTIONS=(--collect-seconds "$COLLECT_SECONDS")
+if [ "$METRICS" = "1" ]; then
+    PROCESS_OPTIONS+=(--metrics)
+fi
+if [ "$PROFILE" = "1" ]; then
+    PROCESS_OPTIONS+=(--profile)
+fi
+if [ "$PACK" = "1" ]; then
+    PROCESS_OPTIONS+=(--raw-data "$PACK_FILE")
+fi
+if [ "$SCHEDULE" = "1" ]; then
+    PROCESS_OPTIONS+=(--schedule) # 이번 수집 결과를 수집 일정 상태에 반영
+fi
+"$PYTHON_EXECUTABLE" "$PYTHON_PROCESS_SCRIPT" "$INVENTORY_FILE" "${PROCESS_OPTIONS[@]}" # 인벤토리 파일 경로를 인자로 전달
 if [ $? -ne 0 ]; then
     echo "오류: Python 스크립트 ($PYTHON_PROCESS_SCRIPT) 실행에 실패했습니다. 클라이언트에 Python이 설치되어 있는지 확인하고 PyYAML 라이브러리 설치 여부를 확인하세요."
     exit 1
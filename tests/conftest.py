@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+# 저장소 최상위의 스크립트(process_hw_info_bash_only.py 등)를 모듈로 import할 수 있도록 경로를 추가합니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 형식 버전 2 raw 파일의 기본 필드 값 (필드 경로 -> 값)
+SAMPLE_FIELDS = {
+    'ip_addresses': '192.0.2.10',
+    'cpu.model': 'Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz',
+    'cpu.logical_cpus': '80',
+    'cpu.cores_per_socket': '20',
+    'cpu.threads_per_core': '2',
+    'system_info.manufacturer': 'Dell Inc.',
+    'system_info.product_name': 'PowerEdge R640',
+    'system_info.serial_number': 'SN-{host}',
+    'mainboard.serial': 'MB-{host}',
+    'bios.vendor': 'Dell Inc.',
+    'bios.version': '2.10.2',
+    'os.distribution': 'Ubuntu',
+    'os.version': '22.04',
+    'os.kernel': '5.15.0-91-generic',
+    'memory_mb': '385000',
+}
+
+
+def raw_hw_text(host, collect=None, **fields):
+    """
+    호스트의 형식 버전 2 raw 파일 내용을 만듭니다. fields는 필드 경로의 '.'을 '__'로 바꾼 키워드로 덮어씁니다.
+    collect는 collect.* 메타데이터 (기본값: 수집 시각 두 개)입니다.
+    """
+    values = dict(SAMPLE_FIELDS)
+    values.update({key.replace('__', '.'): value for key, value in fields.items()})
+    if collect is None:
+        collect = {'started_at': '1767225600.120', 'finished_at': '1767225603.450'}
+    lines = ['---HWINFO:2---', f'hostname={host}']
+    lines += [f'collect.started_at={collect["started_at"]}'] if 'started_at' in collect else []
+    lines += [f'{path}={value.format(host=host)}' for path, value in values.items()]
+    lines += [f'collect.{key}={value}' for key, value in collect.items() if key != 'started_at']
+    lines.append('---END---')
+    return '\n'.join(lines) + '\n'
+
+
+@pytest.fixture
+def fleet(tmp_path):
+    """
+    tmp_path에 인벤토리와 fetched_hw_data를 만드는 함수를 돌려줍니다.
+    fleet({'web01': raw 내용 또는 None(raw 파일 없음), ...}) -> (인벤토리 경로, raw 디렉토리 경로)
+    """
+    raw_dir = tmp_path / 'fetched_hw_data'
+    inventory_file = tmp_path / 'inventory.ini'
+
+    def make(hosts):
+        raw_dir.mkdir(exist_ok=True)
+        inventory_file.write_text('[servers]\n' + ''.join(f'{host}\n' for host in hosts), encoding='utf-8')
+        for host, content in hosts.items():
+            raw_file = raw_dir / f'{host}_raw_hw.txt'
+            if content is None:
+                if raw_file.exists():
+                    raw_file.unlink()
+            else:
+                raw_file.write_text(content, encoding='utf-8')
+        return str(inventory_file), str(raw_dir)
+    return make
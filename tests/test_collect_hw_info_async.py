@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import re
+
+import pytest
+
+import collect_hw_info_async as collector
+
+FAKE_SSH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_ssh')
+SCRIPT = 'echo "---HWINFO:2---"\necho "hostname=$(hostname)"\necho "---END---"\n'
+
+
+def _raw(host):
+    return f"---HWINFO:2---\nhostname={host}\n---END---\n"
+
+
+def _pty(text):
+    return text.replace('\n', '\r\n')
+
+
+@pytest.fixture
+def fake_ssh(tmp_path, monkeypatch):
+    """
+    시나리오를 받아 가짜 ssh 환경 변수를 설정하고, 호출 기록을 읽는 함수를 돌려줍니다.
+    """
+    log_file = tmp_path / 'ssh_calls.jsonl'
+    monkeypatch.setenv('FAKE_SSH_LOG', str(log_file))
+
+    def setup(hosts):
+        scenario_file = tmp_path / 'scenario.json'
+        scenario_file.write_text(json.dumps({'hosts': hosts}), encoding='utf-8')
+        monkeypatch.setenv('FAKE_SSH_SCENARIO', str(scenario_file))
+
+        def calls():
+            if not log_file.exists():
+                return []
+            return [json.loads(line) for line in log_file.read_text(encoding='utf-8').splitlines()]
+        return calls
+    return setup
+
+
+def _options(tmp_path, **overrides):
+    options = argparse.Namespace(ssh_command=FAKE_SSH, output_dir=str(tmp_path / 'fetched_hw_data'), forks=4,
+                                 timeout=10.0, connect_timeout=5, multiplex=False, become_pass=None, sshpass=None,
+                                 pack=None, pack_writer=None)
+    for name, value in overrides.items():
+        setattr(options, name, value)
+    os.makedirs(options.output_dir, exist_ok=True)
+    return options
+
+
+def _collect(hosts, options, inventory_vars=None):
+    return asyncio.run(collector.collect_all(hosts, inventory_vars or {}, SCRIPT, options))
+
+
+def test_build_become_commands_tries_sudo_then_su():
+    commands = collector.build_become_commands(SCRIPT, 'secret')
+    assert [method for method, _, _, _ in commands] == ['sudo', 'su']
+    (_, sudo_command, sudo_stdin, sudo_tty), (_, su_command, su_stdin, su_tty) = commands
+    assert sudo_command.startswith("sudo -S -p '' ") and not sudo_tty
+    assert sudo_stdin == su_stdin == b'secret\n'
+    # su는 pty가 필요하며, 비밀번호를 보내기 전에 echo를 끕니다.
+    assert su_tty and su_command.startswith('stty -echo')
+    encoded = re.search(r'printf %s (\S+) \| base64 -d', su_command).group(1)
+    assert base64.b64decode(encoded).decode('utf-8') == SCRIPT
+    assert 'secret' not in sudo_command + su_command
+
+    (_, sudo_command, sudo_stdin, _), _ = collector.build_become_commands(SCRIPT, None)
+    assert sudo_command.startswith('sudo -n ') and sudo_stdin == b''
+
+
+@pytest.mark.parametrize('output, expected', [
+    (_pty(_raw('web01')), _raw('web01')),
+    (b'Password: ' + _pty(_raw('web01')).encode(), _raw('web01')),
+    # 로그인 배너에 '---'가 있어도 헤더 줄부터 남깁니다.
+    (_pty('--- Authorized use only ---\nPassword: secret\n' + _raw('web01')).encode(), _raw('web01')),
+    # stty -echo 전에 되돌아온 비밀번호 줄은 헤더 뒤에 있어도 제거합니다.
+    (_pty('---HWINFO:2---\nsecret\nhostname=web01\n---END---\n').encode(), _raw('web01')),
+    (b'---HOST:web01---\nCPU\n', '---HOST:web01---\nCPU\n'),
+    (b'sudo: a password is required\n', 'sudo: a password is required\n'),
+])
+def test_clean_collected_output(output, expected):
+    if isinstance(output, str):
+        output = output.encode()
+    assert collector.clean_collected_output(output, 'secret') == expected
+
+
+def test_collect_all_falls_back_to_su_and_strips_password_echo(tmp_path, fake_ssh):
+    calls = fake_ssh({
+        'web01': {'sudo': {'stdout': _raw('web01'), 'password': 'secret'}},
+        'web02': {'sudo': {'stderr': 'web02 is not in the sudoers file.\n', 'exit': 1},
+                  'su': {'stdout': _pty('Password: {stdin}\n' + _raw('web02')), 'password': 'secret'}},
+        'web03': {'sudo': {'stderr': 'sudo: 3 incorrect password attempts\n', 'exit': 1},
+                  'su': {'stdout': 'Password: ', 'password': 'other'}},
+    })
+    options = _options(tmp_path, become_pass='secret')
+    results = _collect(['web01', 'web02', 'web03', 'down'], options)
+
+    assert [(r['host'], r['status'], r['method']) for r in results] == [
+        ('web01', 'collected', 'sudo'), ('web02', 'collected', 'su'), ('web03', 'failed', None), ('down', 'failed', None)]
+    assert 'Authentication failure' in results[2]['error']
+    assert 'Connection refused' in results[3]['error']
+    # ssh 접속 실패(255)는 su를 다시 시도하지 않습니다.
+    assert [call['method'] for call in calls() if call['host'] == 'down'] == ['sudo']
+    assert [r['connected'] for r in results] == [True, True, True, False]
+
+    for host in ('web01', 'web02'):
+        with open(os.path.join(options.output_dir, f'{host}_raw_hw.txt'), encoding='utf-8') as f:
+            content = f.read()
+        assert content.startswith(f'---HWINFO:2---\nhostname={host}\n')
+        assert content.endswith('---END---\n')
+        assert 'secret' not in content and 'Password' not in content and '\r' not in content
+    assert not os.path.exists(os.path.join(options.output_dir, 'web03_raw_hw.txt'))
+
+
+def test_collect_all_timeout(tmp_path, fake_ssh):
+    fake_ssh({'slow': {'sudo': {'stdout': _raw('slow'), 'sleep': 5}}})
+    results = _collect(['slow'], _options(tmp_path, timeout=0.5))
+    assert results[0]['status'] == 'timeout'
+    assert results[0]['elapsed'] < 4
+
+
+def test_collect_all_keeps_host_order_within_forks(tmp_path, fake_ssh):
+    hosts = [f'node{i:02d}' for i in range(6)]
+    # 뒤쪽 호스트가 먼저 끝나도 결과는 입력 순서를 따릅니다.
+    calls = fake_ssh({host: {'sudo': {'stdout': _raw(host), 'sleep': 0.05 * (6 - i)}} for i, host in enumerate(hosts)})
+    results = _collect(hosts, _options(tmp_path, forks=2))
+
+    assert [result['host'] for result in results] == hosts
+    assert all(result['status'] == 'collected' for result in results)
+    events = sorted([(call['start'], 1) for call in calls()] + [(call['end'], -1) for call in calls()])
+    running = max_running = 0
+    for _, delta in events:
+        running += delta
+        max_running = max(max_running, running)
+    assert max_running <= 2
+
+
+def test_control_masters_closed_only_for_connected_hosts(tmp_path, fake_ssh):
+    calls = fake_ssh({'web01': {'sudo': {'stdout': _raw('web01')}},
+                      'web02': {'sudo': {'stderr': 'denied\n', 'exit': 1}, 'su': {'stdout': 'su: failure\n', 'exit': 1}}})
+    results = _collect(['web01', 'web02', 'down'], _options(tmp_path, multiplex=True, forks=1))
+
+    assert [result['status'] for result in results] == ['collected', 'failed', 'failed']
+    assert sorted(call['host'] for call in calls() if call['method'] == 'exit') == ['web01', 'web02']
@@ -0,0 +1,115 @@
+import csv
+import json
+import sqlite3
+
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+COLUMNS = ['inventory_host'] + [column for column, _, _ in hw.FLAT_REPORT_FIELDS]
+INT_COLUMNS = {column for column, _, sql_type in hw.FLAT_REPORT_FIELDS if sql_type == 'INTEGER'}
+
+
+@pytest.fixture
+def fleet_data(fleet, tmp_path, monkeypatch):
+    """
+    tmp_path에서 정상 호스트, N/A 값이 있는 호스트, 수집 실패 호스트로 된 fleet을 파싱합니다.
+    """
+    monkeypatch.chdir(tmp_path)
+    inventory_file, raw_dir = fleet({
+        'web01': raw_hw_text('web01'),
+        'web02': raw_hw_text('web02', memory_mb='N/A', cpu__logical_cpus='N/A', bios__version='N/A'),
+        'db01': None,
+    })
+    return hw.parse_all_hw_data_files(raw_dir, inventory_file)
+
+
+def _export_file(name):
+    return hw.EXPORTERS[name][1]
+
+
+def _read_jsonl():
+    with open(_export_file('jsonl'), encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def _read_csv():
+    with open(_export_file('csv'), encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f))
+
+
+def _read_sqlite():
+    conn = sqlite3.connect(_export_file('sqlite'))
+    try:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(hosts)")]
+        rows = conn.execute("SELECT * FROM hosts ORDER BY inventory_host").fetchall()
+    finally:
+        conn.close()
+    return columns, [dict(zip(columns, row)) for row in rows]
+
+
+def test_jsonl_round_trip(fleet_data):
+    hw.export_reports(fleet_data, ['jsonl'])
+
+    assert [record['inventory_host'] for record in _read_jsonl()] == list(fleet_data)
+    loaded = hw.load_hosts_from_jsonl(_export_file('jsonl'))
+    assert {host: rec.to_dict() for host, rec in loaded.items()} == \
+        {host: rec.to_dict() for host, rec in fleet_data.items()}
+    assert loaded['web02'].memory_mb == 'N/A'
+    assert loaded['db01'].status == 'Collection Failed'
+
+
+def test_csv_columns_and_values(fleet_data):
+    hw.export_reports(fleet_data, ['csv'])
+
+    header, *rows = _read_csv()
+    assert header == COLUMNS
+    assert rows == [hw.flatten_host_record(host, rec) for host, rec in fleet_data.items()]
+    web02 = dict(zip(header, rows[1]))
+    assert web02['memory_mb'] == 'N/A' and web02['cpu_logical_cpus'] == 'N/A'
+    assert web02['ip_addresses'] == '192.0.2.10'
+
+
+def test_sqlite_columns_and_null_integers(fleet_data):
+    hw.export_reports(fleet_data, ['sqlite'])
+
+    columns, rows = _read_sqlite()
+    assert columns == COLUMNS
+    by_host = {row['inventory_host']: row for row in rows}
+    assert by_host['web01']['memory_mb'] == 385000 and by_host['web01']['cpu_logical_cpus'] == 80
+    # INTEGER 열의 'N/A'는 NULL, TEXT 열의 'N/A'는 그대로 저장됩니다.
+    assert by_host['web02']['memory_mb'] is None and by_host['web02']['cpu_logical_cpus'] is None
+    assert by_host['web02']['bios_version'] == 'N/A'
+    assert by_host['db01']['status'] == 'Collection Failed'
+    for column in INT_COLUMNS:
+        assert by_host['db01'][column] is None
+
+
+def test_reexport_replaces_previous_files(fleet_data):
+    formats = list(hw.EXPORTERS)
+    hw.export_reports(fleet_data, formats)
+
+    fewer = {'web02': fleet_data['web02']}
+    fewer['web02'].bios_version = '3.0.1'
+    hw.export_reports(fewer, formats)
+
+    assert [(r['inventory_host'], r['bios']['version']) for r in _read_jsonl()] == [('web02', '3.0.1')]
+    header, *rows = _read_csv()
+    assert [(row[0], dict(zip(header, row))['bios_version']) for row in rows] == [('web02', '3.0.1')]
+    _, sqlite_rows = _read_sqlite()
+    assert [(row['inventory_host'], row['bios_version']) for row in sqlite_rows] == [('web02', '3.0.1')]
+
+
+def test_update_exports_matches_full_export(fleet_data):
+    formats = list(hw.EXPORTERS)
+    line_caches = {}
+    hw.update_exports(fleet_data, formats, None, line_caches)
+
+    fleet_data['web01'].memory_mb = '512000'
+    hw.update_exports(fleet_data, formats, ['web01'], line_caches)
+    updated = (_read_jsonl(), _read_csv(), _read_sqlite())
+
+    hw.export_reports(fleet_data, formats)
+    assert updated == (_read_jsonl(), _read_csv(), _read_sqlite())
+    assert dict(zip(COLUMNS, updated[1][1]))['memory_mb'] == '512000'
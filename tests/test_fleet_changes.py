@@ -0,0 +1,69 @@
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+
+def _parse_fleet(fleet, hosts):
+    inventory_file, raw_dir = fleet(hosts)
+    return hw.parse_all_hw_data_files(raw_dir, inventory_file)
+
+
+def test_fingerprint_ignores_collect_metadata(fleet):
+    first = _parse_fleet(fleet, {'web01': raw_hw_text('web01')})
+    second = _parse_fleet(fleet, {'web01': raw_hw_text('web01', collect={
+        'started_at': '1767312000.001', 'finished_at': '1767312009.999', 'method': 'su', 'wall_seconds': '12.345'})})
+    assert first['web01'].status == second['web01'].status == 'Collected'
+    assert hw.host_fingerprint('web01', first['web01']) == hw.host_fingerprint('web01', second['web01'])
+
+
+def test_fingerprint_changes_with_hardware_fields(fleet):
+    before = _parse_fleet(fleet, {'web01': raw_hw_text('web01')})
+    after = _parse_fleet(fleet, {'web01': raw_hw_text('web01', bios__version='2.11.0')})
+    assert hw.host_fingerprint('web01', before['web01']) != hw.host_fingerprint('web01', after['web01'])
+
+
+def test_nightly_recollection_with_new_timestamps_reports_no_changes(fleet):
+    hosts = [f'node{i:02d}' for i in range(5)]
+    first = _parse_fleet(fleet, {host: raw_hw_text(host) for host in hosts})
+    changes, snapshot = hw.compute_fleet_changes(None, first, run_at='2026-01-01 00:00:00')
+    assert changes is None # 첫 실행
+
+    second = _parse_fleet(fleet, {host: raw_hw_text(host, collect={'started_at': f'1767312000.{i}',
+                                                                   'finished_at': f'1767312004.{i}'})
+                                  for i, host in enumerate(hosts)})
+    changes, _ = hw.compute_fleet_changes(snapshot, second, run_at='2026-01-02 00:00:00')
+    assert changes['summary'] == {'changed': 0, 'added': 0, 'removed': 0, 'unchanged': 5}
+    assert changes['hosts'] == []
+
+
+def test_changes_classify_added_removed_and_changed_hosts(fleet):
+    first = _parse_fleet(fleet, {'web01': raw_hw_text('web01'), 'web02': raw_hw_text('web02'),
+                                 'web03': raw_hw_text('web03')})
+    _, snapshot = hw.compute_fleet_changes(None, first)
+
+    second = _parse_fleet(fleet, {'web01': raw_hw_text('web01', bios__version='2.11.0', memory_mb='770000'),
+                                  'web02': raw_hw_text('web02'), 'web04': raw_hw_text('web04')})
+    changes, _ = hw.compute_fleet_changes(snapshot, second)
+
+    assert changes['summary'] == {'changed': 1, 'added': 1, 'removed': 1, 'unchanged': 1}
+    by_host = {entry['host']: entry for entry in changes['hosts']}
+    assert {host: entry['change'] for host, entry in by_host.items()} == {
+        'web01': 'changed', 'web04': 'added', 'web03': 'removed'}
+    assert {(c['field'], c['old'], c['new']) for c in by_host['web01']['fields']} == {
+        ('bios_version', '2.10.2', '2.11.0'), ('memory_mb', '385000', '770000')}
+
+
+def test_failed_host_keeps_last_collected_fields(fleet):
+    first = _parse_fleet(fleet, {'web01': raw_hw_text('web01')})
+    _, snapshot = hw.compute_fleet_changes(None, first)
+
+    failed = _parse_fleet(fleet, {'web01': None})
+    changes, snapshot = hw.compute_fleet_changes(snapshot, failed)
+    assert changes['hosts'] == [{'host': 'web01', 'change': 'changed', 'status': 'Collection Failed',
+                                 'fields': [{'field': 'status', 'old': 'Collected', 'new': 'Collection Failed'}]}]
+    assert snapshot['hosts']['web01']['fields']['bios_version'] == '2.10.2'
+
+    # 다시 수집되면 실패 전 마지막 성공 값과 비교합니다.
+    recovered = _parse_fleet(fleet, {'web01': raw_hw_text('web01', bios__version='2.11.0')})
+    changes, _ = hw.compute_fleet_changes(snapshot, recovered)
+    fields = {c['field']: (c['old'], c['new']) for c in changes['hosts'][0]['fields']}
+    assert fields == {'status': ('Collection Failed', 'Collected'), 'bios_version': ('2.10.2', '2.11.0')}
@@ -0,0 +1,68 @@
+import pytest
+
+import process_hw_info_bash_only as hw
+
+INTEL = 'Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz'
+AMD = 'AMD EPYC 7543 32-Core Processor'
+
+
+def _host(cpu_model, logical_cpus, threads_per_core, memory_mb, os_distribution='Ubuntu', os_version='22.04',
+          status='Collected'):
+    return hw.HostRecord.from_dict({
+        'status': status,
+        'cpu': {'model': cpu_model, 'logical_cpus': logical_cpus, 'threads_per_core': threads_per_core},
+        'system_info': {'manufacturer': 'Dell Inc.'},
+        'bios': {'version': '2.10.2'},
+        'os': {'distribution': os_distribution, 'version': os_version},
+        'memory_mb': memory_mb,
+    })
+
+
+@pytest.fixture
+def summary():
+    return hw.build_fleet_summary({
+        'web01': _host(INTEL, '80', '2', '385000'),
+        'web02': _host(INTEL, '80', '2', 'N/A'),
+        'db01': _host(AMD, '64', 'N/A', '262144', os_distribution='Rocky', os_version='N/A'),
+        'db02': _host(AMD, 'abc', '1', '1.5', os_distribution='N/A', os_version='N/A'),
+        'down01': hw.HostRecord('down01', 'Collection Failed'),
+    })
+
+
+def test_status_counts_include_failed_hosts(summary):
+    assert summary['hosts_total'] == 5
+    assert summary['status_counts'] == {'Collected': 4, 'Collection Failed': 1}
+
+
+def test_totals_skip_missing_and_unparseable_values(summary):
+    # 수집 실패 호스트는 합계에서 빠지고, 'N/A'나 숫자가 아닌 값은 *_missing으로 셉니다.
+    assert summary['totals'] == {
+        'hosts': 4,
+        'logical_cpus': 224, 'logical_cpus_missing': 1,
+        'cores': 80, 'cores_missing': 2,
+        'memory_mb': 647144, 'memory_mb_missing': 2,
+    }
+
+
+def test_per_model_groups(summary):
+    assert summary['groups']['cpu_model'] == [
+        {'key': AMD, 'hosts': 2, 'logical_cpus': 64, 'logical_cpus_missing': 1, 'cores': 0, 'cores_missing': 2,
+         'memory_mb': 262144, 'memory_mb_missing': 1},
+        {'key': INTEL, 'hosts': 2, 'logical_cpus': 160, 'logical_cpus_missing': 0, 'cores': 80, 'cores_missing': 0,
+         'memory_mb': 385000, 'memory_mb_missing': 1},
+    ]
+    assert summary['groups']['manufacturer'][0]['key'] == 'Dell Inc.'
+    assert summary['groups']['manufacturer'][0]['hosts'] == 4
+
+
+def test_multi_slot_dimension_labels(summary):
+    # 'N/A'인 슬롯은 이름에서 빠지고, 모두 'N/A'이면 'N/A' 그룹이 됩니다.
+    assert [(row['key'], row['hosts']) for row in summary['groups']['os']] == [
+        ('Ubuntu 22.04', 2), ('N/A', 1), ('Rocky', 1)]
+
+
+def test_empty_fleet():
+    summary = hw.build_fleet_summary({'down01': hw.HostRecord('down01', 'Collection Failed')})
+    assert summary['totals'] == {'hosts': 0, 'logical_cpus': 0, 'logical_cpus_missing': 0, 'cores': 0,
+                                 'cores_missing': 0, 'memory_mb': 0, 'memory_mb_missing': 0}
+    assert all(rows == [] for rows in summary['groups'].values())
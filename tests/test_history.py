@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+
+@pytest.fixture
+def history_db(fleet, tmp_path):
+    """
+    세 번의 실행(1/30, 1/31 두 번)을 기록한 이력 저장소 경로를 돌려줍니다.
+    web01의 BIOS는 1/31 두 번째 실행에서 바뀌고, db01은 1/31에 IP가 바뀝니다.
+    """
+    db_file = str(tmp_path / 'history.sqlite')
+    runs = [
+        ('2025-01-30 23:59:59', {'bios__version': '2.10.2'}, '10.0.0.5'),
+        ('2025-01-31 09:00:00', {'bios__version': '2.10.2'}, '10.0.0.6'),
+        ('2025-01-31 21:00:00', {'bios__version': '2.12.0'}, '10.0.0.6'),
+    ]
+    for run_at, web_fields, db_ip in runs:
+        inventory_file, raw_dir = fleet({
+            'web01': raw_hw_text('web01', **web_fields),
+            'db01': raw_hw_text('db01', ip_addresses=f'{db_ip} 192.0.2.20', memory_mb='N/A'),
+        })
+        data = hw.parse_all_hw_data_files(raw_dir, inventory_file)
+        hw.record_history(data, db_file, inventory_file=str(inventory_file), run_at=run_at)
+    return db_file
+
+
+def _query(db_file, **kwargs):
+    columns, rows = hw.query_history(db_file, **kwargs)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def _run_query(capsys, db_file, *argv):
+    capsys.readouterr()
+    assert hw.run_query(['--db', db_file, '--format', 'json', *argv]) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_record_history_inserts_every_host_per_run(history_db):
+    rows = _query(history_db)
+    assert [(row['run_at'], row['inventory_host']) for row in rows] == [
+        ('2025-01-30 23:59:59', 'db01'), ('2025-01-30 23:59:59', 'web01'),
+        ('2025-01-31 09:00:00', 'db01'), ('2025-01-31 09:00:00', 'web01'),
+        ('2025-01-31 21:00:00', 'db01'), ('2025-01-31 21:00:00', 'web01'),
+    ]
+    assert rows[0]['memory_mb'] is None and rows[1]['memory_mb'] == 385000
+    assert rows[0]['ip_addresses'] == '10.0.0.5 192.0.2.20'
+
+
+def test_latest_returns_newest_matching_snapshot_per_host(history_db):
+    rows = _query(history_db, latest=True)
+    assert [(row['inventory_host'], row['run_at']) for row in rows] == [
+        ('db01', '2025-01-31 21:00:00'), ('web01', '2025-01-31 21:00:00')]
+
+    rows = _query(history_db, filters={'bios_version': '2.10.2'}, latest=True)
+    assert [(row['inventory_host'], row['run_at']) for row in rows] == [
+        ('db01', '2025-01-31 21:00:00'), ('web01', '2025-01-31 09:00:00')]
+
+
+def test_ip_filter_matches_any_address_of_the_run(history_db):
+    rows = _query(history_db, ip='10.0.0.5')
+    assert [(row['inventory_host'], row['run_at']) for row in rows] == [('db01', '2025-01-30 23:59:59')]
+    assert len(_query(history_db, ip='192.0.2.20')) == 3
+    assert _query(history_db, ip='10.0.0') == []
+
+
+def test_date_bounds(capsys, history_db):
+    rows = _run_query(capsys, history_db, '--date', '2025-01-31', '--host', 'web01')
+    assert [row['run_at'] for row in rows] == ['2025-01-31 09:00:00', '2025-01-31 21:00:00']
+
+    # --until 날짜는 그날까지 포함하고, 시각을 주면 그 시각은 제외합니다.
+    rows = _run_query(capsys, history_db, '--until', '2025-01-30', '--host', 'web01')
+    assert [row['run_at'] for row in rows] == ['2025-01-30 23:59:59']
+    rows = _run_query(capsys, history_db, '--since', '2025-01-30 23:59:59', '--until', '2025-01-31 21:00:00',
+                      '--host', 'web01')
+    assert [row['run_at'] for row in rows] == ['2025-01-30 23:59:59', '2025-01-31 09:00:00']
+
+    rows = _run_query(capsys, history_db, '--date', '2025-01-31', '--ip', '10.0.0.6', '--latest')
+    assert [(row['inventory_host'], row['run_at']) for row in rows] == [('db01', '2025-01-31 21:00:00')]
+
+
+@pytest.mark.parametrize('extra', [['--since', '2025-01-01'], ['--until', '2025-02-01']])
+def test_date_cannot_be_combined_with_since_or_until(capsys, history_db, extra):
+    with pytest.raises(SystemExit) as exc_info:
+        hw.run_query(['--db', history_db, '--date', '2025-01-31', *extra])
+    assert exc_info.value.code == 2
+    assert '--date' in capsys.readouterr().err
@@ -0,0 +1,70 @@
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+
+def _fields(record):
+    return {slot: getattr(record, slot) for slot in hw.HostRecord.__slots__}
+
+
+def _parsed(tmp_path, host, content):
+    raw_file = tmp_path / f'{host}_raw_hw.txt'
+    raw_file.write_text(content, encoding='utf-8')
+    return hw.parse_raw_hw_data(str(raw_file), verbose=False)
+
+
+def test_round_trip_full_record(tmp_path):
+    record = _parsed(tmp_path, 'web01', raw_hw_text('web01', ip_addresses='10.0.0.1 192.0.2.10'))
+    record.collect_meta = None
+    assert record.ip_addresses == ('10.0.0.1', '192.0.2.10')
+    assert _fields(hw.HostRecord.from_dict(record.to_dict())) == _fields(record)
+
+
+def test_round_trip_na_record():
+    record = hw.HostRecord('down01', 'Collection Failed')
+    data = record.to_dict()
+    assert data['ip_addresses'] == ['N/A'] and data['cpu']['model'] == 'N/A'
+    assert _fields(hw.HostRecord.from_dict(data)) == _fields(record)
+
+
+def test_round_trip_partial_record(tmp_path):
+    record = _parsed(tmp_path, 'web02', raw_hw_text('web02', cpu__cores_per_socket='N/A', os__kernel='N/A',
+                                                    mainboard__serial='N/A', memory_mb='N/A'))
+    record.collect_meta = None
+    assert _fields(hw.HostRecord.from_dict(record.to_dict())) == _fields(record)
+
+
+def test_from_dict_fills_missing_fields_and_sections():
+    record = hw.HostRecord.from_dict({'hostname': 'web03', 'cpu': {'model': 'Xeon'}, 'bios': None})
+    assert (record.hostname, record.status, record.cpu_model) == ('web03', 'Collected', 'Xeon')
+    assert record.cpu_logical_cpus == record.bios_version == record.memory_mb == 'N/A'
+    assert record.ip_addresses == ('N/A',)
+    assert hw.HostRecord.from_dict({}).to_dict() == hw.HostRecord().to_dict()
+
+
+def test_from_dict_interns_low_cardinality_values():
+    first = hw.HostRecord.from_dict({'cpu': {'model': ''.join(['Xe', 'on'])}})
+    second = hw.HostRecord.from_dict({'cpu': {'model': ''.join(['Xeo', 'n'])}})
+    assert first.cpu_model is second.cpu_model
+
+
+def test_from_dict_coerces_numbers():
+    record = hw.HostRecord.from_dict({'cpu': {'logical_cpus': 64, 'threads_per_core': 2.0}, 'memory_mb': 1024,
+                                      'ip_addresses': ['10.0.0.1']})
+    assert (record.cpu_logical_cpus, record.cpu_threads_per_core, record.memory_mb) == ('64', '2.0', '1024')
+    assert record.ip_addresses == ('10.0.0.1',)
+
+
+@pytest.mark.parametrize('data', [
+    [],
+    {'hostname': ['web01']},
+    {'status': False},
+    {'memory_mb': {'total': 1024}},
+    {'cpu': ['Xeon']},
+    {'ip_addresses': '10.0.0.1'},
+    {'ip_addresses': ['10.0.0.1', None]},
+])
+def test_from_dict_rejects_malformed_values(data):
+    with pytest.raises(ValueError):
+        hw.HostRecord.from_dict(data)
@@ -0,0 +1,106 @@
+import json
+import os
+import re
+
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+HOSTS = [f'node{i:02d}' for i in range(7)]
+
+
+@pytest.fixture
+def report(fleet, tmp_path, monkeypatch):
+    """
+    tmp_path에서 fleet을 파싱하여 (호스트 데이터, 보고서 경로, 검색 인덱스 경로)를 돌려줍니다.
+    """
+    monkeypatch.chdir(tmp_path)
+    hosts = {host: raw_hw_text(host) for host in HOSTS}
+    hosts['node03'] = raw_hw_text('node03', cpu__model='AMD EPYC 7543 32-Core Processor')
+    hosts['node05'] = None
+    inventory_file, raw_dir = fleet(hosts)
+    data = hw.parse_all_hw_data_files(raw_dir, inventory_file)
+    return data, str(tmp_path / 'report.html'), str(tmp_path / 'index.json')
+
+
+def _shards(output_file):
+    root = os.path.splitext(output_file)[0]
+    directory = os.path.dirname(output_file)
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if os.path.join(directory, name).startswith(f'{root}_hosts_'))
+
+
+def _read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def _host_ids(page):
+    return re.findall(r'id="(host-\d+)"', page)
+
+
+def _embedded_index(page):
+    payload = re.search(r'<script type="application/json" id="hw-search-index">(.*?)</script>', page, re.S).group(1)
+    return json.loads(payload.replace('<\\/', '</'))
+
+
+def test_sharded_report_pages_and_index(report):
+    data, output_file, index_file = report
+    hw.generate_html_report(data, output_file, shard_size=3, search_index_file=index_file)
+
+    shards = _shards(output_file)
+    assert [os.path.basename(path) for path in shards] == [
+        'report_hosts_0001.html', 'report_hosts_0002.html', 'report_hosts_0003.html']
+    # 호스트는 이름 순서로 3개씩 나뉘며, 섹션 id는 전체 순서 기준입니다.
+    assert [_host_ids(_read(path)) for path in shards] == [
+        ['host-0', 'host-1', 'host-2'], ['host-3', 'host-4', 'host-5'], ['host-6']]
+    index_page = _read(output_file)
+    assert _host_ids(index_page) == []
+    for path in shards:
+        assert f'href="{os.path.basename(path)}' in index_page
+
+    index = _embedded_index(index_page)
+    assert index == json.loads(_read(index_file))
+    assert index['pages'] == [os.path.basename(path) for path in shards]
+    assert [row[0] for row in index['rows']] == HOSTS
+    assert [row[-1] for row in index['rows']] == [0, 0, 0, 1, 1, 1, 2]
+    fields = index['fields']
+    node03 = dict(zip(fields, index['rows'][3]))
+    assert index['cpu_models'][node03['cpu_model']] == 'AMD EPYC 7543 32-Core Processor'
+    assert len(index['cpu_models']) == 3  # Intel, AMD, 수집 실패 호스트의 'N/A'
+    assert node03['serial_number'] == 'SN-node03' and node03['ip_addresses'] == '192.0.2.10'
+    assert dict(zip(fields, index['rows'][5]))['status'] == 'Collection Failed'
+
+
+def test_only_hosts_rewrites_affected_shards(report):
+    data, output_file, index_file = report
+    hw.generate_html_report(data, output_file, shard_size=3, search_index_file=index_file)
+    shards = _shards(output_file)
+    before = [_read(path) for path in shards]
+
+    data['node04'].bios_version = '9.9.9'
+    hw.generate_html_report(data, output_file, shard_size=3, search_index_file=index_file, only_hosts=['node04'])
+    after = [_read(path) for path in shards]
+    assert after[0] == before[0] and after[2] == before[2]
+    assert '9.9.9' in after[1] and '9.9.9' not in before[1]
+    # 색인 페이지와 검색 인덱스는 항상 다시 씁니다.
+    assert [row[0] for row in json.loads(_read(index_file))['rows']] == HOSTS
+
+
+def test_rerender_with_fewer_hosts_removes_stale_shards(report):
+    data, output_file, index_file = report
+    hw.generate_html_report(data, output_file, shard_size=3, search_index_file=index_file)
+    assert len(_shards(output_file)) == 3
+
+    fewer = {host: data[host] for host in HOSTS[:4]}
+    hw.generate_html_report(fewer, output_file, shard_size=3, search_index_file=index_file)
+    assert [os.path.basename(path) for path in _shards(output_file)] == [
+        'report_hosts_0001.html', 'report_hosts_0002.html']
+    assert json.loads(_read(index_file))['pages'] == ['report_hosts_0001.html', 'report_hosts_0002.html']
+
+    # 한 페이지에 들어가면 분할 페이지를 모두 지우고 색인 페이지에 호스트 카드를 씁니다.
+    hw.generate_html_report(fewer, output_file, shard_size=10, search_index_file=index_file)
+    assert _shards(output_file) == []
+    assert _host_ids(_read(output_file)) == ['host-0', 'host-1', 'host-2', 'host-3']
+    assert json.loads(_read(index_file))['pages'] == []
@@ -0,0 +1,184 @@
+import mmap
+import os
+
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+HOSTS = [f'node{i:02d}' for i in range(40)]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pack_cache():
+    # read_pack_member는 프로세스마다 pack을 열어 두므로, 테스트마다 다시 쓰는 pack을 새로 열도록 비웁니다.
+    hw._open_hw_pack_cached.cache_clear()
+    yield
+    hw._open_hw_pack_cached.cache_clear()
+
+
+def _write_pack(pack_path, hosts, compression='deflate', **fields):
+    with hw.HwPackWriter(pack_path, compression) as writer:
+        for host in hosts:
+            writer.add(host, raw_hw_text(host, **fields).encode(), 1_700_000_000_000_000_000)
+    return pack_path
+
+
+def _read_all(pack_path):
+    pack = hw.HwPack(pack_path)
+    return {record.host: pack.read(record).decode() for record in pack.records()}
+
+
+@pytest.mark.parametrize('compression', list(hw.PACK_COMPRESSIONS))
+def test_write_read_round_trip(tmp_path, compression):
+    # 호스트 순서와 관계없이 호스트명 순서로 색인되고, 앞부분 레코드로 만든 사전을 쓰는 레코드도 그대로 읽힙니다.
+    pack_path = _write_pack(str(tmp_path / 'fleet.hwpack'), reversed(HOSTS), compression)
+    assert os.path.exists(pack_path + '.idx')
+
+    pack = hw.HwPack(pack_path)
+    assert len(pack) == len(HOSTS)
+    assert [record.host for record in pack.records()] == HOSTS
+    for host in ('node00', 'node17', 'node39'):
+        record = pack.find(host)
+        assert record.host == host and record.mtime_ns == 1_700_000_000_000_000_000
+        assert pack.read(record).decode() == raw_hw_text(host)
+    assert pack.find('node40') is None and pack.find('a') is None
+
+
+def test_readding_host_keeps_last_record(tmp_path):
+    pack_path = _write_pack(str(tmp_path / 'fleet.hwpack'), ['web01', 'web02'])
+    _write_pack(pack_path, ['web01'], bios__version='2.11.0')
+    contents = _read_all(pack_path)
+    assert sorted(contents) == ['web01', 'web02']
+    assert 'bios.version=2.11.0' in contents['web01']
+
+
+def test_pack_parses_like_directory(fleet, tmp_path):
+    hosts = {host: raw_hw_text(host) for host in HOSTS[:5]}
+    hosts['node05'] = None
+    inventory_file, raw_dir = fleet(hosts)
+    pack_path = str(tmp_path / 'fleet.hwpack')
+    assert hw.pack_raw_hw_files(raw_dir, pack_path)[0] == 5
+
+    raw_files = hw.scan_raw_hw_files(raw_dir)
+    entries = hw.scan_raw_hw_pack(pack_path)
+    assert sorted(entries) == sorted(raw_files)
+    for host, entry in entries.items():
+        assert (entry.stat().st_size, entry.stat().st_mtime_ns) == (
+            raw_files[host].stat().st_size, raw_files[host].stat().st_mtime_ns)
+        assert hw.read_pack_member(entry.path) == hosts[host]
+
+    from_dir = hw.parse_all_hw_data_files(raw_dir, inventory_file)
+    from_pack = hw.parse_all_hw_data_files(pack_path, inventory_file)
+    assert {host: record.to_dict() for host, record in from_pack.items()} == \
+        {host: record.to_dict() for host, record in from_dir.items()}
+    assert from_pack['node05'].status == 'Collection Failed'
+
+
+def _truncate_last_record(pack_path, keep_bytes=10):
+    pack = hw.HwPack(pack_path)
+    last = max(record.offset for record in pack.records())
+    del pack
+    hw._open_hw_pack_cached.cache_clear()
+    os.truncate(pack_path, last + keep_bytes)
+    return last
+
+
+def test_truncated_trailing_record_is_ignored(tmp_path, capsys):
+    pack_path = _write_pack(str(tmp_path / 'fleet.hwpack'), ['web01', 'web02', 'web03'])
+    _truncate_last_record(pack_path)
+
+    # 쓰는 중에 끊긴 마지막 레코드(web03)는 무시하고 나머지를 읽습니다.
+    assert sorted(_read_all(pack_path)) == ['web01', 'web02']
+    assert '잘렸거나 손상되어 무시합니다' in capsys.readouterr().out
+    assert sorted(hw.scan_raw_hw_pack(pack_path)) == ['web01', 'web02']
+
+
+def test_append_after_crash_truncates_partial_record(tmp_path, capsys):
+    pack_path = _write_pack(str(tmp_path / 'fleet.hwpack'), ['web01', 'web02', 'web03'])
+    last = _truncate_last_record(pack_path)
+
+    _write_pack(pack_path, ['web03', 'web04'])
+    assert '잘라내고 이어서 씁니다' in capsys.readouterr().out
+    contents = _read_all(pack_path)
+    assert sorted(contents) == ['web01', 'web02', 'web03', 'web04']
+    assert contents['web03'] == raw_hw_text('web03')
+    # 잘린 조각 자리부터 이어서 썼으므로 새 레코드가 잘린 레코드 위치에서 시작합니다.
+    assert hw.HwPack(pack_path).find('web03').offset == last
+
+
+def test_out_of_sync_index_is_rebuilt(tmp_path):
+    pack_path = _write_pack(str(tmp_path / 'fleet.hwpack'), ['web01', 'web02'])
+    index_path = pack_path + '.idx'
+
+    # close()(색인 쓰기) 전에 중단된 추가: pack은 늘었지만 색인은 예전 크기를 가리킵니다.
+    writer = hw.HwPackWriter(pack_path)
+    writer.add('web00', raw_hw_text('web00').encode())
+    writer.file.close()
+    assert hw._load_pack_index(pack_path, os.path.getsize(pack_path)) is None
+
+    pack = hw.HwPack(pack_path)
+    assert [record.host for record in pack.records()] == ['web00', 'web01', 'web02']
+    assert len(hw._load_pack_index(pack_path, os.path.getsize(pack_path))) == 3
+
+    os.remove(index_path)
+    assert sorted(_read_all(pack_path)) == ['web00', 'web01', 'web02']
+    assert os.path.exists(index_path)
+
+    with open(index_path, 'wb') as f:
+        f.write(b'garbage')
+    assert sorted(hw.scan_raw_hw_pack(pack_path)) == ['web00', 'web01', 'web02']
+
+
+@pytest.mark.parametrize('corrupt', ['short', 'magic', 'pack-size', 'count'])
+def test_rejected_index_is_unmapped(tmp_path, monkeypatch, corrupt):
+    pack_path = _write_pack(str(tmp_path / 'fleet.hwpack'), ['web01', 'web02'])
+    index_path = pack_path + '.idx'
+    with open(index_path, 'rb') as f:
+        index = bytearray(f.read())
+    pack_size = os.path.getsize(pack_path)
+    if corrupt == 'short':
+        index = index[:hw._PACK_INDEX_HEADER.size - 1]
+    elif corrupt == 'magic':
+        index[:8] = b'HWPIDX0\0'
+    elif corrupt == 'pack-size':
+        pack_size += 1
+    else:
+        index += b'\0' * 8
+    with open(index_path, 'wb') as f:
+        f.write(index)
+
+    maps = []
+
+    class TrackedMmap(mmap.mmap):
+        def __init__(self, *args, **kwargs):
+            maps.append(self)
+
+    monkeypatch.setattr(mmap, 'mmap', TrackedMmap)
+    assert hw._load_pack_index(pack_path, pack_size) is None
+    assert len(maps) == 1 and maps[0].closed
+
+
+def test_reindex_command(tmp_path, capsys):
+    pack_path = _write_pack(str(tmp_path / 'fleet.hwpack'), ['web01', 'web02', 'web03'])
+    _truncate_last_record(pack_path)
+    os.remove(pack_path + '.idx')
+
+    assert hw.run_pack(['--reindex', pack_path]) == 0
+    out = capsys.readouterr().out
+    assert '레코드 2개' in out and '손상' in out
+    offsets = hw._load_pack_index(pack_path, os.path.getsize(pack_path))
+    assert [hw.HwPack(pack_path).record_at(offset).host for offset in offsets] == ['web01', 'web02']
+
+    assert hw.run_pack(['--reindex', str(tmp_path / 'missing.hwpack')]) == 1
+
+
+def test_corrupted_record_is_detected(tmp_path):
+    pack_path = _write_pack(str(tmp_path / 'fleet.hwpack'), ['web01'], compression='none')
+    record = hw.HwPack(pack_path).find('web01')
+    with open(pack_path, 'r+b') as f:
+        f.seek(record.data_start + 5)
+        f.write(b'X')
+    with pytest.raises(ValueError, match='손상'):
+        pack = hw.HwPack(pack_path)
+        pack.read(pack.find('web01'))
@@ -0,0 +1,216 @@
+import itertools
+import os
+import time
+
+import pytest
+
+import process_hw_info_bash_only as hw
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('web01', ['web01']),
+    ('node[01:10]', [f'node{i:02d}' for i in range(1, 11)]),
+    ('node[001:003].dc', ['node001.dc', 'node002.dc', 'node003.dc']),
+    ('node[8:11]', ['node8', 'node9', 'node10', 'node11']),
+    ('web[1:10:3]', ['web1', 'web4', 'web7', 'web10']),
+    ('rack-[a:d]', ['rack-a', 'rack-b', 'rack-c', 'rack-d']),
+    ('db[A:C:2]', ['dbA', 'dbC']),
+    ('r[1:2]-n[a:b]', ['r1-na', 'r1-nb', 'r2-na', 'r2-nb']),
+    ('10.0.0.[1:3]', ['10.0.0.1', '10.0.0.2', '10.0.0.3']),
+    ('node[:3]', ['node0', 'node1', 'node2', 'node3']),
+    ('node[:4:2]', ['node0', 'node2', 'node4']),
+    ('node[0:2]', ['node0', 'node1', 'node2']),
+    ('node[5:3]', []),
+    ('x[y:B]', ['xy', 'xz', 'xA', 'xB']),
+])
+def test_expand_host_pattern(pattern, expected):
+    assert list(hw.expand_host_pattern(pattern)) == expected
+
+
+@pytest.mark.parametrize('pattern', ['node[a:10]', 'node[aa:bb]', 'node[01:100]', 'node[001:99]', 'rack-[d:a]',
+                                     'r[1:2]-n[01:100]'])
+def test_expand_host_pattern_rejects_invalid_ranges(pattern):
+    with pytest.raises(ValueError):
+        list(hw.expand_host_pattern(pattern))
+
+
+def test_expand_host_pattern_is_lazy():
+    hosts = hw.expand_host_pattern('node[0000000:9999999]-[000:999]')
+    assert list(itertools.islice(hosts, 3)) == ['node0000000-000', 'node0000000-001', 'node0000000-002']
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+INI_INVENTORY = """\
+ungrouped01
+(ip changeme) ansible_user=nobody
+
+[web]
+web[01:03] ansible_user=deploy
+web04:2222
+
+[db]
+db01 ansible_host=10.0.0.5 role=primary
+
+[dc1:children]
+web
+rack1
+
+[rack1]
+rack1-[a:b]
+
+[prod:children]
+dc1
+db
+
+[web:vars]
+http_port=8080
+tier=web
+
+[dc1:vars]
+tier=dc
+dc=seoul
+
+[prod:vars]
+tier=prod
+env=production
+
+[all:vars]
+ansible_user=admin
+env=all
+"""
+
+
+@pytest.mark.parametrize('group, expected', [
+    ('all', ['ungrouped01', 'web01', 'web02', 'web03', 'web04', 'db01', 'rack1-a', 'rack1-b']),
+    ('web', ['web01', 'web02', 'web03', 'web04']),
+    ('dc1', ['web01', 'web02', 'web03', 'web04', 'rack1-a', 'rack1-b']),
+    ('prod', ['web01', 'web02', 'web03', 'web04', 'db01', 'rack1-a', 'rack1-b']),
+    ('missing', []),
+])
+def test_ini_group_hosts_with_nested_children(tmp_path, group, expected):
+    inventory_file = _write(tmp_path, 'inventory.ini', INI_INVENTORY)
+    assert hw.parse_inventory_hosts(inventory_file, group) == expected
+
+
+@pytest.mark.parametrize('host, expected', [
+    # all < prod < dc1 < web < 호스트 변수 순으로 덮어씁니다.
+    ('web01', {'ansible_user': 'deploy', 'env': 'production', 'http_port': '8080', 'tier': 'web', 'dc': 'seoul'}),
+    ('web04', {'ansible_user': 'admin', 'ansible_port': '2222', 'env': 'production', 'http_port': '8080',
+               'tier': 'web', 'dc': 'seoul'}),
+    ('rack1-a', {'ansible_user': 'admin', 'env': 'production', 'tier': 'dc', 'dc': 'seoul'}),
+    ('db01', {'ansible_user': 'admin', 'ansible_host': '10.0.0.5', 'role': 'primary', 'env': 'production',
+              'tier': 'prod'}),
+    ('ungrouped01', {'ansible_user': 'admin', 'env': 'all'}),
+])
+def test_ini_host_vars_precedence(tmp_path, host, expected):
+    inventory_file = _write(tmp_path, 'inventory.ini', INI_INVENTORY)
+    assert hw.parse_inventory_host_vars(inventory_file)[host] == expected
+
+
+def test_ini_children_cycle_terminates(tmp_path):
+    inventory_file = _write(tmp_path, 'inventory.ini', """\
+[a]
+host-a
+[b]
+host-b
+[a:children]
+b
+[b:children]
+a
+[a:vars]
+x=1
+[b:vars]
+y=2
+""")
+    assert hw.parse_inventory_hosts(inventory_file, 'a') == ['host-a', 'host-b']
+    assert hw.parse_inventory_hosts(inventory_file, 'b') == ['host-a', 'host-b']
+    host_vars = hw.parse_inventory_host_vars(inventory_file)
+    assert host_vars['host-a'] == host_vars['host-b'] == {'x': '1', 'y': '2'}
+
+
+def test_ini_unknown_section_kind_is_reported(tmp_path, capsys):
+    inventory_file = _write(tmp_path, 'inventory.ini', "[web:hostvars]\nweb01\n")
+    assert hw.parse_inventory_hosts(inventory_file) == []
+    assert '알 수 없는 섹션 종류' in capsys.readouterr().out
+
+
+YAML_INVENTORY = """\
+all:
+  vars:
+    ansible_user: admin
+  hosts:
+    bastion:
+  children:
+    web:
+      hosts:
+        web[1:3]:
+          ansible_port: 2222
+      vars:
+        tier: web
+    prod:
+      children:
+        web:
+        db:
+          hosts:
+            db01:
+              ansible_host: 10.0.0.5
+      vars:
+        tier: prod
+        env: production
+"""
+
+
+@pytest.mark.parametrize('group, expected', [
+    ('all', ['bastion', 'web1', 'web2', 'web3', 'db01']),
+    ('web', ['web1', 'web2', 'web3']),
+    ('prod', ['web1', 'web2', 'web3', 'db01']),
+    ('db', ['db01']),
+])
+def test_yaml_inventory_hosts_and_children(tmp_path, group, expected):
+    inventory_file = _write(tmp_path, 'inventory.yml', YAML_INVENTORY)
+    assert hw.parse_inventory_hosts(inventory_file, group) == expected
+
+
+def test_yaml_inventory_host_vars(tmp_path):
+    host_vars = hw.parse_inventory_host_vars(_write(tmp_path, 'inventory.yaml', YAML_INVENTORY))
+    assert host_vars['web2'] == {'ansible_user': 'admin', 'ansible_port': 2222, 'tier': 'web', 'env': 'production'}
+    assert host_vars['db01'] == {'ansible_user': 'admin', 'ansible_host': '10.0.0.5', 'tier': 'prod',
+                                 'env': 'production'}
+    assert host_vars['bastion'] == {'ansible_user': 'admin'}
+
+
+def _age(path, seconds_ago):
+    then = time.time() - seconds_ago
+    os.utime(path, (then, then))
+
+
+def test_inventory_cache_reuses_unchanged_file(tmp_path):
+    inventory_file = _write(tmp_path, 'inventory.ini', "[web]\nweb01\n")
+    _age(inventory_file, 60)
+    assert hw.load_inventory(inventory_file) is hw.load_inventory(inventory_file)
+
+
+def test_inventory_cache_detects_same_size_rewrite_with_same_mtime(tmp_path):
+    inventory_file = _write(tmp_path, 'inventory.ini', "[web]\nweb01\n")
+    _age(inventory_file, 60)
+    mtime_ns = os.stat(inventory_file).st_mtime_ns
+    assert hw.parse_inventory_hosts(inventory_file) == ['web01']
+
+    # 같은 크기로 다시 쓰고 mtime을 되돌려도 (같은 초 안에 다시 쓴 것과 같음) 새 내용을 읽어야 합니다.
+    _write(tmp_path, 'inventory.ini', "[web]\nweb02\n")
+    os.utime(inventory_file, ns=(mtime_ns, mtime_ns))
+    assert hw.parse_inventory_hosts(inventory_file) == ['web02']
+
+
+def test_inventory_cache_skips_files_modified_just_now(tmp_path):
+    inventory_file = _write(tmp_path, 'inventory.ini', "[web]\nweb01\n")
+    assert hw.parse_inventory_hosts(inventory_file) == ['web01']
+    # 방금 쓴 파일은 시각 정밀도와 관계없이 매번 다시 읽습니다.
+    _write(tmp_path, 'inventory.ini', "[web]\nweb09\n")
+    assert hw.parse_inventory_hosts(inventory_file) == ['web09']
+    assert hw.load_inventory(inventory_file) is not hw.load_inventory(inventory_file)
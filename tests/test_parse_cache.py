@@ -0,0 +1,113 @@
+import os
+import time
+
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+NEW_COLLECT = {'started_at': '1767312000.001', 'finished_at': '1767312009.999', 'method': 'su', 'wall_seconds': '12.345'}
+
+
+def _parse(inventory_file, raw_data, cache_file):
+    stats = {}
+    data = hw.parse_all_hw_data_files(raw_data, inventory_file, cache_file=cache_file, stats=stats)
+    return data, stats
+
+
+def _pack(raw_dir, tmp_path, name):
+    pack_path = str(tmp_path / name)
+    hw.pack_raw_hw_files(raw_dir, pack_path)
+    return pack_path
+
+
+def test_raw_content_digest_ignores_collect_lines():
+    digest, meta = hw.raw_content_digest(raw_hw_text('web01').encode())
+    new_digest, new_meta = hw.raw_content_digest(raw_hw_text('web01', collect=NEW_COLLECT).encode())
+    assert digest == new_digest
+    assert meta == {'started_at': '1767225600.120', 'finished_at': '1767225603.450'}
+    assert new_meta == NEW_COLLECT
+    assert hw.raw_content_digest(raw_hw_text('web01', bios__version='2.11.0').encode())[0] != digest
+    assert hw.raw_content_digest(raw_hw_text('web01', collect={}).encode())[1] is None
+
+
+@pytest.mark.parametrize('use_pack', [False, True])
+def test_cache_hits_when_only_collect_metadata_changes(fleet, tmp_path, use_pack):
+    cache_file = str(tmp_path / 'cache.json')
+    inventory_file, raw_dir = fleet({'web01': raw_hw_text('web01'), 'web02': raw_hw_text('web02')})
+    raw_data = _pack(raw_dir, tmp_path, 'first.hwpack') if use_pack else raw_dir
+    first, stats = _parse(inventory_file, raw_data, cache_file)
+    assert (stats['cache_hits'], stats['cache_misses']) == (0, 2)
+
+    # 다시 수집되어 수집 시각만 바뀌고 web02의 하드웨어 정보가 바뀐 경우
+    inventory_file, raw_dir = fleet({'web01': raw_hw_text('web01', collect=NEW_COLLECT),
+                                     'web02': raw_hw_text('web02', bios__version='2.11.0')})
+    raw_data = _pack(raw_dir, tmp_path, 'second.hwpack') if use_pack else raw_dir
+    second, stats = _parse(inventory_file, raw_data, cache_file)
+    assert (stats['cache_hits'], stats['cache_misses']) == (1, 1)
+    assert stats['collect']['web01'] == NEW_COLLECT
+    assert second['web01'].status == 'Collected'
+    assert hw.host_fingerprint('web01', second['web01']) == hw.host_fingerprint('web01', first['web01'])
+    assert second['web02'].bios_version == '2.11.0'
+
+
+def test_cache_hit_keeps_collect_metadata(fleet, tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+    inventory_file, raw_dir = fleet({'web01': raw_hw_text('web01', collect=NEW_COLLECT)})
+    _, stats = _parse(inventory_file, raw_dir, cache_file)
+    assert stats['collect'] == {'web01': NEW_COLLECT}
+
+    # 크기와 mtime이 같아 파일을 읽지 않는 적중에서도 수집 메타데이터는 캐시에서 가져옵니다.
+    _, stats = _parse(inventory_file, raw_dir, cache_file)
+    assert stats['cache_hits'] == 1 and stats['parse_seconds'] == {}
+    assert stats['collect'] == {'web01': NEW_COLLECT}
+    metrics = hw.build_run_metrics({'web01': hw.HostRecord('web01', 'Collected')}, {}, stats)
+    assert metrics['hosts']['web01']['collect_method'] == 'su'
+    assert metrics['hosts']['web01']['collect_wall_seconds'] == 12.345
+
+
+def test_cache_schema_mismatch_is_ignored(fleet, tmp_path):
+    cache_file = tmp_path / 'cache.json'
+    cache_file.write_text('{"schema_version": 2, "entries": {"web01": {}}}', encoding='utf-8')
+    inventory_file, raw_dir = fleet({'web01': raw_hw_text('web01')})
+    _, stats = _parse(inventory_file, raw_dir, str(cache_file))
+    assert (stats['cache_hits'], stats['cache_misses']) == (0, 1)
+    assert os.path.getsize(cache_file) > 0
+
+
+def _age(path, seconds_ago):
+    then = time.time() - seconds_ago
+    os.utime(path, (then, then))
+
+
+def test_same_size_rewrite_with_same_mtime_is_reparsed(fleet, tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+    inventory_file, raw_dir = fleet({'web01': raw_hw_text('web01')})
+    raw_file = os.path.join(raw_dir, 'web01_raw_hw.txt')
+    _age(raw_file, 60)
+    mtime_ns = os.stat(raw_file).st_mtime_ns
+    _parse(inventory_file, raw_dir, cache_file)
+
+    # 같은 크기로 다시 쓰고 mtime을 되돌려도 (같은 시각 안에 다시 쓴 것과 같음) 새 내용을 파싱해야 합니다.
+    fleet({'web01': raw_hw_text('web01', bios__version='2.10.9')})
+    os.utime(raw_file, ns=(mtime_ns, mtime_ns))
+    data, stats = _parse(inventory_file, raw_dir, cache_file)
+    assert (stats['cache_hits'], stats['cache_misses']) == (0, 1)
+    assert data['web01'].bios_version == '2.10.9'
+
+
+def test_racy_entries_are_verified_by_content(fleet, tmp_path, monkeypatch):
+    cache_file = str(tmp_path / 'cache.json')
+    inventory_file, raw_dir = fleet({'fresh': raw_hw_text('fresh'), 'old': raw_hw_text('old')})
+    _age(os.path.join(raw_dir, 'old_raw_hw.txt'), 60)
+    _parse(inventory_file, raw_dir, cache_file)
+    entries = hw.load_parse_cache(cache_file)
+    assert entries['fresh']['racy'] is True and 'racy' not in entries['old']
+
+    # racy로 저장된 엔트리는 크기/mtime이 같아도 내용 해시를 비교하고, 그 밖의 엔트리는 파일을 읽지 않습니다.
+    digested = []
+    file_content_digest = hw.file_content_digest
+    monkeypatch.setattr(hw, 'file_content_digest', lambda path: digested.append(path) or file_content_digest(path))
+    _, stats = _parse(inventory_file, raw_dir, cache_file)
+    assert stats['cache_hits'] == 2
+    assert [os.path.basename(path) for path in digested] == ['fresh_raw_hw.txt']
@@ -0,0 +1,206 @@
+import copy
+
+import pytest
+
+import process_hw_info_bash_only as hw
+
+# 형식 버전 1 (---HOST: / ---SECTION:) raw 파일
+V1_COMPLETE = """\
+---HOST:web01---
+---SECTION:IP_ADDRESSES---
+10.0.0.1 192.168.0.1
+---SECTION:CPU---
+Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz
+80
+20
+2
+---SECTION:SYSTEM_INFO---
+Dell Inc.
+PowerEdge R640
+SN-web01
+Not Specified
+---SECTION:MAINBOARD---
+Dell Inc.
+0H28RR
+MB-web01
+A01
+---SECTION:BIOS---
+Dell Inc.
+2.10.2
+---SECTION:OS_INFO---
+Ubuntu
+22.04
+5.15.0-91-generic
+---SECTION:MEMORY---
+385000
+"""
+
+# 섹션 if 문으로 파싱하던 원래 parse_raw_hw_data가 V1_COMPLETE에 대해 반환하던 값
+V1_COMPLETE_EXPECTED = {
+    'hostname': 'web01', 'status': 'Collected', 'ip_addresses': ['10.0.0.1', '192.168.0.1'],
+    'cpu': {'model': 'Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz', 'logical_cpus': '80', 'cores_per_socket': '20',
+            'threads_per_core': '2'},
+    'system_info': {'manufacturer': 'Dell Inc.', 'product_name': 'PowerEdge R640', 'serial_number': 'SN-web01',
+                    'version': 'Not Specified'},
+    'mainboard': {'manufacturer': 'Dell Inc.', 'product': '0H28RR', 'serial': 'MB-web01', 'version': 'A01'},
+    'bios': {'vendor': 'Dell Inc.', 'version': '2.10.2'},
+    'os': {'distribution': 'Ubuntu', 'version': '22.04', 'kernel': '5.15.0-91-generic'},
+    'memory_mb': '385000',
+}
+
+EMPTY_EXPECTED = {
+    'hostname': 'N/A', 'status': 'Collected', 'ip_addresses': ['N/A'],
+    'cpu': {'model': 'N/A', 'logical_cpus': 'N/A', 'cores_per_socket': 'N/A', 'threads_per_core': 'N/A'},
+    'system_info': {'manufacturer': 'N/A', 'product_name': 'N/A', 'serial_number': 'N/A', 'version': 'N/A'},
+    'mainboard': {'manufacturer': 'N/A', 'product': 'N/A', 'serial': 'N/A', 'version': 'N/A'},
+    'bios': {'vendor': 'N/A', 'version': 'N/A'},
+    'os': {'distribution': 'N/A', 'version': 'N/A', 'kernel': 'N/A'},
+    'memory_mb': 'N/A',
+}
+
+
+def _expected(base, **changes):
+    """
+    base를 복사하여 'cpu__model'처럼 '.' 대신 '__'로 쓴 필드 경로의 값을 바꿉니다.
+    """
+    expected = copy.deepcopy(base)
+    for key, value in changes.items():
+        parent, _, leaf = key.replace('__', '.').rpartition('.')
+        (expected[parent] if parent else expected)[leaf] = value
+    return expected
+
+
+def _parse(tmp_path, content, name='host_raw_hw.txt'):
+    raw_file = tmp_path / name
+    raw_file.write_text(content, encoding='utf-8')
+    return hw.parse_raw_hw_data(str(raw_file), verbose=False).to_dict()
+
+
+@pytest.mark.parametrize('content, expected', [
+    (V1_COMPLETE, V1_COMPLETE_EXPECTED),
+    # '---HOST:' 줄이 없으면 호스트명만 'N/A'이고 나머지 섹션은 그대로 파싱합니다.
+    (V1_COMPLETE.split('\n', 1)[1], _expected(V1_COMPLETE_EXPECTED, hostname='N/A')),
+    # 'N/A' 줄은 기본값을 유지합니다.
+    (V1_COMPLETE.replace('10.0.0.1 192.168.0.1', 'N/A').replace('SN-web01', 'N/A').replace('0H28RR', 'N/A')
+     .replace('385000', 'N/A'),
+     _expected(V1_COMPLETE_EXPECTED, ip_addresses=['N/A'], system_info__serial_number='N/A', mainboard__product='N/A',
+               memory_mb='N/A')),
+    # 섹션이 없거나 줄이 모자라면 해당 필드는 'N/A'입니다.
+    ("---HOST:db01---\n---SECTION:CPU---\nAMD EPYC 7543 32-Core Processor\n64\n---SECTION:BIOS---\nHPE\n"
+     "---SECTION:MEMORY---\n",
+     _expected(EMPTY_EXPECTED, hostname='db01', cpu__model='AMD EPYC 7543 32-Core Processor', cpu__logical_cpus='64',
+               bios__vendor='HPE')),
+    # 알 수 없는 섹션의 줄은 무시하고, 다음 섹션부터 다시 파싱합니다.
+    (V1_COMPLETE.replace('---SECTION:BIOS---', '---SECTION:GPU---\nNVIDIA A100\n2\n---SECTION:BIOS---'),
+     V1_COMPLETE_EXPECTED),
+    # 빈 줄은 건너뛰고, 정의된 위치보다 많은 줄은 무시합니다.
+    (V1_COMPLETE.replace('---SECTION:MEMORY---\n385000\n', '---SECTION:MEMORY---\n\n385000\n512000\n'),
+     V1_COMPLETE_EXPECTED),
+    # CRLF 줄 끝
+    (V1_COMPLETE.replace('\n', '\r\n'), V1_COMPLETE_EXPECTED),
+    ('', EMPTY_EXPECTED),
+], ids=['complete', 'no-header', 'na-fields', 'missing-sections', 'unknown-section', 'extra-lines', 'crlf', 'empty'])
+def test_v1_matches_original_parser(tmp_path, content, expected):
+    assert _parse(tmp_path, content) == expected
+
+
+def test_missing_file_status(tmp_path):
+    record = hw.parse_raw_hw_data(str(tmp_path / 'missing_raw_hw.txt'), verbose=False)
+    assert record.status == 'File Not Found'
+
+
+def test_compile_section_schema_layouts():
+    compiled = hw.compile_section_schema(hw.RAW_SECTION_SCHEMA, {'CPU': {3: ['cpu.model', 'cpu.logical_cpus',
+                                                                           'cpu.threads_per_core']}})
+    assert set(compiled) == set(hw.RAW_SECTION_SCHEMA)
+    assert [slot for slot, _ in compiled['CPU'][None]] == ['cpu_model', 'cpu_logical_cpus', 'cpu_cores_per_socket',
+                                                          'cpu_threads_per_core']
+    assert [slot for slot, _ in compiled['CPU'][3]] == ['cpu_model', 'cpu_logical_cpus', 'cpu_threads_per_core']
+    assert compiled['IP_ADDRESSES'][None] == (('ip_addresses', hw._split_words),)
+
+
+V2_COMPLETE = """\
+---HWINFO:2---
+hostname=web01
+collect.started_at=1767225600.120
+ip_addresses=10.0.0.1 192.168.0.1
+cpu.model=Intel(R) Xeon(R) Gold 6230 CPU @ 2.10GHz
+cpu.logical_cpus=80
+cpu.cores_per_socket=20
+cpu.threads_per_core=2
+system_info.manufacturer=Dell Inc.
+system_info.product_name=PowerEdge R640
+system_info.serial_number=SN-web01
+system_info.version=Not Specified
+mainboard.manufacturer=Dell Inc.
+mainboard.product=0H28RR
+mainboard.serial=MB-web01
+mainboard.version=A01
+bios.vendor=Dell Inc.
+bios.version=2.10.2
+os.distribution=Ubuntu
+os.version=22.04
+os.kernel=5.15.0-91-generic
+memory_mb=385000
+collect.finished_at=1767225603.450
+---END---
+"""
+
+
+def _parse_record(tmp_path, content):
+    raw_file = tmp_path / 'host_raw_hw.txt'
+    raw_file.write_text(content, encoding='utf-8')
+    return hw.parse_raw_hw_data(str(raw_file), verbose=False)
+
+
+@pytest.mark.parametrize('content, expected', [
+    # v1과 v2는 같은 레코드가 됩니다.
+    (V2_COMPLETE, V1_COMPLETE_EXPECTED),
+    # 알 수 없는 키, 주석, '='가 없는 줄은 무시합니다.
+    (V2_COMPLETE.replace('memory_mb=', 'gpu.model=NVIDIA A100\n# 주석\nbroken line\nmemory_mb='), V1_COMPLETE_EXPECTED),
+    # 플레이북이 중간에 끊겨 '---END---'가 없어도 받은 줄까지 파싱합니다.
+    (V2_COMPLETE.split('bios.vendor=')[0],
+     _expected(V1_COMPLETE_EXPECTED, bios__vendor='N/A', bios__version='N/A', os__distribution='N/A', os__version='N/A',
+               os__kernel='N/A', memory_mb='N/A')),
+    # 값이 비었거나 'N/A'이면 기본값을 유지합니다. 값 안의 '='는 그대로 두고 키와 값의 앞뒤 공백은 제거합니다.
+    (V2_COMPLETE.replace('memory_mb=385000', 'memory_mb=').replace('bios.version=2.10.2', 'bios.version=N/A')
+     .replace('mainboard.version=A01', 'mainboard.version = rev=A01  '),
+     _expected(V1_COMPLETE_EXPECTED, memory_mb='N/A', bios__version='N/A', mainboard__version='rev=A01')),
+    # 지원하는 버전보다 높은 형식은 알려진 키만 파싱합니다.
+    (V2_COMPLETE.replace('---HWINFO:2---', '---HWINFO:3---').replace('hostname=web01', 'hostname=web01\nnic.0.mac=aa'),
+     V1_COMPLETE_EXPECTED),
+    (V2_COMPLETE.replace('\n', '\r\n'), V1_COMPLETE_EXPECTED),
+    ('---HWINFO:2---\n---END---\n', EMPTY_EXPECTED),
+], ids=['complete', 'unknown-keys', 'missing-end', 'empty-values', 'newer-version', 'crlf', 'no-fields'])
+def test_v2_key_value(tmp_path, content, expected):
+    assert _parse_record(tmp_path, content).to_dict() == expected
+
+
+def test_v2_collect_metadata_is_kept_apart(tmp_path):
+    record = _parse_record(tmp_path, V2_COMPLETE.replace('---END---', 'collect.method=sudo\ncollect.wall_seconds=N/A\n'
+                                                                      'collect.note=\n---END---'))
+    assert record.collect_meta == {'started_at': '1767225600.120', 'finished_at': '1767225603.450', 'method': 'sudo'}
+    assert 'collect' not in record.to_dict()
+    assert _parse_record(tmp_path, V2_COMPLETE.replace('collect.', 'ignored.')).collect_meta is None
+
+
+def test_v1_ignores_collect_lines(tmp_path):
+    record = _parse_record(tmp_path, V1_COMPLETE + '---SECTION:COLLECT---\ncollect.method=sudo\n')
+    assert record.collect_meta is None
+    assert record.to_dict() == V1_COMPLETE_EXPECTED
+
+
+@pytest.mark.parametrize('cpu_lines, expected', [
+    # 예전 플레이북은 소켓당 코어 수 없이 3줄을 출력했습니다: 모델, 논리 CPU 수, 코어당 스레드 수
+    (['AMD EPYC 7543', '64', '2'], {'model': 'AMD EPYC 7543', 'logical_cpus': '64', 'cores_per_socket': 'N/A',
+                                    'threads_per_core': '2'}),
+    (['AMD EPYC 7543', '64', '32', '2'], {'model': 'AMD EPYC 7543', 'logical_cpus': '64', 'cores_per_socket': '32',
+                                          'threads_per_core': '2'}),
+    (['AMD EPYC 7543', '64'], {'model': 'AMD EPYC 7543', 'logical_cpus': '64', 'cores_per_socket': 'N/A',
+                               'threads_per_core': 'N/A'}),
+    (['AMD EPYC 7543', 'N/A', '2'], {'model': 'AMD EPYC 7543', 'logical_cpus': 'N/A', 'cores_per_socket': 'N/A',
+                                     'threads_per_core': '2'}),
+], ids=['3-line', '4-line', '2-line', '3-line-na'])
+def test_v1_cpu_section_layouts(tmp_path, cpu_lines, expected):
+    content = '---HOST:db01---\n---SECTION:CPU---\n' + ''.join(f'{line}\n' for line in cpu_lines)
+    assert _parse_record(tmp_path, content).to_dict()['cpu'] == expected
@@ -0,0 +1,98 @@
+import json
+import os
+import time
+
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+
+def _set_mtime(raw_dir, host, epoch):
+    os.utime(os.path.join(raw_dir, f'{host}_raw_hw.txt'), (epoch, epoch))
+
+
+def _write_state(schedule_file, hosts, pending=None):
+    with open(schedule_file, 'w', encoding='utf-8') as f:
+        json.dump({'schema_version': hw.SCHEDULE_SCHEMA_VERSION, 'updated_at': 0, 'hosts': hosts, 'pending': pending}, f)
+
+
+def _read_state(schedule_file):
+    with open(schedule_file, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _report(inventory_file, raw_dir, *options):
+    return hw.run_report([inventory_file, '--raw-data', raw_dir, '--workers', '1', '--no-cache', '--no-history',
+                          '--no-changes', '--no-summary', *options])
+
+
+def _yaml_report(tmp_path):
+    return (tmp_path / 'result' / 'hardware_inventory_report_bash_only.yaml').read_text(encoding='utf-8')
+
+
+FAILED_WEB01 = {'web01': {'status': 'Collection Failed', 'data_at': 1_700_000_000, 'attempted_at': 1_700_000_500,
+                          'failures': 2}}
+
+
+def test_plain_report_does_not_use_schedule_state(fleet, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    inventory_file, raw_dir = fleet({'web01': raw_hw_text('web01'), 'web02': raw_hw_text('web02')})
+    _set_mtime(raw_dir, 'web01', 1_700_000_000)
+    schedule_file = str(tmp_path / 'schedule.json')
+
+    assert _report(inventory_file, raw_dir, '--schedule-file', schedule_file) == 0
+    assert not os.path.exists(schedule_file)
+
+    _write_state(schedule_file, FAILED_WEB01)
+    before = _read_state(schedule_file)
+    assert _report(inventory_file, raw_dir, '--schedule-file', schedule_file) == 0
+    assert _read_state(schedule_file) == before
+    assert 'web01:' in _yaml_report(tmp_path)
+
+
+def test_schedule_option_records_state_and_marks_failed_hosts(fleet, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    inventory_file, raw_dir = fleet({'web01': raw_hw_text('web01'), 'web02': raw_hw_text('web02')})
+    _set_mtime(raw_dir, 'web01', 1_700_000_000)
+    schedule_file = str(tmp_path / 'schedule.json')
+    _write_state(schedule_file, FAILED_WEB01)
+
+    assert _report(inventory_file, raw_dir, '--schedule', '--schedule-file', schedule_file) == 0
+    assert "'Collection Failed'로 표시 1개" in capsys.readouterr().out
+    state = _read_state(schedule_file)
+    assert state['hosts']['web01']['status'] == 'Collection Failed'
+    assert state['hosts']['web02']['status'] == 'Collected'
+    # YAML 보고서는 수집에 실패한 호스트를 빼므로 예전 raw 데이터가 남은 web01도 빠집니다.
+    assert 'web01:' not in _yaml_report(tmp_path) and 'web02:' in _yaml_report(tmp_path)
+
+
+def test_update_only_changed_hosts_keeps_remaining_pending(fleet, tmp_path):
+    now = int(time.time())
+    inventory_file, raw_dir = fleet({'web01': raw_hw_text('web01'), 'web02': raw_hw_text('web02'), 'web03': None,
+                                     'web04': raw_hw_text('web04')})
+    _set_mtime(raw_dir, 'web02', now - 1000) # 계획 이전의 raw 파일: 수집 실패
+    schedule_file = str(tmp_path / 'schedule.json')
+    _write_state(schedule_file, {'web04': {'status': 'Collected', 'data_at': now, 'attempted_at': now, 'failures': 0}},
+                 pending={'planned_at': now - 100, 'hosts': ['web01', 'web02', 'web03']})
+    data = hw.parse_all_hw_data_files(raw_dir, inventory_file)
+
+    # watch처럼 바뀐 호스트(web01)만 판단하면 나머지 대상은 다음 판단으로 넘어갑니다.
+    assert hw.update_collect_schedule(data, raw_dir, schedule_file, now=now, hosts=['web01']) == (1, 1, 0, 0)
+    state = _read_state(schedule_file)
+    assert state['pending'] == {'planned_at': now - 100, 'hosts': ['web02', 'web03']}
+    assert sorted(state['hosts']) == ['web01', 'web04']
+
+    assert hw.update_collect_schedule(data, raw_dir, schedule_file, now=now) == (2, 0, 2, 1)
+    state = _read_state(schedule_file)
+    assert state['pending'] is None
+    assert {host: entry['status'] for host, entry in state['hosts'].items()} == {
+        'web01': 'Collected', 'web02': 'Collection Failed', 'web03': 'Collection Failed', 'web04': 'Collected'}
+    assert state['hosts']['web02']['failures'] == 1
+    assert [data[host].status for host in ('web01', 'web02', 'web03', 'web04')] == [
+        'Collected', 'Collection Failed', 'Collection Failed', 'Collected']
+
+
+def test_serve_rejects_schedule_with_export(tmp_path):
+    with pytest.raises(SystemExit):
+        hw.run_serve(['--from-export', str(tmp_path / 'hosts.jsonl'), '--schedule'])
@@ -0,0 +1,149 @@
+import http.server
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+
+@pytest.fixture
+def serve(fleet):
+    """
+    fleet을 파싱하여 색인한 검색 서비스를 임의의 포트에서 띄우고, GET 요청을 보내 (상태 코드, JSON)을 받는 함수를 돌려줍니다.
+    """
+    inventory_file, raw_dir = fleet({
+        'web01': raw_hw_text('web01', ip_addresses='10.0.1.1'),
+        'web02': raw_hw_text('web02', ip_addresses='10.0.1.2', bios__version='2.11.0'),
+        'db01': raw_hw_text('db01', ip_addresses='10.0.2.1', cpu__model='AMD EPYC 7543 32-Core Processor',
+                            system_info__manufacturer='HPE', bios__vendor='HPE'),
+        'down01': None,
+    })
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), hw.FleetRequestHandler)
+    server.fleet_index = hw.FleetSearchIndex(hw.parse_all_hw_data_files(raw_dir, inventory_file))
+    server.verbose = False
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+
+    def get(path):
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.server_address[1]}{path}', timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+    yield get
+    server.shutdown()
+    server.server_close()
+
+
+def _hosts(payload):
+    return [host['inventory_host'] for host in payload['hosts']]
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('/hosts', ['web01', 'web02', 'db01', 'down01']),
+    ('/hosts?q=web', ['web01', 'web02']),
+    ('/hosts?q=WEB0', ['web01', 'web02']),
+    ('/hosts?q=10.0.1', ['web01', 'web02']),
+    ('/hosts?q=eb0&match=prefix', []),
+    ('/hosts?q=eb0&match=substring', ['web01', 'web02']),
+    ('/hosts?q=web0&match=exact', []),
+    ('/hosts?q=web01&match=exact', ['web01']),
+    ('/hosts?q=epyc&field=cpu_model&match=substring', ['db01']),
+    ('/hosts?q=sn-db01&field=serial', ['db01']),
+    ('/hosts?q=hpe&field=hostname', []),
+    ('/hosts?vendor=hpe', ['db01']),
+    ('/hosts?bios_version=2.10.2', ['web01', 'db01']),
+    ('/hosts?q=web&bios_version=2.10.2', ['web01']),
+    ('/hosts?bios_version=2.10.2&bios_version=2.11.0', ['web01', 'web02', 'db01']),
+    ('/hosts?status=Collection%20Failed', ['down01']),
+])
+def test_search(serve, query, expected):
+    status, payload = serve(query)
+    assert status == 200
+    assert _hosts(payload) == expected
+    assert payload['total'] == len(expected)
+
+
+def test_search_pages_results(serve):
+    status, payload = serve('/hosts?offset=1&limit=2')
+    assert status == 200
+    assert (payload['total'], payload['offset'], payload['limit']) == (4, 1, 2)
+    assert _hosts(payload) == ['web02', 'db01']
+    assert serve('/hosts?limit=100000')[1]['limit'] == hw.SERVE_MAX_LIMIT
+
+
+def test_host_document(serve):
+    status, payload = serve('/hosts/web02')
+    assert status == 200
+    assert payload['inventory_host'] == 'web02'
+    assert payload['status'] == 'Collected'
+    assert payload['bios']['version'] == '2.11.0'
+    assert serve('/hosts/down01')[1]['status'] == 'Collection Failed'
+
+
+def test_fields_and_summary(serve):
+    status, payload = serve('/fields')
+    assert status == 200
+    assert set(payload['fields']) == set(hw.SEARCH_FIELDS)
+    assert payload['match'] == list(hw.SEARCH_MATCH_MODES)
+
+    status, payload = serve('/fields/vendor?limit=5')
+    assert status == 200
+    assert payload == {'field': 'vendor', 'values': [{'value': 'Dell Inc.', 'hosts': 2}, {'value': 'HPE', 'hosts': 1}]}
+    assert serve('/fields/bios_version?prefix=2.11')[1]['values'] == [{'value': '2.11.0', 'hosts': 1}]
+
+    status, payload = serve('/summary')
+    assert status == 200
+    assert payload['hosts_total'] == 4
+    assert payload['status_counts'] == {'Collected': 3, 'Collection Failed': 1}
+    expected = json.loads(json.dumps(hw.build_fleet_summary(
+        {host: hw.HostRecord.from_dict(serve(f'/hosts/{host}')[1]) for host in ('web01', 'web02', 'db01', 'down01')})))
+    payload.pop('generated_at'), expected.pop('generated_at')
+    assert payload == expected
+
+
+@pytest.mark.parametrize('path', ['/hosts/unknown', '/nope', '/fields/unknown', '/hosts/web01/extra'])
+def test_not_found(serve, path):
+    status, payload = serve(path)
+    assert status == 404
+    assert payload['error']
+
+
+@pytest.mark.parametrize('query, message', [
+    ('/hosts?q=web&field=color', 'color'),
+    ('/hosts?color=red', 'color'),
+    ('/hosts?q=web&match=fuzzy', 'fuzzy'),
+    ('/hosts?limit=abc', 'limit'),
+    ('/hosts?offset=-1', 'offset'),
+    ('/fields/vendor?limit=x', 'limit'),
+])
+def test_bad_request(serve, query, message):
+    status, payload = serve(query)
+    assert status == 400
+    assert message in payload['error']
+
+
+def test_load_hosts_from_jsonl_coerces_numbers(tmp_path):
+    export_file = tmp_path / 'hosts.jsonl'
+    export_file.write_text(json.dumps({'inventory_host': 'web01', 'hostname': 'web01', 'status': 'Collected',
+                                       'cpu': {'logical_cpus': 64}, 'memory_mb': 1024}) + '\n', encoding='utf-8')
+    record = hw.load_hosts_from_jsonl(str(export_file))['web01']
+    assert (record.memory_mb, record.cpu_logical_cpus, record.cpu_model) == ('1024', '64', 'N/A')
+
+
+@pytest.mark.parametrize('record', [
+    {'memory_mb': {'total': 1024}},
+    {'memory_mb': True},
+    {'cpu': 'Xeon'},
+    {'ip_addresses': '10.0.0.1'},
+    {'ip_addresses': [['10.0.0.1']]},
+])
+def test_serve_rejects_malformed_export(tmp_path, capsys, record):
+    export_file = tmp_path / 'hosts.jsonl'
+    export_file.write_text(json.dumps({'inventory_host': 'web01', **record}) + '\n', encoding='utf-8')
+    assert hw.run_serve(['--from-export', str(export_file)]) == 1
+    assert '읽을 수 없습니다' in capsys.readouterr().out
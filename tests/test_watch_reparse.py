@@ -0,0 +1,128 @@
+import argparse
+import glob
+import json
+import os
+import re
+import time
+
+import pytest
+
+import process_hw_info_bash_only as hw
+from conftest import raw_hw_text
+
+NEW_COLLECT = {'started_at': '1767312000.001', 'finished_at': '1767312009.999', 'method': 'sudo', 'wall_seconds': '9.9'}
+
+
+def _watch_fleet(fleet, hosts):
+    inventory_file, raw_dir = fleet(hosts)
+    stats = {}
+    data = hw.parse_all_hw_data_files(raw_dir, inventory_file, stats=stats)
+    signatures = hw.scan_raw_file_signatures(raw_dir, set(data))
+    return inventory_file, raw_dir, data, signatures, stats
+
+
+def _reparse(raw_dir, data, signatures, stats, hosts):
+    # 인벤토리는 그대로 두고 바뀐 호스트의 raw 파일만 다시 쓰거나 지웁니다.
+    for host, content in hosts.items():
+        raw_file = os.path.join(raw_dir, f'{host}_raw_hw.txt')
+        if content is None:
+            os.remove(raw_file)
+        else:
+            with open(raw_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+    changed = hw.find_changed_hosts(raw_dir, signatures, data, rescan_all=True)
+    hw.reparse_changed_hosts(data, raw_dir, changed, signatures, stats=stats)
+    return changed
+
+
+def test_reparse_keeps_collect_metadata(fleet):
+    inventory_file, raw_dir, data, signatures, stats = _watch_fleet(fleet, {
+        'web01': raw_hw_text('web01'), 'web02': raw_hw_text('web02'), 'web03': raw_hw_text('web03')})
+
+    changed = _reparse(raw_dir, data, signatures, stats, {
+        'web01': raw_hw_text('web01', collect=NEW_COLLECT, bios__version='2.11.0'), 'web03': None})
+    assert changed == {'web01', 'web03'}
+
+    full_stats = {}
+    full = hw.parse_all_hw_data_files(raw_dir, inventory_file, stats=full_stats)
+    assert {host: record.to_dict() for host, record in data.items()} == \
+        {host: record.to_dict() for host, record in full.items()}
+    assert stats['collect'] == full_stats['collect']
+    assert stats['collect']['web01'] == NEW_COLLECT
+    assert 'web03' not in stats['collect'] and 'web03' not in stats['parse_seconds']
+    assert all(record.collect_meta is None for record in data.values())
+
+
+def test_reparse_with_schedule_matches_full_report(fleet, tmp_path):
+    now = int(time.time())
+    inventory_file, raw_dir, data, signatures, stats = _watch_fleet(fleet, {
+        'web01': raw_hw_text('web01'), 'web02': raw_hw_text('web02')})
+    schedule_file = str(tmp_path / 'schedule.json')
+    hw.apply_collect_schedule(data, raw_dir, schedule_file)
+
+    # 마지막 시도에 실패한 것으로 기록된 web02의 raw 파일이 예전 시각으로 다시 쓰였습니다. (rsync -t 등)
+    state = hw.load_collect_schedule(schedule_file)
+    state['hosts']['web02'].update(status='Collection Failed', data_at=now, failures=1)
+    hw.save_collect_schedule(schedule_file, state)
+    changed = _reparse(raw_dir, data, signatures, stats, {'web02': raw_hw_text('web02', bios__version='2.11.0')})
+    os.utime(os.path.join(raw_dir, 'web02_raw_hw.txt'), (now - 60, now - 60))
+    hw.apply_collect_schedule(data, raw_dir, schedule_file, hosts=changed)
+    assert changed == {'web02'}
+    assert data['web02'].status == 'Collection Failed'
+
+    full = hw.parse_all_hw_data_files(raw_dir, inventory_file)
+    hw.apply_collect_schedule(full, raw_dir, schedule_file)
+    assert {host: record.status for host, record in data.items()} == \
+        {host: record.status for host, record in full.items()} == {'web01': 'Collected', 'web02': 'Collection Failed'}
+
+
+def _report_pages():
+    # 생성 시각은 실행마다 다르므로 비교에서 뺍니다.
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(hw.RESULT_DIR, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages[os.path.basename(path)] = re.sub(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', '<time>', f.read())
+    return pages
+
+
+def _changes_without_times(changes_file):
+    with open(changes_file, encoding='utf-8') as f:
+        changes = json.load(f)
+    del changes['current_run_at']
+    return changes
+
+
+def test_watch_reports_match_full_report(fleet, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    inventory_file, raw_dir, data, signatures, stats = _watch_fleet(fleet, {
+        'web01': raw_hw_text('web01'), 'web02': raw_hw_text('web02'), 'web03': raw_hw_text('web03')})
+    snapshot_file, changes_file = str(tmp_path / 'snapshot.json'), str(tmp_path / 'changes.json')
+    hw.detect_fleet_changes(data, snapshot_file, changes_file) # 감시 전에 실행한 기본 모드
+    args = argparse.Namespace(shard_size=2, export=[], no_changes=False, snapshot_file=snapshot_file,
+                              changes_file=changes_file, no_summary=False, summary_file=str(tmp_path / 'summary.json'))
+    export_line_caches, change_baseline = {}, {}
+    hw._write_watch_reports(data, args, export_line_caches, change_baseline)
+    assert _changes_without_times(changes_file)['summary'] == {'changed': 0, 'added': 0, 'removed': 0, 'unchanged': 3}
+
+    changed = _reparse(raw_dir, data, signatures, stats, {
+        'web02': raw_hw_text('web02', bios__version='2.11.0'), 'web03': None})
+    hw._write_watch_reports(data, args, export_line_caches, change_baseline, [host for host in data if host in changed])
+    watch_pages, watch_changes = _report_pages(), _changes_without_times(changes_file)
+    assert watch_changes['summary'] == {'changed': 2, 'added': 0, 'removed': 0, 'unchanged': 1}
+    assert [(entry['host'], [field['field'] for field in entry['fields']]) for entry in watch_changes['hosts']] == [
+        ('web02', ['bios_version']), ('web03', ['status'])]
+    with open(snapshot_file, encoding='utf-8') as f:
+        assert 'Collection Failed' not in f.read() # 감시 모드는 스냅샷을 저장하지 않습니다.
+
+    assert hw.run_report([str(inventory_file), '--raw-data', str(raw_dir), '--workers', '1', '--no-cache', '--no-history',
+                          '--shard-size', '2', '--snapshot-file', snapshot_file, '--changes-file', changes_file,
+                          '--summary-file', str(tmp_path / 'summary.json')]) == 0
+    assert _changes_without_times(changes_file) == watch_changes
+    assert _report_pages() == watch_pages
+    assert 'bios_version' in watch_pages['hardware_inventory_report_bash_only.html']
+
+
+def test_watch_rejects_pack(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        hw.run_watch([str(tmp_path / 'inventory.ini'), '--raw-data', str(tmp_path / 'fleet.hwpack')])
+    assert '디렉토리만' in capsys.readouterr().err
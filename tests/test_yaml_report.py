@@ -0,0 +1,29 @@
+import yaml
+
+import process_hw_info_bash_only as hw
+
+
+def _collected(host):
+    record = hw.HostRecord(host, 'Collected')
+    record.hostname = host
+    return record
+
+
+def test_yaml_report_without_collected_hosts_is_empty_mapping(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_file = tmp_path / 'report.yaml'
+    for data in ({}, {'web01': hw.HostRecord('web01', 'Collection Failed')}):
+        hw.generate_yaml_report(data, str(output_file))
+        assert output_file.read_text(encoding='utf-8') == '{}\n'
+        assert yaml.safe_load(output_file.read_text(encoding='utf-8')) == {}
+
+
+def test_yaml_report_matches_single_dump(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    output_file = tmp_path / 'report.yaml'
+    data = {'web01': _collected('web01'), 'web02': hw.HostRecord('web02', 'Collection Failed'), 'db01': _collected('db01')}
+    hw.generate_yaml_report(data, str(output_file))
+    expected = yaml.dump({host: record.to_dict(include_status=False) for host, record in data.items()
+                          if record.status == 'Collected'},
+                         default_flow_style=False, allow_unicode=True, indent=2, width=80, sort_keys=False)
+    assert output_file.read_text(encoding='utf-8') == expected